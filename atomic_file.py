@@ -0,0 +1,20 @@
+import contextlib
+import os
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w', encoding='utf-8'):
+    """Open a temporary file next to ``path`` and move it over ``path`` once the body is done
+
+    Readers (parallel workers, the next run) only ever see the old file or the complete
+    new one. If the body raises, the temporary file is removed and ``path`` is left as it was.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, mode, encoding=None if 'b' in mode else encoding) as temp_file:
+            yield temp_file
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pandas as pd
+
+from image_index import ImageIndex
+from workbook import EPISODE_SCHEMA, Workbook
+
+
+def plan_batch(frame, report, image_index, start_id=665, end_id=None, template_id=None):
+    """Decide what a batch would do with every row, checking the whole sheet at once
+
+    ``frame``/``report`` come from ``Workbook.load()``. Rows are skipped for exactly the
+    problems ``report`` lists (bad or missing values, malformed URLs, duplicate episode
+    numbers), the same ones a real run skips them for. Returns a DataFrame indexed like
+    ``frame`` with the ``excel_row``, ``episode_number``, ``title``, ``action`` (copy, skip
+    or over capacity), the expected ``source_id``, the ``image`` file and the ``problems``
+    (why a row is skipped) and ``warnings`` of each row.
+    """
+    plan = pd.DataFrame(index=frame.index)
+    plan['excel_row'] = frame.index + 1
+    plan['episode_number'] = frame['EpisodeNumber']
+    plan['title'] = frame['Title'].fillna('').astype(str)
+
+    issues = pd.DataFrame(report.errors, columns=['excel_row', 'column', 'message'])
+    problems = (issues['column'] + ' ' + issues['message']).groupby(issues['excel_row']).agg('; '.join)
+    plan['problems'] = plan['excel_row'].map(problems).fillna('')
+    valid = plan['problems'] == ''
+    numbers = pd.to_numeric(frame['EpisodeNumber'], errors='coerce')
+
+    # Thumbnails from the image index (a dict lookup per valid episode number)
+    whole_numbers = numbers.where(valid & (numbers % 1 == 0))
+    paths = {int(number): image_index.lookup(int(number)) for number in whole_numbers.dropna().unique()}
+    plan['image'] = whole_numbers.map(lambda number: paths.get(number) if pd.notna(number) else None)
+    plan['warnings'] = ''
+    plan.loc[valid & plan['image'].isna(), 'warnings'] = 'no thumbnail image'
+
+    # Which episode each row copies - chained rows move on only after a successful save
+    if template_id is None:
+        plan['source_id'] = (start_id + valid.cumsum() - 1).where(valid)
+        over = valid & (plan['source_id'] > end_id) if end_id is not None else valid & False
+    else:
+        plan['source_id'] = pd.Series(template_id, index=plan.index).where(valid)
+        over = valid & False
+    plan['action'] = 'skip'
+    plan.loc[valid, 'action'] = 'copy'
+    plan.loc[over, 'action'] = 'over capacity'
+    return plan
+
+
+def print_plan(plan, images_folder, start_id=665, end_id=None, template_id=None):
+    """Print one line per row and a summary of the planned batch"""
+    image_names = plan['image'].map(lambda path: os.path.basename(path) if path else '-')
+    source = plan['source_id'].map(lambda value: f"{int(value)}" if pd.notna(value) else '-')
+    notes = (plan['problems'] + plan['warnings']).where(plan['action'] != 'over capacity', f'beyond END_ID {end_id}')
+    lines = (
+        'Row ' + plan['excel_row'].astype(str).str.rjust(5)
+        + '  ' + plan['action'].str.ljust(13)
+        + ' from ' + source.str.rjust(6)
+        + '  ep ' + plan['episode_number'].astype(str).str.slice(0, 8).str.ljust(8)
+        + ' ' + image_names.str.slice(0, 20).str.ljust(20)
+        + ' ' + plan['title'].str.slice(0, 40)
+        + notes.map(lambda note: f"  ⚠ {note}" if note else '')
+    )
+    print("\n".join(lines))
+
+    counts = plan['action'].value_counts()
+    print("=" * 60)
+    print(f"📋 {len(plan)} rows: {counts.get('copy', 0)} to copy, {counts.get('skip', 0)} skipped"
+          + (f", {counts.get('over capacity', 0)} beyond END_ID" if counts.get('over capacity', 0) else ""))
+    missing_images = (plan['warnings'] == 'no thumbnail image').sum()
+    if missing_images:
+        print(f"🖼 {missing_images} rows have no image in {images_folder}")
+    if template_id is None:
+        to_copy = counts.get('copy', 0)
+        if end_id is not None:
+            capacity = max(0, end_id - start_id + 1)
+            valid_rows = to_copy + counts.get('over capacity', 0)
+            print(f"🔢 IDs {start_id}..{end_id} give room for {capacity} chained copies for {valid_rows} valid rows"
+                  + (f" - raise END_ID to {start_id + valid_rows - 1} to copy them all" if valid_rows > capacity else ""))
+        elif to_copy:
+            print(f"🔢 Chain starts at {start_id} and should end around {start_id + to_copy}")
+    else:
+        print(f"🔢 Every row copies template episode {template_id}")
+
+
+def dry_run_batch(excel_path, images_folder='.', start_id=665, end_id=None, template_id=None):
+    """Validate and plan a batch without starting a browser, returns the plan"""
+    started = time.monotonic()
+    frame, report = Workbook(excel_path, EPISODE_SCHEMA).load()
+    if report.missing_columns:
+        print(f"❌ Missing required columns: {report.missing_columns}")
+        return None
+    plan = plan_batch(frame, report, ImageIndex(images_folder), start_id, end_id, template_id)
+    print_plan(plan, images_folder, start_id, end_id, template_id)
+    print(f"⏱ Dry run checked {len(plan)} rows in {time.monotonic() - started:.2f}s - no browser was started")
+    return plan
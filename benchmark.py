@@ -0,0 +1,194 @@
+"""Offline throughput benchmark of EpisodeCopyAutomation against the local stub portal
+
+Runs process_episode_batch on synthetic workbooks (10, 100 and 1000 rows by default) and
+reports episodes per minute, WebDriver commands per episode and peak Python memory:
+
+    python benchmark.py --rows 10 100 --latency 0.05 --output results.json
+    python benchmark.py --rows 100 --baseline results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import date, timedelta
+
+import openpyxl
+
+from downloader2 import EpisodeCopyAutomation
+from stub_portal import StubPortal
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+TEMPLATE_ID = 665
+
+
+def write_synthetic_workbook(path, rows):
+    """Workbook with ``rows`` valid episodes, written in streaming mode"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(['EpisodeNumber', 'Title', 'ContentUrl', 'Subtitle', 'Duration', 'ReleaseDate'])
+    for number in range(1, rows + 1):
+        sheet.append([
+            number,
+            f'Benchmark Episode {number}',
+            f'https://example.com/audio/{number}.mp3',
+            f'Synthetic row {number}',
+            '00:30:00',
+            date(2024, 1, 1) + timedelta(days=number),
+        ])
+    workbook.save(path)
+
+
+def write_synthetic_images(folder, rows):
+    """One small JPEG per episode, named like downloaded thumbnails ("0 (n).jpg")"""
+    if Image is None:
+        print("⚠ Pillow is not installed - benchmarking without thumbnail uploads")
+        return
+    buffer = io.BytesIO()
+    Image.new('RGB', (320, 180), (40, 90, 160)).save(buffer, 'JPEG')
+    for number in range(1, rows + 1):
+        with open(os.path.join(folder, f'0 ({number}).jpg'), 'wb') as image_file:
+            image_file.write(buffer.getvalue())
+
+
+class CommandCounter:
+    """Counts the WebDriver commands a driver sends by wrapping ``driver.execute``
+
+    WebElement calls go through their parent driver's ``execute`` too, so every
+    round trip to chromedriver is counted.
+    """
+
+    def __init__(self, driver):
+        self.counts = Counter()
+        self._execute = driver.execute
+        driver.execute = self._counted
+
+    def _counted(self, driver_command, params=None):
+        self.counts[driver_command] += 1
+        return self._execute(driver_command, params)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+def run_benchmark(rows, workdir, portal_options, headless=True, bulk_fill=True):
+    """Copy ``rows`` synthetic episodes through a fresh stub portal and return the measurements"""
+    folder = os.path.join(workdir, f'rows_{rows}')
+    os.makedirs(folder, exist_ok=True)
+    excel_path = os.path.join(folder, 'episodes.xlsx')
+    write_synthetic_workbook(excel_path, rows)
+    write_synthetic_images(folder, rows)
+    log_path = os.path.join(folder, 'run.log')
+
+    with StubPortal(seed_ids=(TEMPLATE_ID,), **portal_options) as portal, \
+            open(log_path, 'w', encoding='utf-8') as log_file, contextlib.redirect_stdout(log_file):
+        automation = EpisodeCopyAutomation(
+            username=portal.username,
+            password=portal.password,
+            headless=headless,
+            images_folder=folder,
+            session_dir=None,
+            bulk_fill=bulk_fill,
+            portal_url=portal.url,
+            metrics_path=os.path.join(folder, 'metrics.jsonl')
+        )
+        try:
+            # Log in before measuring so the numbers are per episode only
+            if not automation.ensure_logged_in():
+                raise RuntimeError(f"could not log in to the stub portal - see {log_path}")
+            counter = CommandCounter(automation.driver)
+            tracemalloc.start()
+            started = time.monotonic()
+            saved = automation.process_episode_batch(excel_path, start_id=TEMPLATE_ID)
+            elapsed = time.monotonic() - started
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            automation.close()
+
+    return {
+        'rows': rows,
+        'saved': saved,
+        'seconds': round(elapsed, 2),
+        'episodes_per_minute': round(saved / (elapsed / 60), 2) if elapsed > 0 else 0.0,
+        'commands_per_episode': round(counter.total / max(rows, 1), 1),
+        'top_commands': dict(counter.counts.most_common(5)),
+        'peak_memory_mb': round(peak_memory / 2 ** 20, 2),
+        'log': log_path,
+    }
+
+
+def print_results(results, baseline=None):
+    """Print one line per workbook size, with the change against a baseline run if given"""
+    previous = {result['rows']: result for result in (baseline or [])}
+    print(f"{'rows':>6} {'saved':>6} {'seconds':>9} {'episodes/min':>13} {'cmds/episode':>13} {'peak MB':>8}")
+    for result in results:
+        print(f"{result['rows']:>6} {result['saved']:>6} {result['seconds']:>9.1f} "
+              f"{result['episodes_per_minute']:>13.1f} {result['commands_per_episode']:>13.1f} "
+              f"{result['peak_memory_mb']:>8.1f}")
+        before = previous.get(result['rows'])
+        if before:
+            changes = []
+            for key in ('episodes_per_minute', 'commands_per_episode', 'peak_memory_mb'):
+                if before[key]:
+                    changes.append(f"{key} {(result[key] - before[key]) / before[key]:+.1%}")
+            print(f"{'':>6} vs baseline: {', '.join(changes)}")
+        print(f"{'':>6} top commands: {result['top_commands']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10, 100, 1000], help="workbook sizes to run")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the stub adds to every request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument('--save-failure-rate', type=float, default=0.0)
+    parser.add_argument('--upload-failure-rate', type=float, default=0.0)
+    parser.add_argument('--save-mode', choices=['redirect', 'toast'], default='redirect')
+    parser.add_argument('--no-bulk-fill', action='store_true', help="type every field instead of one script call")
+    parser.add_argument('--visible', action='store_true', help="show the browser")
+    parser.add_argument('--workdir', help="where workbooks, images and logs go (default: a temp folder)")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='episode_benchmark_')
+    portal_options = {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'save_failure_rate': args.save_failure_rate,
+        'upload_failure_rate': args.upload_failure_rate,
+        'save_mode': args.save_mode,
+        'seed': 0,
+    }
+    print(f"🧪 Benchmarking {args.rows} rows against the stub portal ({args.save_mode} saves, "
+          f"{args.latency}s latency) - logs in {workdir}")
+
+    results = []
+    for rows in args.rows:
+        print(f"⏱ {rows} rows...")
+        results.append(run_benchmark(rows, workdir, portal_options, headless=not args.visible,
+                                     bulk_fill=not args.no_bulk_fill))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump({'settings': portal_options, 'results': results}, output_file, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
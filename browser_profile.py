@@ -0,0 +1,66 @@
+import copy
+import os
+
+# Requests that never matter to the automation: web fonts and third-party analytics/ads
+DEFAULT_BLOCKED_URLS = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*segment.io*',
+]
+
+# Raster images - only safe to block where no step waits for an image to render
+IMAGE_URL_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico']
+
+FAST_START_ARGUMENTS = [
+    '--disable-background-networking',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--metrics-recording-only',
+]
+
+
+class FastStartProfile:
+    """Opt-in Chrome settings that trade completeness of page loads for speed
+
+    ``driver.get`` returns at DOMContentLoaded (eager page-load strategy) and the
+    ``blocked_urls`` patterns are dropped through the DevTools protocol, so callers
+    must wait for the elements they need. Background networking and extensions
+    are disabled. With ``user_data_dir`` the same profile (and its HTTP cache) is
+    reused by every run, so later starts are warm.
+    """
+
+    def __init__(self, user_data_dir=None, blocked_urls=None, page_load_strategy='eager'):
+        self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.blocked_urls = list(DEFAULT_BLOCKED_URLS if blocked_urls is None else blocked_urls)
+        self.page_load_strategy = page_load_strategy
+
+    def for_worker(self, worker_id):
+        """Copy with its own profile directory - Chrome cannot share one between processes"""
+        profile = copy.copy(self)
+        if self.user_data_dir:
+            profile.user_data_dir = f"{self.user_data_dir}_{worker_id}"
+        return profile
+
+    def apply(self, options):
+        """Add the fast-start switches to ChromeOptions before the browser is launched"""
+        options.page_load_strategy = self.page_load_strategy
+        for argument in FAST_START_ARGUMENTS:
+            options.add_argument(argument)
+        if self.user_data_dir:
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            options.add_argument(f'--user-data-dir={self.user_data_dir}')
+        return options
+
+    def attach(self, driver):
+        """Start blocking the configured URL patterns in a launched browser"""
+        if not self.blocked_urls:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        except Exception as e:
+            print(f"⚠ Could not enable URL blocking: {e}")
@@ -4,16 +4,122 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
-import pandas as pd
 import time
 import logging
 import os
-import glob
+from urllib.parse import urlparse
+import contextlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from session_store import SessionStore
+from image_index import ImageIndex
+from thumbnails import ThumbnailPreparer
+from episode_batch import EpisodeBatch, copy_outcome
+from episode_payload import FORM_FIELDS, REQUIRED_COLUMNS, PayloadPrefetcher, episode_id_from_url
+from http_engine import HttpEpisodeEngine
+from tab_engine import TabEpisodeEngine, enable_background_tabs
+from run_journal import RunJournal
+from workbook import EPISODE_SCHEMA, Workbook
+from run_metrics import RunMetrics, timed
+from browser_profile import FastStartProfile
+from upload_tracker import UploadTracker, enable_network_events
+from retry_policy import CircuitBreaker, FatalError, RetryableError, RetryPolicy, is_retryable
+from batch_plan import dry_run_batch
+from locator_cache import LocatorResolver
+from page_scripts import (
+    AWAIT_SAVE_PROBE_SCRIPT,
+    BULK_FILL_SCRIPT,
+    CREATED_ID_SCRIPT,
+    DIALOGS_CLOSED_SCRIPT,
+    EPISODE_LINKS_SCRIPT,
+    INSTALL_SAVE_PROBE_SCRIPT,
+    LOGIN_ERROR_XPATH,
+    PREFLIGHT_SCRIPT,
+    SAVE_ERROR_XPATH,
+    SAVE_SUCCESS_XPATH,
+    SNAPSHOT_IMAGES_SCRIPT,
+    UPLOAD_PREVIEW_SCRIPT,
+    bulk_fill_batch,
+)
+
+PORTAL_URL = "https://app.dev.portal.masjidal.com"
+
+# Maximum time (seconds) each readiness wait may take before the step is treated as timed out
+DEFAULT_STEP_BUDGETS = {
+    'login_form': 30,
+    'login_result': 15,
+    'copy_form': 10,
+    'upload_dialog': 10,
+    'upload_request': 5,
+    'upload_network': 60,
+    'upload_preview': 15,
+    'dialog_close': 3,
+    'save_result': 20,
+    'listing': 10,
+    'preflight': 30,
+}
+
+# Maximum attempts per portal operation under the retry policy (backoff grows 1s, 2s, 4s... with jitter)
+DEFAULT_RETRY_BUDGETS = {
+    'login': 3,
+    'navigate': 3,
+    'save': 2,
+    'error_dialog': 2,
+}
+
+
+def any_displayed(xpath):
+    """Expected condition: some element matching the XPath is visible"""
+    def _predicate(driver):
+        for element in driver.find_elements(By.XPATH, xpath):
+            try:
+                if element.is_displayed():
+                    return element
+            except Exception:
+                continue
+        return False
+    return _predicate
+
+
+def login_settled(driver):
+    """Expected condition: login either left the login page or showed an error"""
+    if "login" not in driver.current_url:
+        return True
+    return any_displayed(LOGIN_ERROR_XPATH)(driver)
+
+
+def script_condition(script, *args):
+    """Expected condition backed by a JavaScript predicate"""
+    def _predicate(driver):
+        return driver.execute_script(script, *args)
+    return _predicate
+
 
 class EpisodeCopyAutomation:
-    def __init__(self, username, password, headless=False, images_folder="."):
+    def __init__(self, username, password, headless=False, images_folder=".",
+                 step_budgets=None, row_delay=0, session_dir="sessions", prepare_thumbnails=True,
+                 bulk_fill=True, portal_url=PORTAL_URL, metrics_path=None, fast_start=None, retry_budgets=None,
+                 locator_path=None):
         self.username = username
         self.password = password
+        self.step_budgets = dict(DEFAULT_STEP_BUDGETS)
+        if step_budgets:
+            self.step_budgets.update(step_budgets)
+        self.metrics = RunMetrics(metrics_path)
+        # One policy and circuit breaker for every portal interaction of this browser
+        self.retry = RetryPolicy(
+            dict(DEFAULT_RETRY_BUDGETS, **(retry_budgets or {})),
+            breaker=CircuitBreaker(),
+            metrics=self.metrics
+        )
+        self.row_delay = row_delay
+        self.bulk_fill = bulk_fill
+        # Fallback locator lists try whichever alternative matched last (rankings kept in locator_path)
+        self.locators = LocatorResolver(locator_path)
+        self.last_save_outcome = None
+        self.session_store = SessionStore(session_dir) if session_dir else None
+        self.portal_url = portal_url.rstrip('/')
+        self.session_host = urlparse(self.portal_url).netloc
         
         options = webdriver.ChromeOptions()
         if headless:
@@ -33,90 +139,126 @@ class EpisodeCopyAutomation:
         }
         options.add_experimental_option("prefs", prefs)
         
+        # DevTools network events tell when a thumbnail upload has really finished
+        enable_network_events(options)
+        
+        # Tabs opened by the tab engine keep running at full speed behind the visible one
+        enable_background_tabs(options)
+        
+        # Opt-in: eager page loads, blocked fonts/analytics and a reusable profile directory
+        if fast_start:
+            fast_start.apply(options)
+        
         try:
+            started = time.monotonic()
             self.driver = webdriver.Chrome(options=options)
+            if fast_start:
+                fast_start.attach(self.driver)
+            self.record_latency('browser_start', time.monotonic() - started)
+            self.upload_tracker = UploadTracker(self.driver)
+            self.last_upload = None
             self.wait = WebDriverWait(self.driver, 30)
             self.images_folder = os.path.abspath(images_folder)
+            self.image_index = ImageIndex(self.images_folder)
+            self.thumbnails = ThumbnailPreparer() if prepare_thumbnails else None
             self.logged_in = False
         except Exception as e:
             print(f"❌ Failed to initialize Chrome driver: {e}")
             raise
     
-    def login(self, retries=3):
-        """Login to the portal with retry logic"""
-        login_url = "https://app.dev.portal.masjidal.com/login"
+    def wait_for_step(self, step, condition, budget=None):
+        """Wait for a readiness condition within the step's budget and record how long it took as a span"""
+        if budget is None:
+            budget = self.step_budgets[step]
+        started = time.monotonic()
+        try:
+            return WebDriverWait(self.driver, budget, poll_frequency=0.1).until(condition)
+        finally:
+            self.record_latency(step, time.monotonic() - started)
+    
+    def record_latency(self, step, seconds):
+        """Record one latency sample for a step"""
+        self.metrics.observe(step, seconds)
+    
+    def print_step_latencies(self):
+        """Print p50/p95 of every step and wait plus the episodes per minute"""
+        self.metrics.print_summary()
+    
+    @timed('login')
+    def login(self, retries=None):
+        """Login to the portal, retrying transient failures under the retry policy"""
+        try:
+            self.retry.run('login', self.login_attempt, attempts=retries)
+        except Exception as e:
+            print(f"❌ All login attempts failed! ({e})")
+            return False
         
-        for attempt in range(retries):
-            try:
-                print(f"🔐 Attempting login (attempt {attempt + 1}/{retries})...")
-                
-                # Navigate to login page
-                self.driver.get(login_url)
-                time.sleep(3)
-                
-                # Wait for login form to load
-                print("⏳ Waiting for login form to load...")
-                email_field = self.wait.until(
-                    EC.element_to_be_clickable((By.NAME, "email"))
-                )
-                
-                # Fill in credentials
-                print("📝 Filling login credentials...")
-                email_field.clear()
-                email_field.send_keys(self.username)
-                
-                # Find and fill password field
-                password_field = self.driver.find_element(By.NAME, "password")
-                password_field.clear()
-                password_field.send_keys(self.password)
-                
-                # Click login button
-                print("🔑 Clicking login button...")
-                login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-                login_button.click()
-                
-                # Wait for login to complete and check if successful
-                time.sleep(5)
-                
-                # Check if login was successful by looking for dashboard elements or checking URL
-                if self.check_login_success():
-                    print("✅ Login successful!")
-                    self.logged_in = True
-                    return True
-                else:
-                    print("❌ Login may have failed - checking for error messages...")
-                    
-                    # Check for login errors
-                    error_messages = [
-                        "//div[contains(@class, 'alert-danger')]",
-                        "//div[contains(@class, 'error')]",
-                        "//*[contains(text(), 'Invalid')]",
-                        "//*[contains(text(), 'incorrect')]",
-                        "//*[contains(text(), 'error')]"
-                    ]
-                    
-                    for error_xpath in error_messages:
-                        try:
-                            error_element = self.driver.find_element(By.XPATH, error_xpath)
-                            if error_element.is_displayed():
-                                print(f"❌ Login error: {error_element.text}")
-                        except:
-                            continue
-                    
-                    if attempt < retries - 1:
-                        print("🔄 Retrying login...")
-                        time.sleep(3)
-                        continue
-                    
-            except Exception as e:
-                print(f"❌ Login attempt {attempt + 1} failed: {str(e)}")
-                if attempt < retries - 1:
-                    print("🔄 Retrying login...")
-                    time.sleep(3)
-                    continue
+        print("✅ Login successful!")
+        self.logged_in = True
+        self.save_session()
+        return True
+    
+    def login_attempt(self):
+        """One login attempt - raises RetryableError, or FatalError if the portal rejects the credentials"""
+        print("🔐 Attempting login...")
         
-        print("❌ All login attempts failed!")
-        return False
+        # Navigate to login page
+        self.driver.get(f"{self.portal_url}/login")
+        
+        # Wait for login form to load
+        print("⏳ Waiting for login form to load...")
+        try:
+            email_field = self.wait_for_step(
+                'login_form', EC.element_to_be_clickable((By.NAME, "email"))
+            )
+        except TimeoutException:
+            raise RetryableError("login form did not load")
+        
+        # Fill in credentials
+        print("📝 Filling login credentials...")
+        email_field.clear()
+        email_field.send_keys(self.username)
+        
+        # Find and fill password field
+        password_field = self.driver.find_element(By.NAME, "password")
+        password_field.clear()
+        password_field.send_keys(self.password)
+        
+        # Click login button
+        print("🔑 Clicking login button...")
+        login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
+        login_button.click()
+        
+        # Wait until we leave the login page or an error is shown
+        try:
+            self.wait_for_step('login_result', login_settled)
+        except TimeoutException:
+            print("⚠ Login did not settle within budget")
+        
+        # Check if login was successful by looking for dashboard elements or checking URL
+        if self.check_login_success():
+            return True
+        
+        print("❌ Login may have failed - checking for error messages...")
+        
+        # Check for login errors
+        error_messages = [
+            "//div[contains(@class, 'alert-danger')]",
+            "//div[contains(@class, 'error')]",
+            "//*[contains(text(), 'Invalid')]",
+            "//*[contains(text(), 'incorrect')]",
+            "//*[contains(text(), 'error')]"
+        ]
+        
+        for error_xpath in error_messages:
+            for error_element in self.driver.find_elements(By.XPATH, error_xpath):
+                if error_element.is_displayed():
+                    print(f"❌ Login error: {error_element.text}")
+                    # Wrong credentials will not get better by retrying
+                    if any(word in error_element.text.lower() for word in ('invalid', 'incorrect')):
+                        raise FatalError(f"credentials rejected: {error_element.text}")
+        
+        raise RetryableError("still on the login page")
     
     def check_login_success(self):
         """Check if login was successful"""
@@ -126,36 +268,17 @@ class EpisodeCopyAutomation:
             if "login" not in current_url and "dashboard" in current_url:
                 return True
             
-            # Check for dashboard elements
-            dashboard_indicators = [
-                "//*[contains(text(), 'Dashboard')]",
-                "//*[contains(text(), 'Welcome')]",
-                "//*[contains(@class, 'dashboard')]",
-                "//nav",  # Assuming there's a navigation menu after login
+            # Check for dashboard elements, then for a logout button or user menu
+            login_indicators = [
+                (By.XPATH, "//*[contains(text(), 'Dashboard')]"),
+                (By.XPATH, "//*[contains(text(), 'Welcome')]"),
+                (By.XPATH, "//*[contains(@class, 'dashboard')]"),
+                (By.XPATH, "//nav"),  # Assuming there's a navigation menu after login
+                (By.XPATH, "//*[contains(text(), 'Logout')]"),
+                (By.XPATH, "//*[contains(text(), 'Profile')]"),
+                (By.XPATH, "//*[contains(@class, 'user-menu')]")
             ]
-            
-            for indicator in dashboard_indicators:
-                try:
-                    if self.driver.find_elements(By.XPATH, indicator):
-                        return True
-                except:
-                    continue
-            
-            # Check for logout button or user menu
-            logout_indicators = [
-                "//*[contains(text(), 'Logout')]",
-                "//*[contains(text(), 'Profile')]",
-                "//*[contains(@class, 'user-menu')]"
-            ]
-            
-            for indicator in logout_indicators:
-                try:
-                    if self.driver.find_elements(By.XPATH, indicator):
-                        return True
-                except:
-                    continue
-            
-            return False
+            return self.locators.find(self.driver, 'logged_in', login_indicators) is not None
             
         except Exception as e:
             print(f"⚠ Error checking login status: {e}")
@@ -166,9 +289,15 @@ class EpisodeCopyAutomation:
         if self.logged_in:
             return True
         
+        # Reuse a stored session - it is validated by the first navigation's redirect
+        if self.restore_session():
+            print("🍪 Restored saved session - skipping login")
+            self.logged_in = True
+            return True
+        
         # Check if we're already logged in by current URL or page content
         current_url = self.driver.current_url
-        if "login" not in current_url:
+        if current_url.startswith(self.portal_url) and "login" not in current_url:
             # We might already be logged in
             if self.check_login_success():
                 self.logged_in = True
@@ -177,71 +306,89 @@ class EpisodeCopyAutomation:
         # If not logged in, perform login
         return self.login()
     
-    def navigate_to_copy_page(self, episode_id, retries=3):
-        """Navigate to the specific episode copy page with retry logic"""
+    def restore_session(self):
+        """Load the stored session for this account into the browser, if there is one"""
+        if not self.session_store:
+            return False
+        try:
+            return self.session_store.restore(
+                self.driver, self.session_host, self.username, url=f"{self.portal_url}/favicon.ico"
+            )
+        except Exception as e:
+            print(f"⚠ Could not restore saved session: {e}")
+            return False
+    
+    def save_session(self):
+        """Persist the current session so the next run can skip login"""
+        if self.session_store and self.logged_in:
+            self.session_store.save(self.driver, self.session_host, self.username)
+    
+    def handle_session_rejected(self):
+        """Drop the stored session after the portal redirected us to login, then log in again"""
+        print("⚠ Session expired, re-logging in...")
+        self.logged_in = False
+        if self.session_store:
+            self.session_store.discard(self.session_host, self.username)
+        return self.ensure_logged_in()
+    
+    @timed('navigate')
+    def navigate_to_copy_page(self, episode_id, retries=None):
+        """Navigate to the specific episode copy page, retrying under the retry policy"""
         # Ensure we're logged in first
         if not self.ensure_logged_in():
             print("❌ Cannot navigate - not logged in")
             return False
         
-        url = f"https://app.dev.portal.masjidal.com/system-admin/content/media/episode/copy/{episode_id}"
-        print(f"🌐 Navigating to: {url}")
+        print(f"🌐 Navigating to: {self.copy_url(episode_id)}")
+        try:
+            return self.retry.run('navigate', self.load_copy_page, episode_id, attempts=retries)
+        except FatalError as e:
+            print(f"❌ {e}")
+        except Exception as e:
+            print(f"❌ Failed to load form for episode {episode_id}: {e}")
+        return False
+    
+    def load_copy_page(self, episode_id):
+        """One attempt at loading the copy page - raises RetryableError or FatalError"""
+        self.driver.get(self.copy_url(episode_id))
         
-        for attempt in range(retries):
-            try:
-                self.driver.get(url)
-                # Wait for page to load
-                time.sleep(5)
-                
-                # Check if we got redirected to login (session expired)
-                if "login" in self.driver.current_url:
-                    print("⚠ Session expired, re-logging in...")
-                    self.logged_in = False
-                    if not self.ensure_logged_in():
-                        return False
-                    # Retry navigation after login
-                    continue
-                
-                # Check if page loaded successfully (not 404 or error)
-                if "404" in self.driver.title or "Error" in self.driver.title:
-                    print(f"❌ Page returned error for episode {episode_id}")
-                    return False
-                
-                # Wait for form to load - try multiple element indicators
-                form_indicators = [
-                    (By.NAME, "title"),
-                    (By.XPATH, "//h1[contains(text(), 'Edit Episode')]"),
-                    (By.XPATH, "//h2[contains(text(), 'Episode Information')]"),
-                    (By.XPATH, "//input[@name='title']")
-                ]
-                
-                for by, selector in form_indicators:
-                    try:
-                        element = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((by, selector))
-                        )
-                        if element:
-                            print(f"✅ Form loaded successfully for episode {episode_id} (attempt {attempt + 1})")
-                            return True
-                    except TimeoutException:
-                        continue
-                
-                print(f"⚠ Form not loaded on attempt {attempt + 1} for episode {episode_id}")
-                
-                # Try refreshing the page
-                if attempt < retries - 1:
-                    print("🔄 Refreshing page...")
-                    self.driver.refresh()
-                    time.sleep(3)
-                    
-            except Exception as e:
-                print(f"❌ Navigation error for episode {episode_id} (attempt {attempt + 1}): {e}")
-                if attempt < retries - 1:
-                    time.sleep(3)
-                    continue
+        # Wait for the form, a login redirect or an error page - whichever comes first
+        form_indicators = [
+            (By.NAME, "title"),
+            (By.XPATH, "//h1[contains(text(), 'Edit Episode')]"),
+            (By.XPATH, "//h2[contains(text(), 'Episode Information')]"),
+            (By.XPATH, "//input[@name='title']")
+        ]
+        try:
+            self.wait_for_step('copy_form', EC.any_of(
+                EC.url_contains("login"),
+                EC.title_contains("404"),
+                EC.title_contains("Error"),
+                *[EC.presence_of_element_located(indicator) for indicator in self.locators.order('copy_form', form_indicators)]
+            ))
+        except TimeoutException:
+            pass
         
-        print(f"❌ Failed to load form for episode {episode_id} after {retries} attempts")
-        return False
+        # Check if we got redirected to login (session expired)
+        if "login" in self.driver.current_url:
+            if not self.handle_session_rejected():
+                raise FatalError("session expired and logging in again failed")
+            raise RetryableError("session expired - logged in again")
+        
+        # Check if page loaded successfully (not 404 or error)
+        if "404" in self.driver.title or "Error" in self.driver.title:
+            raise FatalError(f"Page returned error for episode {episode_id}")
+        
+        # Confirm which indicator is present (the wait above already settled the page)
+        if self.locators.find(self.driver, 'copy_form', form_indicators):
+            print(f"✅ Form loaded successfully for episode {episode_id}")
+            return True
+        
+        raise RetryableError(f"form not loaded for episode {episode_id}")
+    
+    def copy_url(self, episode_id):
+        """URL of the copy page for an episode"""
+        return f"{self.portal_url}/system-admin/content/media/episode/copy/{episode_id}"
     
     def check_if_episode_exists(self, episode_id):
         """Check if an episode exists by trying to navigate to it"""
@@ -249,137 +396,193 @@ class EpisodeCopyAutomation:
         if not self.ensure_logged_in():
             return False
             
-        url = f"https://app.dev.portal.masjidal.com/system-admin/content/media/episode/copy/{episode_id}"
+        url = self.copy_url(episode_id)
         
         try:
-            self.driver.get(url)
-            time.sleep(3)
-            
-            # Check if we got redirected to login
-            if "login" in self.driver.current_url:
-                return False
+            for attempt in range(2):
+                self.driver.get(url)
+                try:
+                    self.wait_for_step('copy_form', EC.any_of(
+                        EC.url_contains("login"),
+                        EC.title_contains("404"),
+                        EC.presence_of_element_located((By.NAME, "title"))
+                    ))
+                except TimeoutException:
+                    pass
                 
-            # Check for 404 or error pages
-            page_source = self.driver.page_source.lower()
-            if "404" in page_source or "not found" in page_source or "error" in page_source:
-                return False
+                # A login redirect means the session was rejected - log in once and look again
+                if "login" not in self.driver.current_url:
+                    break
+                if attempt or not self.handle_session_rejected():
+                    return False
                 
-            # Check if form elements exist
-            try:
-                self.driver.find_element(By.NAME, "title")
-                return True
-            except:
+            # A missing episode shows a 404 page - only the copy form itself means it exists
+            # (any page's scripts or text may contain words like "error")
+            if "404" in self.driver.title:
                 return False
+            return bool(self.driver.find_elements(By.NAME, "title"))
                 
         except Exception as e:
             print(f"Error checking episode {episode_id}: {e}")
             return False
     
+    def preflight_id_range(self, episode_ids, concurrency=8):
+        """Check many episode IDs at once with in-page fetches sharing the browser session
+        
+        Returns a dict mapping each ID to ``exists``, ``missing``, ``forbidden`` or ``error``.
+        """
+        episode_ids = list(episode_ids)
+        if not self.ensure_logged_in():
+            return {episode_id: 'forbidden' for episode_id in episode_ids}
+        
+        for attempt in range(2):
+            # fetch() needs a page on the portal's origin to send its cookies
+            if not self.driver.current_url.startswith(self.portal_url):
+                self.driver.get(f"{self.portal_url}/favicon.ico")
+            started = time.monotonic()
+            self.driver.set_script_timeout(self.step_budgets['preflight'])
+            results = self.driver.execute_async_script(
+                PREFLIGHT_SCRIPT, episode_ids, self.copy_url(''), concurrency
+            )
+            self.record_latency('preflight', time.monotonic() - started)
+            statuses = {int(episode_id): status for episode_id, status in results.items()}
+            
+            # Every ID redirected means the stored session was rejected rather than the IDs
+            if attempt == 0 and statuses and all(status == 'forbidden' for status in statuses.values()):
+                if self.handle_session_rejected():
+                    continue
+            return statuses
+        return statuses
+    
     def find_image_for_episode(self, episode_number):
         """Find the corresponding image file for the episode number"""
         # Skip if episode_number is not a valid number
         try:
-            int(episode_number)
+            image_path = self.image_index.lookup(episode_number)
         except (ValueError, TypeError):
             print(f"⚠ Invalid episode number: {episode_number}")
             return None
-            
-        patterns = [
-            f"*({episode_number}).jpg",
-            f"*({episode_number}).jpeg", 
-            f"*({episode_number}).png",
-            f"*{episode_number}*.jpg",
-            f"*{episode_number}*.jpeg",
-            f"*{episode_number}*.png",
-            f"*{episode_number}.jpg",
-            f"*{episode_number}.jpeg",
-            f"*{episode_number}.png",
-            f"0 ({episode_number}).jpg",
-            f"0 ({episode_number}).jpeg",
-            f"0 ({episode_number}).png"
-        ]
         
-        for pattern in patterns:
-            matches = glob.glob(os.path.join(self.images_folder, pattern))
-            if matches:
-                print(f"📷 Found image: {os.path.basename(matches[0])} for episode {episode_number}")
-                return matches[0]
+        if image_path:
+            print(f"📷 Found image: {os.path.basename(image_path)} for episode {episode_number}")
+            return image_path
         
         print(f"⚠ No image found for episode {episode_number}")
         return None
     
-    def upload_thumbnail_image(self, image_path, episode_number):
-        """Upload thumbnail image with better error handling"""
+    @timed('upload')
+    def upload_thumbnail_image(self, image_path, episode_number, attempts=3):
+        """Upload the thumbnail, confirm it from the network and retry in the same form if it fails"""
         try:
             if not image_path or not os.path.exists(image_path):
                 print(f"❌ Image file not found: {image_path}")
                 return False
             
             print(f"📤 Attempting to upload image: {os.path.basename(image_path)}")
+            if self.thumbnails:
+                image_path = self.thumbnails.prepared_path(image_path)
+            absolute_path = os.path.abspath(image_path)
+            file_size = os.path.getsize(absolute_path)
             
-            # Find and click the upload button
-            upload_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, 
-                    "//button[contains(@class, 'btn-ma-primary') and contains(text(), 'Upload Thumbnail Image')]"))
-            )
-            
-            # Scroll to the button
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", upload_btn)
-            time.sleep(2)
-            
-            # Click the upload button
-            upload_btn.click()
-            print("✅ Clicked upload button")
-            time.sleep(3)
-            
-            # Find the file input element
-            file_input = self.find_file_input()
-            
-            if file_input:
-                # Send the absolute path to the file input
-                absolute_path = os.path.abspath(image_path)
-                file_input.send_keys(absolute_path)
-                print(f"✅ Image path sent: {os.path.basename(image_path)}")
+            self.driver.execute_script(SNAPSHOT_IMAGES_SCRIPT)
+            for attempt in range(1, attempts + 1):
+                # Retries reuse the open dialog - the form and its typed values stay as they are
+                file_input = self.open_upload_dialog(reuse=attempt > 1)
+                if not file_input:
+                    print("❌ Could not find file input element")
+                    return False
                 
-                # Wait for upload to complete
-                time.sleep(4)
+                # Only network events from here on belong to this upload
+                self.upload_tracker.mark()
+                self.driver.execute_script("arguments[0].value = '';", file_input)
+                file_input.send_keys(absolute_path)
+                print(f"✅ Image path sent: {os.path.basename(image_path)} (attempt {attempt}/{attempts})")
                 
-                # Try to close any dialogs
-                self.close_dialogs()
+                result = self.await_upload(file_input, file_size)
+                if result['status'] in ('ok', 'none', 'unavailable'):
+                    self.close_dialogs()
+                    print(f"✅ Image upload completed for episode {episode_number}")
+                    return True
                 
-                print(f"✅ Image upload completed for episode {episode_number}")
-                return True
-            else:
-                print("❌ Could not find file input element")
-                return False
+                print(f"⚠ Upload {result['status']}: {result.get('error') or 'no response within budget'}")
+                if attempt < attempts:
+                    print("🔄 Retrying the upload without reloading the form...")
+            
+            self.close_dialogs()
+            print(f"❌ Upload failed after {attempts} attempts for episode {episode_number}")
+            return False
                     
         except Exception as e:
             print(f"❌ Error uploading image for episode {episode_number}: {str(e)}")
             return False
     
+    def open_upload_dialog(self, reuse=False):
+        """Open the upload dialog and return its file input (``reuse`` keeps an already open one)"""
+        if reuse:
+            file_input = self.find_file_input()
+            if file_input:
+                return file_input
+        
+        # Find and click the upload button
+        upload_btn = self.wait.until(
+            EC.element_to_be_clickable((By.XPATH, 
+                "//button[contains(@class, 'btn-ma-primary') and contains(text(), 'Upload Thumbnail Image')]"))
+        )
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", upload_btn)
+        upload_btn.click()
+        print("✅ Clicked upload button")
+        try:
+            self.wait_for_step('upload_dialog', EC.presence_of_element_located((By.XPATH, "//input[@type='file']")))
+        except TimeoutException:
+            print("⚠ Upload dialog not detected within budget - trying fallback selectors")
+        return self.find_file_input()
+    
+    def await_upload(self, file_input, file_size):
+        """Wait for the upload request to finish and report it
+        
+        Falls back to waiting for the preview when no upload request shows up in the
+        network events (or they are not available). Returns the tracker's result dict.
+        """
+        started = time.monotonic()
+        result = self.upload_tracker.wait(
+            self.step_budgets['upload_request'], self.step_budgets['upload_network'], file_size
+        )
+        self.metrics.observe('upload_network', time.monotonic() - started, ok=result['status'] == 'ok',
+                             status=result['status'], http_status=result['http_status'], bytes=file_size)
+        self.last_upload = result
+        
+        if result['status'] == 'ok':
+            print(f"📶 Upload finished: HTTP {result['http_status']}, {file_size / 1024:.0f} KB "
+                  f"in {result['duration_ms']} ms")
+        elif result['status'] == 'none':
+            print("⚠ No upload request seen on the network - waiting for the preview instead")
+        
+        if result['status'] in ('ok', 'none', 'unavailable'):
+            # Wait for the uploaded preview to render
+            try:
+                self.wait_for_step('upload_preview', script_condition(UPLOAD_PREVIEW_SCRIPT, file_input))
+            except TimeoutException:
+                print("⚠ Upload preview not seen within budget - continuing")
+        return result
+    
     def find_file_input(self):
         """Find the file input element with multiple strategies"""
         file_input_selectors = [
-            "//input[@type='file']",
-            "//input[contains(@accept, 'image')]",
-            "//input[@name='file']",
-            "//input[@name='image']",
-            "//input[@name='upload']",
-            "//input[contains(@class, 'file')]"
+            (By.XPATH, "//input[@type='file']"),
+            (By.XPATH, "//input[contains(@accept, 'image')]"),
+            (By.XPATH, "//input[@name='file']"),
+            (By.XPATH, "//input[@name='image']"),
+            (By.XPATH, "//input[@name='upload']"),
+            (By.XPATH, "//input[contains(@class, 'file')]")
         ]
         
-        for selector in file_input_selectors:
-            try:
-                file_input = self.driver.find_element(By.XPATH, selector)
-                if file_input:
-                    # Make sure it's interactable
-                    self.driver.execute_script("arguments[0].style.display = 'block';", file_input)
-                    self.driver.execute_script("arguments[0].style.visibility = 'visible';", file_input)
-                    return file_input
-            except:
-                continue
-        
-        return None
+        file_input = self.locators.find(self.driver, 'file_input', file_input_selectors)
+        if file_input:
+            # Make sure it's interactable
+            self.driver.execute_script(
+                "arguments[0].style.display = 'block'; arguments[0].style.visibility = 'visible';", file_input
+            )
+        return file_input
     
     def close_dialogs(self):
         """Close any open dialogs"""
@@ -387,7 +590,8 @@ class EpisodeCopyAutomation:
             # Try pressing ESC
             body = self.driver.find_element(By.TAG_NAME, "body")
             body.send_keys(Keys.ESCAPE)
-            time.sleep(1)
+            self.wait_for_step('dialog_close', script_condition(DIALOGS_CLOSED_SCRIPT))
+            return
         except:
             pass
         
@@ -395,61 +599,45 @@ class EpisodeCopyAutomation:
             # Try clicking on body
             body = self.driver.find_element(By.TAG_NAME, "body")
             body.click()
-            time.sleep(1)
+            self.wait_for_step('dialog_close', script_condition(DIALOGS_CLOSED_SCRIPT))
         except:
             pass
     
-    def fill_episode_form(self, episode_data):
-        """Fill the episode form with data from Excel"""
+    @timed('fill_form')
+    def fill_episode_form(self, payload):
+        """Fill the episode form from a prepared payload and upload its thumbnail"""
         try:
             print("📝 Filling episode form...")
             
-            # Skip if episode number is invalid
-            try:
-                episode_num = int(episode_data['EpisodeNumber'])
-            except (ValueError, TypeError):
-                print(f"❌ Invalid episode number: {episode_data['EpisodeNumber']}")
-                return False
-            
-            # Fill required fields
-            required_fields = {
-                'Title': ('name', 'title'),
-                'EpisodeNumber': ('name', 'episode_number'), 
-                'ContentUrl': ('name', 'content_url')
-            }
+            pending = payload.fields
+            if self.bulk_fill:
+                confirmed = self.bulk_fill_fields(payload.fields)
+                for excel_col in confirmed:
+                    print(f"  ✅ Filled {excel_col}: {payload.fields[excel_col]}")
+                pending = {col: value for col, value in payload.fields.items() if col not in confirmed}
+                if pending:
+                    print(f"  ↩ Falling back to per-field fill for: {', '.join(pending)}")
             
-            for excel_col, (attr_type, attr_value) in required_fields.items():
-                if pd.notna(episode_data[excel_col]) and str(episode_data[excel_col]).strip():
-                    success = self.fill_text_field(attr_type, attr_value, episode_data[excel_col])
-                    if success:
-                        print(f"  ✅ Filled {excel_col}: {episode_data[excel_col]}")
-                    else:
-                        print(f"  ❌ Failed to fill {excel_col}")
-                        return False
-            
-            # Fill optional fields if they have values
-            optional_fields = {
-                'Subtitle': ('name', 'subtitle'),
-                'Duration': ('name', 'duration'),
-                'ReleaseDate': ('name', 'release_date')
-            }
+            for excel_col, value in pending.items():
+                if excel_col == 'ReleaseDate':
+                    self.fill_date_field(value)
+                    success = True
+                else:
+                    success = self.fill_text_field('name', FORM_FIELDS[excel_col], value)
+                
+                if success:
+                    print(f"  ✅ Filled {excel_col}: {value}")
+                elif excel_col in REQUIRED_COLUMNS:
+                    print(f"  ❌ Failed to fill {excel_col}")
+                    return False
+                else:
+                    print(f"  ⚠ Failed to fill optional {excel_col}")
             
-            for excel_col, (attr_type, attr_value) in optional_fields.items():
-                if (excel_col in episode_data and 
-                    pd.notna(episode_data[excel_col]) and 
-                    str(episode_data[excel_col]).strip()):
-                    
-                    if excel_col == 'ReleaseDate':
-                        self.fill_date_field(episode_data[excel_col])
-                    else:
-                        self.fill_text_field(attr_type, attr_value, episode_data[excel_col])
-                    print(f"  ✅ Filled {excel_col}: {episode_data[excel_col]}")
-            
-            # Upload thumbnail image based on episode number
-            episode_number = episode_data['EpisodeNumber']
-            image_path = self.find_image_for_episode(episode_number)
-            if image_path:
-                if self.upload_thumbnail_image(image_path, episode_number):
+            # Upload the thumbnail resolved for this episode number
+            episode_number = payload.episode_number
+            if payload.image_path:
+                print(f"📷 Found image: {os.path.basename(payload.image_path)} for episode {episode_number}")
+                if self.upload_thumbnail_image(payload.image_path, episode_number):
                     print(f"  ✅ Image uploaded successfully")
                 else:
                     print(f"  ⚠ Image upload failed, but continuing...")
@@ -462,6 +650,15 @@ class EpisodeCopyAutomation:
             print(f"❌ Error filling form: {str(e)}")
             return False
     
+    def bulk_fill_fields(self, fields):
+        """Set all fields in one in-page script call, returns the Excel columns it confirmed"""
+        try:
+            results = self.driver.execute_script(BULK_FILL_SCRIPT, bulk_fill_batch(fields)) or {}
+        except Exception as e:
+            print(f"⚠ Bulk fill failed: {str(e)}")
+            return set()
+        return {excel_col for excel_col, ok in results.items() if ok}
+    
     def fill_text_field(self, attr_type, attr_value, text):
         """Fill text input fields with better error handling"""
         try:
@@ -486,25 +683,21 @@ class EpisodeCopyAutomation:
                 (By.CSS_SELECTOR, "input[placeholder*='date']")
             ]
             
-            for by, selector in date_selectors:
-                try:
-                    element = self.driver.find_element(by, selector)
-                    element.clear()
-                    element.send_keys(str(date_str))
-                    return
-                except:
-                    continue
-                    
+            element = self.locators.find(self.driver, 'date_field', date_selectors)
+            if element:
+                element.clear()
+                element.send_keys(str(date_str))
+                return
+            
             print("⚠ Could not find date field to fill")
         except Exception as e:
             print(f"⚠ Could not fill date field: {str(e)}")
     
+    @timed('save')
     def save_episode(self):
         """Click the save button and handle the response properly"""
+        self.last_save_outcome = None
         try:
-            # Wait a moment before saving
-            time.sleep(3)
-            
             # Find the save button
             save_button = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, 
@@ -513,23 +706,71 @@ class EpisodeCopyAutomation:
             
             # Scroll to save button
             self.driver.execute_script("arguments[0].scrollIntoView(true);", save_button)
-            time.sleep(2)
             
             print("💾 Clicking Save button...")
             
-            # Click the save button
+            # Watch the page for the outcome before clicking so nothing is missed
+            probe_installed = self.install_save_probe()
             save_button.click()
             
-            # Wait for the save to process
-            time.sleep(8)
+            outcome = self.await_save_outcome() if probe_installed else None
+            if outcome and outcome['outcome'] == 'error':
+                print(f"❌ Save failed with error: {outcome['message']}")
+                self.handle_error_dialog()
+                return False
+            if outcome and outcome['outcome'] == 'success':
+                print(f"✅ Save successful: {outcome['message']} ({outcome['elapsed_ms']} ms)")
+                return True
+            if outcome and outcome['outcome'] == 'redirect':
+                print("✅ Save successful - redirected from copy page")
+                return True
             
-            # Check for success or error
+            # No clear signal from the probe - fall back to scanning the page
             return self.check_save_result()
             
         except Exception as e:
             print(f"❌ Error clicking save button: {str(e)}")
             return False
     
+    def install_save_probe(self):
+        """Install the in-page save outcome detector, returns False if it could not be installed"""
+        try:
+            self.driver.execute_script(INSTALL_SAVE_PROBE_SCRIPT, SAVE_ERROR_XPATH, SAVE_SUCCESS_XPATH)
+            return True
+        except Exception as e:
+            print(f"⚠ Could not install save probe: {e}")
+            return False
+    
+    def await_save_outcome(self):
+        """Wait for the save probe in a single async script call
+        
+        Returns a dict with ``outcome`` (success, error, redirect, timeout or unknown),
+        ``message``, ``elapsed_ms`` and ``url``.
+        """
+        budget = self.step_budgets['save_result']
+        started = time.monotonic()
+        try:
+            self.driver.set_script_timeout(budget + 5)
+            outcome = self.driver.execute_async_script(AWAIT_SAVE_PROBE_SCRIPT, int(budget * 1000))
+        except Exception:
+            # The document unloaded mid-wait - a full page redirect after the save
+            current_url = self.driver.current_url
+            outcome = {
+                'outcome': 'redirect' if "copy" not in current_url else 'unknown',
+                'message': '',
+                'elapsed_ms': None,
+                'url': current_url,
+            }
+        if outcome.get('elapsed_ms') is None:
+            outcome['elapsed_ms'] = round((time.monotonic() - started) * 1000)
+        self.record_latency('save_result', time.monotonic() - started)
+        
+        if outcome['outcome'] == 'timeout':
+            print("⚠ Save result not seen within budget")
+        self.last_save_outcome = outcome
+        return outcome
+    
+    @timed('check_save_result')
     def check_save_result(self):
         """Check the result of the save operation"""
         try:
@@ -549,6 +790,8 @@ class EpisodeCopyAutomation:
                         if element.is_displayed():
                             error_text = element.text
                             print(f"❌ Save failed with error: {error_text}")
+                            self.last_save_outcome = {'outcome': 'error', 'message': error_text,
+                                                      'elapsed_ms': None, 'url': self.driver.current_url}
                             
                             # Try to handle error dialog
                             self.handle_error_dialog()
@@ -592,125 +835,451 @@ class EpisodeCopyAutomation:
     def handle_error_dialog(self):
         """Handle error dialogs that might appear after failed save"""
         try:
-            # Look for Cancel button in error dialog and click it
-            cancel_buttons = [
-                "//button[contains(text(), 'Cancel')]",
-                "//button[contains(@class, 'btn-secondary')]",
-                "//button[contains(@class, 'btn-default')]"
-            ]
-            
-            for button_xpath in cancel_buttons:
-                try:
-                    cancel_btn = self.driver.find_element(By.XPATH, button_xpath)
-                    if cancel_btn.is_displayed():
-                        cancel_btn.click()
-                        print("✅ Clicked Cancel button in error dialog")
-                        time.sleep(2)
-                        return
-                except:
-                    continue
-                    
-            # If no cancel button, try pressing ESC
-            self.close_dialogs()
-                
+            self.retry.run('error_dialog', self.dismiss_error_dialog)
         except Exception as e:
             print(f"⚠ Error handling dialog: {e}")
     
-    def process_episode_batch(self, excel_path, start_id=665, end_id=694):
-        """Process all episodes from Excel with enhanced error handling"""
+    def dismiss_error_dialog(self):
+        """Click the error dialog's Cancel button (or press ESC) - raises RetryableError if it stays open"""
+        # Look for Cancel button in error dialog and click it
+        cancel_buttons = [
+            (By.XPATH, "//button[contains(text(), 'Cancel')]"),
+            (By.XPATH, "//button[contains(@class, 'btn-secondary')]"),
+            (By.XPATH, "//button[contains(@class, 'btn-default')]")
+        ]
+        
+        cancel_btn = self.locators.find(self.driver, 'error_dialog_cancel', cancel_buttons, displayed=True)
+        if cancel_btn:
+            cancel_btn.click()
+            print("✅ Clicked Cancel button in error dialog")
+            try:
+                self.wait_for_step('dialog_close', EC.invisibility_of_element(cancel_btn))
+            except TimeoutException:
+                raise RetryableError("error dialog did not close")
+            return True
+        
+        # If no cancel button, try pressing ESC
+        self.close_dialogs()
+        if not self.driver.execute_script(DIALOGS_CLOSED_SCRIPT):
+            raise RetryableError("error dialog is still open")
+        return True
+    
+    def process_episode_batch(self, excel_path, start_id=665, end_id=None, template_id=None, row_positions=None,
+                              journal_path=None, resume=False):
+        """Process all episodes from Excel with enhanced error handling
+        
+        By default each save is chained: each row copies the episode the previous save
+        created (its ID is read back after every save), starting from ``start_id`` and
+        optionally stopping once IDs pass ``end_id``.
+        When ``template_id`` is given every row is copied from that one episode instead,
+        so rows are independent of each other and can be split across workers via
+        ``row_positions`` (zero-based positions of the Excel rows to process).
+        
+        With ``journal_path`` every row's outcome is appended to a crash-safe journal;
+        ``resume=True`` reads it back and continues from the first unfinished row using
+        the settings the interrupted run was started with. If that run's chain stopped
+        because a new episode's ID could not be read, ``start_id`` must be that ID.
+        """
+        journal = RunJournal(journal_path) if journal_path else None
         try:
-            # Read Excel file
-            df = pd.read_excel(excel_path)
+            finished_rows = set()
+            chain_source_id = start_id
+            # Check the source and the whole ID range up front (a resumed run already did)
+            run_preflight = not resume
+            if resume:
+                state = journal.resume_state() if journal else None
+                if state is None:
+                    print(f"❌ Nothing to resume - no journal found at {journal_path}")
+                    return 0
+                settings = state['settings']
+                if os.path.abspath(settings['excel_path']) != os.path.abspath(excel_path):
+                    print(f"⚠ Journal was written for {settings['excel_path']}, resuming with {excel_path}")
+                chain_start_id = start_id
+                start_id = settings['start_id']
+                end_id = settings['end_id']
+                template_id = settings['template_id']
+                finished_rows = state['finished_rows']
+                chain_source_id = state['chain_source_id']
+                if template_id is None and chain_source_id is None:
+                    # The chain stopped at a save whose new episode ID was not read
+                    if chain_start_id == start_id:
+                        print("❌ The interrupted chain stopped at an episode whose ID is not known - "
+                              "set START_ID to that episode's ID and resume again")
+                        return 0
+                    chain_source_id = chain_start_id
+                    run_preflight = True
+                    print(f"🔗 Continuing the chain from START_ID {chain_source_id}")
+                print(f"♻ Resuming from {journal_path}: {len(finished_rows)} rows already done")
+            
+            # Validate the whole workbook in one streamed pass before touching the portal
+            workbook = Workbook(excel_path, EPISODE_SCHEMA)
+            report = workbook.validate(collect=('EpisodeNumber',))
+            if report.missing_columns:
+                raise ValueError(f"Missing required columns: {report.missing_columns}")
+            if report.errors:
+                report.print_summary()
+            
+            total_rows = report.row_count
+            wanted_positions = set(row_positions) if row_positions is not None else None
+            
+            def wanted(position):
+                return wanted_positions is None or position in wanted_positions
             
-            # Validate required columns
-            required_columns = ['EpisodeNumber', 'Title', 'ContentUrl']
-            missing_cols = [col for col in required_columns if col not in df.columns]
-            if missing_cols:
-                raise ValueError(f"Missing required columns: {missing_cols}")
+            # Rows are streamed as typed records, never loaded whole
+            rows = (
+                (row_index, record, problems)
+                for position, (row_index, record, problems) in enumerate(workbook.records())
+                if wanted(position) and row_index + 1 not in finished_rows
+            )
+            row_count = (total_rows if wanted_positions is None else len(wanted_positions)) - len(finished_rows)
             
-            success_count = 0
-            current_id = start_id
+            first_source_id = chain_source_id if template_id is None else template_id
             
-            print(f"🚀 Starting batch processing from episode ID {start_id} to {end_id}")
-            print(f"📊 Found {len(df)} episodes in Excel")
+            if template_id is None:
+                print(f"🚀 Starting batch processing from episode ID {chain_source_id}" + (f" up to {end_id}" if end_id else ""))
+            else:
+                print(f"🚀 Starting batch processing - copying every row from template episode {template_id}")
+            print(f"📊 Found {row_count} episodes in Excel")
             print(f"📁 Images folder: {self.images_folder}")
             print("=" * 60)
             
-            # First, let's check if the starting episode exists
-            print(f"🔍 Checking if episode {start_id} exists...")
-            if not self.check_if_episode_exists(start_id):
-                print(f"❌ Episode {start_id} does not exist or is not accessible!")
-                print("💡 Please check:")
-                print("   - Does episode 665 exist in the system?")
-                print("   - Do you have permission to access it?")
-                print("   - Is the URL correct?")
+            # Start shrinking every thumbnail of the batch while the browser works
+            if self.thumbnails:
+                episode_numbers = [n for position, n in report.collected['EpisodeNumber'] if wanted(position)]
+                self.thumbnails.start(
+                    path for path in (self.image_index.lookup(n) for n in episode_numbers) if path
+                )
+            
+            if journal and not resume:
+                journal.start(
+                    excel_path=excel_path,
+                    start_id=start_id,
+                    end_id=end_id,
+                    template_id=template_id,
+                    row_positions=list(row_positions) if row_positions is not None else None
+                )
+            
+            if run_preflight and not self.run_preflight(first_source_id, end_id if template_id is None else None):
                 return 0
             
-            for index, row in df.iterrows():
-                if current_id > end_id:
-                    print("🎯 Reached maximum episode ID")
-                    break
-                
-                # Skip rows with invalid episode numbers
-                try:
-                    episode_num = int(row['EpisodeNumber'])
-                except (ValueError, TypeError):
-                    print(f"⏭ Skipping row {index + 1} - invalid episode number: {row['EpisodeNumber']}")
-                    current_id += 1
-                    continue
-                
-                episode_number = row['EpisodeNumber']
-                print(f"\n📍 Processing episode {current_id} - Excel row {index + 1}/{len(df)}")
-                print(f"   Episode: {episode_number}, Title: {row['Title']}")
-                
-                # Navigate to copy page with retry logic
-                if not self.navigate_to_copy_page(current_id):
-                    print(f"❌ Failed to load page for episode {current_id}")
-                    print(f"💡 Cannot continue because episode {current_id + 1} requires episode {current_id} to exist!")
-                    break
-                
-                # Fill form with episode data and upload image
-                if self.fill_episode_form(row):
-                    # Save the episode
-                    if self.save_episode():
-                        success_count += 1
-                        print(f"✅ Successfully processed episode {current_id} (Episode {episode_number})")
-                        print(f"📝 This should have created episode {current_id + 1}")
-                    else:
-                        print(f"❌ Failed to save episode {current_id}")
-                        print(f"💡 Episode {current_id + 1} will not be created!")
-                else:
-                    print(f"❌ Failed to fill form for episode {current_id}")
+            # Rows are validated and their images resolved on a background thread
+            batch = EpisodeBatch(chain_source_id, end_id, template_id, self.metrics, journal)
+            for payload, source_id in batch.rows(PayloadPrefetcher(rows, self.image_index)):
+                outcome = self.copy_row(source_id, payload, total_rows, allow_listing=template_id is None)
+                batch.finish(payload, source_id, outcome)
                 
-                current_id += 1
-                print(f"⏳ Waiting 4 seconds before next episode...")
-                time.sleep(4)
+                if self.row_delay:
+                    print(f"⏳ Waiting {self.row_delay} seconds before next episode...")
+                    with self.metrics.span('row_delay'):
+                        time.sleep(self.row_delay)
+            success_count = batch.success_count
             
             print(f"\n{'='*60}")
-            print(f"🎉 BATCH COMPLETED: {success_count}/{len(df)} episodes processed successfully")
+            print(f"🎉 BATCH COMPLETED: {success_count}/{row_count} episodes processed successfully")
             print(f"{'='*60}")
+            self.print_step_latencies()
+            self.retry.print_summary()
+            self.locators.print_summary()
             return success_count
             
         except Exception as e:
             print(f"❌ Batch processing error: {str(e)}")
             return 0
+        
+        finally:
+            if self.thumbnails:
+                self.thumbnails.close()
+            if journal:
+                journal.close()
+            self.metrics.close()
+    
+    def save_with_retry(self, source_id, payload):
+        """Save the filled form; if the portal rejects the save, reload, refill and save again
+        
+        Only an explicit error from the portal is retried - when the outcome is unclear
+        the episode may already exist and another save could create a duplicate.
+        """
+        attempts = {'count': 0}
+        
+        def attempt():
+            attempts['count'] += 1
+            if attempts['count'] > 1:
+                if not self.navigate_to_copy_page(source_id) or not self.fill_episode_form(payload):
+                    raise RetryableError("could not reload and refill the form")
+            if self.save_episode():
+                return True
+            outcome = self.last_save_outcome or {}
+            if outcome.get('outcome') == 'error':
+                raise RetryableError(f"portal rejected the save: {outcome.get('message') or 'error shown'}")
+            raise FatalError("save outcome unclear - not retrying to avoid a duplicate episode")
+        
+        try:
+            return self.retry.run('save', attempt)
+        except Exception as e:
+            # Retryable failures were already reported by the retry policy
+            if not is_retryable(e):
+                print(f"⚠ {e}")
+            return False
+    
+    def copy_row(self, source_id, payload, total_rows, allow_listing=True):
+        """Copy one row in the browser: load the copy page, fill it, upload the thumbnail and save
+        
+        Returns a ``copy_outcome`` dict with the step ``timings``; ``missing`` means the
+        copy page could not be loaded. ``allow_listing`` lets the new episode's ID be read
+        from the episode listing (only reliable when no other worker is saving).
+        """
+        excel_row = payload.row_index + 1
+        started = time.monotonic()
+        self.metrics.begin_episode(excel_row, source_id)
+        print(f"\n📍 Processing episode {source_id} - Excel row {excel_row}/{total_rows}")
+        print(f"   Episode: {payload.episode_number}, Title: {payload.title}")
+        timings = {}
+        
+        # Navigate to copy page with retry logic
+        step_started = time.monotonic()
+        navigated = self.navigate_to_copy_page(source_id)
+        timings['navigate'] = time.monotonic() - step_started
+        if not navigated:
+            return copy_outcome('missing', "copy page did not load", started, timings=timings)
+        
+        # Fill form with episode data and upload image
+        step_started = time.monotonic()
+        filled = self.fill_episode_form(payload)
+        timings['fill'] = time.monotonic() - step_started
+        if not filled:
+            return copy_outcome('error', "form fill failed", started, timings=timings)
+        
+        # Save the episode
+        step_started = time.monotonic()
+        saved = self.save_with_retry(source_id, payload)
+        timings['save'] = time.monotonic() - step_started
+        if not saved:
+            return copy_outcome('error', "save failed", started, timings=timings)
+        
+        created_id = self.capture_created_id(source_id, allow_listing=allow_listing)
+        return copy_outcome('success', '', started, self.driver.current_url, created_id=created_id, timings=timings)
+    
+    def run_preflight(self, source_id, end_id=None):
+        """Preflight ``source_id..end_id`` and report it, returns False if the batch cannot start"""
+        episode_ids = list(range(source_id, (end_id or source_id) + 1))
+        print(f"🔍 Preflight of {len(episode_ids)} episode IDs ({source_id}..{episode_ids[-1]})...")
+        started = time.monotonic()
+        try:
+            statuses = self.preflight_id_range(episode_ids)
+        except Exception as e:
+            print(f"⚠ Preflight failed ({e}) - falling back to a single page check")
+            statuses = {source_id: 'exists' if self.check_if_episode_exists(source_id) else 'missing'}
+        
+        counts = {}
+        for status in statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        print(f"   {summary} ({time.monotonic() - started:.1f}s)")
+        
+        if statuses.get(source_id) != 'exists':
+            print(f"❌ Episode {source_id} is {statuses.get(source_id, 'unknown')} - cannot start!")
+            print("💡 Please check:")
+            print(f"   - Does episode {source_id} exist in the system?")
+            print("   - Do you have permission to access it?")
+            print("   - Is the URL correct?")
+            return False
+        
+        forbidden = [episode_id for episode_id, status in statuses.items() if status == 'forbidden']
+        if forbidden:
+            print(f"❌ No access to episode IDs {forbidden} - check the account's permissions")
+            return False
+        taken = [episode_id for episode_id, status in statuses.items() if status == 'exists' and episode_id != source_id]
+        if taken:
+            print(f"⚠ IDs already in use inside the range: {taken} - new episodes will get other IDs")
+        return True
+    
+    def capture_created_id(self, source_id, allow_listing=True):
+        """Find the ID of the episode the last save created
+        
+        Tries the post-save redirect URL, then ID fields on the resulting page, and finally
+        (if ``allow_listing``) the newest episode on the listing page. Returns None if none
+        of them give an answer.
+        """
+        try:
+            outcome_url = (self.last_save_outcome or {}).get('url')
+            for url in (outcome_url, self.driver.current_url):
+                created_id = episode_id_from_url(url)
+                if created_id and created_id != source_id:
+                    return created_id
+            
+            page_id = self.driver.execute_script(CREATED_ID_SCRIPT)
+            if page_id and str(page_id).isdigit() and int(page_id) != source_id:
+                return int(page_id)
+            
+            if not allow_listing:
+                return None
+            
+            print("🔎 New episode ID not in the redirect - checking the episode listing...")
+            self.driver.get(f"{self.portal_url}/system-admin/content/media/episode")
+            self.wait_for_step('listing', EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/episode/')]")))
+            listed_ids = [episode_id_from_url(href) for href in self.driver.execute_script(EPISODE_LINKS_SCRIPT)]
+            listed_ids = [episode_id for episode_id in listed_ids if episode_id]
+            if listed_ids and max(listed_ids) > source_id:
+                return max(listed_ids)
+        except Exception as e:
+            print(f"⚠ Could not determine the created episode ID: {e}")
+        return None
     
     def close(self):
         """Close the browser"""
+        self.save_session()
+        self.metrics.close()
+        self.locators.save()
         try:
             self.driver.quit()
         except:
             pass
 
+def _run_batch_worker(worker_id, row_positions, settings):
+    """Worker process entry point: one driver, one login, one shard of rows"""
+    log_path = os.path.join(settings['log_dir'], f"worker_{worker_id}.log")
+    log_mode = 'a' if settings['resume'] else 'w'
+    with open(log_path, log_mode, encoding='utf-8', buffering=1) as log_file, contextlib.redirect_stdout(log_file):
+        automation = None
+        try:
+            print(f"👷 Worker {worker_id} handling {len(row_positions)} rows")
+            automation = EpisodeCopyAutomation(
+                username=settings['username'],
+                password=settings['password'],
+                headless=settings['headless'],
+                images_folder=settings['images_folder'],
+                step_budgets=settings['step_budgets'],
+                row_delay=settings['row_delay'],
+                bulk_fill=settings['bulk_fill'],
+                portal_url=settings['portal_url'],
+                metrics_path=os.path.join(settings['log_dir'], f"metrics_{worker_id}.jsonl"),
+                fast_start=settings['fast_start'].for_worker(worker_id) if settings['fast_start'] else None,
+                retry_budgets=settings['retry_budgets'],
+                locator_path=settings['locator_path']
+            )
+            return automation.process_episode_batch(
+                excel_path=settings['excel_path'],
+                template_id=settings['template_id'],
+                row_positions=row_positions,
+                journal_path=os.path.join(settings['log_dir'], f"journal_{worker_id}.jsonl"),
+                resume=settings['resume']
+            )
+        except Exception as e:
+            print(f"❌ Worker {worker_id} error: {str(e)}")
+            return 0
+        finally:
+            if automation:
+                automation.close()
+
+
+def run_parallel_batch(username, password, excel_path, template_id, workers=2, images_folder=".",
+                       headless=True, step_budgets=None, row_delay=0, bulk_fill=True, log_dir="worker_logs",
+                       portal_url=PORTAL_URL, resume=False, fast_start=None, retry_budgets=None,
+                       locator_path=None):
+    """Copy every Excel row from ``template_id`` using ``workers`` independent browsers
+    
+    Rows are dealt round-robin to the workers, each of which runs its own Chrome
+    instance and login in a separate process and writes its output to
+    ``log_dir/worker_<n>.log``, journal ``log_dir/journal_<n>.jsonl`` and timing spans
+    ``log_dir/metrics_<n>.jsonl`` (plus ``.prom``); ``resume=True``
+    continues each worker from its journal (use the same worker count as the interrupted run).
+    Returns the total number of episodes saved.
+    """
+    total_rows = Workbook(excel_path, EPISODE_SCHEMA).validate().row_count
+    workers = max(1, min(workers, total_rows))
+    os.makedirs(log_dir, exist_ok=True)
+    
+    settings = {
+        'username': username,
+        'password': password,
+        'excel_path': excel_path,
+        'template_id': template_id,
+        'images_folder': images_folder,
+        'headless': headless,
+        'step_budgets': step_budgets,
+        'row_delay': row_delay,
+        'bulk_fill': bulk_fill,
+        'log_dir': log_dir,
+        'portal_url': portal_url,
+        'resume': resume,
+        'fast_start': fast_start,
+        'retry_budgets': retry_budgets,
+        'locator_path': locator_path,
+    }
+    shards = [list(range(worker_id, total_rows, workers)) for worker_id in range(workers)]
+    
+    print(f"🚀 Copying {total_rows} rows from template episode {template_id} with {workers} workers")
+    print(f"🗂 Worker logs: {os.path.abspath(log_dir)}")
+    
+    started = time.monotonic()
+    success_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_batch_worker, worker_id, shard, settings): worker_id
+            for worker_id, shard in enumerate(shards)
+        }
+        for future in as_completed(futures):
+            worker_id = futures[future]
+            try:
+                worker_success = future.result()
+            except Exception as e:
+                print(f"❌ Worker {worker_id} crashed: {e}")
+                worker_success = 0
+            success_count += worker_success
+            print(f"👷 Worker {worker_id}: {worker_success}/{len(shards[worker_id])} episodes saved")
+    
+    elapsed = time.monotonic() - started
+    print(f"🎉 PARALLEL BATCH COMPLETED: {success_count}/{total_rows} episodes in {elapsed:.1f}s")
+    return success_count
+
+
+def run_http_batch(automation, excel_path, start_id=665, end_id=None, template_id=None, workers=1, journal_path=None):
+    """Log in with the browser once, then copy the Excel rows over plain HTTP"""
+    # Loading the first source page validates the session and leaves the CSRF token on the page
+    first_source_id = start_id if template_id is None else template_id
+    if not automation.check_if_episode_exists(first_source_id):
+        print(f"❌ Episode {first_source_id} does not exist or is not accessible!")
+        return 0
+    
+    engine = HttpEpisodeEngine.from_browser(
+        automation,
+        workers=max(1, workers),
+        thumbnails=ThumbnailPreparer() if automation.thumbnails else None
+    )
+    automation.save_session()
+    return engine.process_episode_batch(excel_path, start_id=start_id, end_id=end_id, template_id=template_id,
+                                        journal_path=journal_path)
+
+
+def run_tab_batch(automation, excel_path, start_id=665, end_id=None, template_id=None, tabs=4, journal_path=None):
+    """Log in with the browser once, then copy the Excel rows in ``tabs`` concurrent tabs of it"""
+    engine = TabEpisodeEngine(
+        automation,
+        tabs=tabs,
+        thumbnails=ThumbnailPreparer() if automation.thumbnails else None
+    )
+    return engine.process_episode_batch(excel_path, start_id=start_id, end_id=end_id, template_id=template_id,
+                                        journal_path=journal_path)
+
+
 # Main execution function
 def main():
-    # Setup logging
+    parser = argparse.ArgumentParser(description="Copy episodes from an Excel sheet into the CMS")
+    parser.add_argument('mode', nargs='?', choices=['run', 'resume'], default='run',
+                        help="'resume' continues the last interrupted run from its journal")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="check every row and print what the run would do, without starting a browser")
+    args = parser.parse_args()
+    
+    # Setup logging - timing spans go to the log file, the console keeps the progress prints
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
             logging.FileHandler('episode_automation.log'),
-            logging.StreamHandler()
+            console_handler
         ]
     )
     
@@ -719,12 +1288,53 @@ def main():
     PASSWORD = "123456"            # Replace with your password
     EXCEL_PATH = 'episodes.xlsx'
     IMAGES_FOLDER = os.path.expanduser('~/Downloads')
-    START_ID = 665
-    END_ID = 694
+    START_ID = 665     # ID of the first episode (created manually) - later IDs are read back after each save
+    END_ID = None      # Optional: stop once the chain passes this ID
+    STEP_BUDGETS = {}  # Override per-step wait budgets in seconds, e.g. {'save_result': 30}
+    RETRY_BUDGETS = {}  # Override attempts per operation, e.g. {'navigate': 5, 'save': 1}
+    ROW_DELAY = 0      # Optional pause between episodes in seconds
+    TEMPLATE_ID = None  # Copy every row from this episode ID instead of chaining START_ID..END_ID
+    WORKERS = 1         # Parallel browsers to use when TEMPLATE_ID is set
+    BULK_FILL = True    # Fill the whole form in one script call (per-field typing is the fallback)
+    ENGINE = 'browser'  # 'http' logs in with the browser once, then submits copies without it; 'tabs' runs them in parallel tabs
+    TABS = 4            # Concurrent tabs of the one browser for ENGINE = 'tabs' (template mode only)
+    PORTAL = PORTAL_URL  # e.g. 'http://127.0.0.1:8765' to run against stub_portal.py
+    JOURNAL_PATH = 'episode_journal.jsonl'  # Every row's outcome, used by 'python downloader2.py resume'
+    METRICS_PATH = 'episode_metrics.jsonl'  # Timing span per step and episode (totals in episode_metrics.prom)
+    RESUME = args.mode == 'resume'
+    FAST_START = False  # Eager page loads, blocked fonts/analytics, no background networking
+    PROFILE_DIR = 'chrome_profile'  # Reused by every FAST_START run so the browser starts warm
+    LOCATOR_PATH = 'locator_rankings.json'  # Which fallback locator matched last, tried first next time
     
     print(f"🔐 Login credentials: {USERNAME}")
     print(f"🔍 Looking for images in: {IMAGES_FOLDER}")
     
+    if args.dry_run:
+        dry_run_batch(EXCEL_PATH, IMAGES_FOLDER, start_id=START_ID, end_id=END_ID, template_id=TEMPLATE_ID)
+        return
+    
+    fast_start = FastStartProfile(PROFILE_DIR) if FAST_START else None
+    
+    if TEMPLATE_ID is not None and WORKERS > 1:
+        success_count = run_parallel_batch(
+            username=USERNAME,
+            password=PASSWORD,
+            excel_path=EXCEL_PATH,
+            template_id=TEMPLATE_ID,
+            workers=WORKERS,
+            images_folder=IMAGES_FOLDER,
+            step_budgets=STEP_BUDGETS,
+            row_delay=ROW_DELAY,
+            bulk_fill=BULK_FILL,
+            portal_url=PORTAL,
+            resume=RESUME,
+            fast_start=fast_start,
+            retry_budgets=RETRY_BUDGETS,
+            locator_path=LOCATOR_PATH
+        )
+        print(f"\n📊 FINAL RESULT: {success_count} episodes processed successfully")
+        return
+    
     automation = None
     try:
         # Initialize automation with login credentials
@@ -732,14 +1342,52 @@ def main():
             username=USERNAME,
             password=PASSWORD,
             headless=False,  # Keep visible for debugging
-            images_folder=IMAGES_FOLDER
+            images_folder=IMAGES_FOLDER,
+            step_budgets=STEP_BUDGETS,
+            row_delay=ROW_DELAY,
+            bulk_fill=BULK_FILL,
+            portal_url=PORTAL,
+            metrics_path=METRICS_PATH,
+            fast_start=fast_start,
+            retry_budgets=RETRY_BUDGETS,
+            locator_path=LOCATOR_PATH
         )
         
+        # Every engine journals its rows, but a resume always continues in the browser
+        if ENGINE == 'http' and not RESUME:
+            success_count = run_http_batch(
+                automation,
+                excel_path=EXCEL_PATH,
+                start_id=START_ID,
+                end_id=END_ID,
+                template_id=TEMPLATE_ID,
+                workers=WORKERS,
+                journal_path=JOURNAL_PATH
+            )
+            print(f"\n📊 FINAL RESULT: {success_count} episodes processed successfully")
+            return
+        
+        if ENGINE == 'tabs' and not RESUME:
+            success_count = run_tab_batch(
+                automation,
+                excel_path=EXCEL_PATH,
+                start_id=START_ID,
+                end_id=END_ID,
+                template_id=TEMPLATE_ID,
+                tabs=TABS,
+                journal_path=JOURNAL_PATH
+            )
+            print(f"\n📊 FINAL RESULT: {success_count} episodes processed successfully")
+            return
+        
         # Process episodes
         success_count = automation.process_episode_batch(
             excel_path=EXCEL_PATH,
             start_id=START_ID,
-            end_id=END_ID
+            end_id=END_ID,
+            template_id=TEMPLATE_ID,
+            journal_path=JOURNAL_PATH,
+            resume=RESUME
         )
         
         print(f"\n📊 FINAL RESULT: {success_count} episodes processed successfully")
@@ -0,0 +1,144 @@
+import time
+
+
+def copy_outcome(outcome, message, started, url='', **details):
+    """The outcome of copying one row, in the shape every engine returns
+
+    ``outcome`` is success, error, unknown (the save may or may not have happened) or
+    missing (the source episode cannot be loaded). ``details`` adds e.g. ``created_id``,
+    ``upload`` or the step ``timings``.
+    """
+    return dict({
+        'outcome': outcome,
+        'message': message,
+        'elapsed_ms': round((time.monotonic() - started) * 1000),
+        'url': url,
+        'created_id': None,
+    }, **details)
+
+
+def save_retry_delay(retry, attempt, source_id, outcome, tab=None):
+    """Backoff before copying a row again after attempt ``attempt``, or None to keep ``outcome``
+
+    Only an explicit error from the portal is retried - after an unclear outcome the
+    episode may already exist and another copy could create a duplicate.
+    """
+    attempts = retry.attempts_for('save')
+    if outcome['outcome'] != 'error' or attempt >= attempts:
+        return None
+    delay = retry.delay(attempt)
+    retry.retries['save'] = retry.retries.get('save', 0) + 1
+    where = f" in tab {tab}" if tab else ""
+    print(f"🔁 Copy of {source_id}{where} failed ({outcome['message']}) - attempt {attempt + 1}/{attempts} "
+          f"in {delay:.1f}s")
+    return delay
+
+
+class EpisodeBatch:
+    """Which episode each row of a batch copies, and how every row's outcome is reported
+
+    Shared by the browser, HTTP and tab engines. ``rows()`` yields each payload that can
+    be submitted with its source episode: ``template_id`` when given, otherwise the
+    episode the previous save created, starting from ``start_id`` and stopping once IDs
+    pass ``end_id`` or a source episode cannot be loaded. Skipped rows and every
+    ``finish()``ed row are printed, recorded in ``metrics`` and appended to ``journal``;
+    a row whose save is unclear is journaled as ``unknown`` and ends a chain, as does a
+    save whose new episode ID could not be read.
+    """
+
+    def __init__(self, start_id, end_id=None, template_id=None, metrics=None, journal=None):
+        self.current_id = start_id
+        self.end_id = end_id
+        self.template_id = template_id
+        self.metrics = metrics
+        self.journal = journal
+        self.success_count = 0
+        self.stopped = False
+
+    @property
+    def chained(self):
+        return self.template_id is None
+
+    def rows(self, payloads):
+        """Yield (payload, source_id) for every row to copy, skipping the invalid ones
+
+        Several workers may share one generator in template mode; when chaining, each
+        row has to be finished before the next is taken.
+        """
+        for payload in payloads:
+            source_id = self.source_for(payload)
+            if self.stopped:
+                return
+            if source_id is not None:
+                yield payload, source_id
+
+    def source_for(self, payload):
+        """The episode to copy ``payload`` from, None if it is skipped or the batch is over (``stopped``)"""
+        if self.stopped:
+            return None
+        if self.chained and self.end_id is not None and self.current_id > self.end_id:
+            print("🎯 Reached maximum episode ID")
+            self.stopped = True
+            return None
+        if not payload.ready:
+            self.skip(payload)
+            return None
+        return self.current_id if self.chained else self.template_id
+
+    def skip(self, payload):
+        message = '; '.join(payload.errors)
+        print(f"⏭ Skipping row {payload.row_index + 1} - {message}")
+        if self.metrics:
+            self.metrics.end_episode('skipped')
+        if self.journal:
+            self.journal.record(payload.row_index + 1, None, None, 'skipped', message=message)
+
+    def finish(self, payload, source_id, outcome, tab=None):
+        """Report one copied row and move the chain on, returns True if it was saved"""
+        excel_row = payload.row_index + 1
+        saved = outcome['outcome'] == 'success'
+        created_id = outcome.get('created_id')
+        where = f" in tab {tab}" if tab else ""
+        message = outcome['message']
+        if saved:
+            self.success_count += 1
+            message = ''
+            created = f" -> {created_id}" if created_id else ""
+            print(f"✅ Row {excel_row}{where}: copied episode {source_id}{created} ({outcome['elapsed_ms']} ms)")
+            if self.chained and created_id:
+                # The next row copies the episode this save created
+                self.current_id = created_id
+            elif self.chained:
+                # Guessing (e.g. source_id + 1) could copy a deleted or unrelated episode
+                message = "created ID not found - chain stopped"
+                print(f"⚠ Could not read the ID of the episode row {excel_row} created - stopping the chain")
+                print("💡 Look that episode up in the portal, set START_ID to its ID and resume")
+                self.stopped = True
+        elif outcome['outcome'] in ('error', 'missing'):
+            print(f"❌ Row {excel_row}{where}: copy of episode {source_id} failed - {outcome['message']}")
+            if self.chained and outcome['outcome'] == 'missing':
+                print(f"💡 Cannot continue the chain because episode {source_id} is not accessible!")
+                self.stopped = True
+            elif self.chained:
+                print(f"💡 Nothing was created - the next row copies episode {source_id} again")
+        else:
+            print(f"❓ Row {excel_row}{where}: copy of episode {source_id} may or may not have been saved - "
+                  f"{outcome['message']}")
+            print(f"💡 Check the portal for row {excel_row}'s episode - it is not copied again")
+            if self.chained:
+                # The next source is whatever this save created, if anything
+                print("💡 Cannot continue the chain without the new episode's ID")
+                self.stopped = True
+
+        result = 'saved' if saved else 'failed' if outcome['outcome'] in ('error', 'missing') else 'unknown'
+        if self.metrics:
+            # The browser flow times its own episode span; tabs and HTTP rows overlap, so they pass their time
+            if self.metrics.episode:
+                self.metrics.end_episode(result)
+            else:
+                self.metrics.record_episode(outcome['elapsed_ms'] / 1000, result, excel_row=excel_row,
+                                            source_id=source_id, **({'tab': tab} if tab else {}))
+        if self.journal:
+            self.journal.record(excel_row, source_id, created_id if saved else None, result,
+                                outcome.get('timings'), message)
+        return saved
@@ -0,0 +1,141 @@
+import queue
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+# Excel column -> form input name, in the order the fields are filled
+FORM_FIELDS = {
+    'Title': 'title',
+    'EpisodeNumber': 'episode_number',
+    'ContentUrl': 'content_url',
+    'Subtitle': 'subtitle',
+    'Duration': 'duration',
+    'ReleaseDate': 'release_date',
+}
+REQUIRED_COLUMNS = ['EpisodeNumber', 'Title', 'ContentUrl']
+
+# Episode ID in portal URLs such as .../episode/edit/667, .../episode/667/edit or .../episode/667
+EPISODE_ID_PATTERN = re.compile(r'/episode/(?:edit/|show/)?(\d+)(?:/edit)?/?(?:[?#]|$)')
+
+
+def episode_id_from_url(url):
+    """Episode ID an edit/show URL points at, or None (copy URLs never match)"""
+    match = EPISODE_ID_PATTERN.search(url or '')
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class EpisodePayload:
+    """Everything the browser needs to submit one Excel row, prepared ahead of time"""
+    row_index: int
+    episode_number: object
+    title: str = ''
+    fields: dict = field(default_factory=dict)
+    image_path: str = None
+    errors: list = field(default_factory=list)
+
+    @property
+    def ready(self):
+        return not self.errors
+
+
+def normalize_value(value):
+    """Cell value as the text typed into the form, or None for an empty cell"""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    # Dates arrive as pandas Timestamps or plain datetimes depending on the reader
+    if isinstance(value, datetime) and value.time() == datetime.min.time():
+        return value.strftime('%Y-%m-%d')
+    text = str(value).strip()
+    return text or None
+
+
+def build_episode_payload(row_index, row, image_index, problems=()):
+    """Validate and normalize one Excel row and resolve its thumbnail
+
+    ``problems`` are the row's invalid cells as listed by ``Workbook.records()``;
+    a row with any is not submitted and keeps them as its ``errors``.
+    """
+    payload = EpisodePayload(row_index=row_index, episode_number=row.get('EpisodeNumber'), errors=list(problems))
+    if payload.errors:
+        return payload
+
+    try:
+        payload.episode_number = int(payload.episode_number)
+    except (ValueError, TypeError):
+        payload.errors.append(f"invalid episode number: {payload.episode_number}")
+
+    for excel_col in FORM_FIELDS:
+        value = normalize_value(row.get(excel_col))
+        if value is not None:
+            payload.fields[excel_col] = value
+        elif excel_col in REQUIRED_COLUMNS and excel_col != 'EpisodeNumber':
+            payload.errors.append(f"missing {excel_col}")
+    payload.title = payload.fields.get('Title', '')
+
+    if payload.ready:
+        payload.image_path = image_index.lookup(payload.episode_number)
+    return payload
+
+
+class PayloadPrefetcher:
+    """Builds episode payloads on a background thread so the driver loop only consumes them
+
+    ``rows`` yields (row_index, record, problems) like ``Workbook.records()``.
+    """
+
+    _DONE = object()
+
+    def __init__(self, rows, image_index, lookahead=3):
+        self.rows = rows
+        self.image_index = image_index
+        self._queue = queue.Queue(maxsize=lookahead)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _produce(self):
+        try:
+            for row_index, row, problems in self.rows:
+                if not self._put(build_episode_payload(row_index, row, self.image_index, problems)):
+                    return
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(self._DONE)
+
+    def _put(self, item):
+        # Give up once the consumer has stopped so the thread never blocks forever
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        self._thread = threading.Thread(target=self._produce, name="payload-prefetch", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        self._stopped.set()
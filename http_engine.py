@@ -0,0 +1,368 @@
+import itertools
+import mimetypes
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from episode_batch import EpisodeBatch, copy_outcome, save_retry_delay
+from episode_payload import FORM_FIELDS, PayloadPrefetcher, episode_id_from_url
+from image_index import ImageIndex
+from retry_policy import RetryPolicy
+from run_journal import RunJournal
+from workbook import EPISODE_SCHEMA, Workbook
+
+UPLOAD_PATH = '/system-admin/content/media/upload'
+SAVE_ERROR_MARKERS = ['Failed to save episode information!', 'alert-danger']
+
+# What one row's requests can fail with without the whole batch having to stop
+ROW_ERRORS = (requests.RequestException, OSError, ValueError)
+
+# Reads the CSRF token the page's own scripts send with requests
+CSRF_TOKEN_SCRIPT = """
+var meta = document.querySelector('meta[name="csrf-token"]');
+if (meta) return meta.getAttribute('content');
+var input = document.querySelector('input[name="_token"]');
+return input ? input.value : null;
+"""
+
+
+class SessionRejected(Exception):
+    """The portal redirected to login - the harvested browser session is no longer valid"""
+
+
+class FormParser(HTMLParser):
+    """Collects the first form on a page together with the default values of its fields"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.action = ''
+        self.fields = {}
+        self.file_fields = []
+        self.csrf_token = None
+        self._in_form = False
+        self._done = False
+        self._textarea = None
+        self._select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta' and attrs.get('name') == 'csrf-token':
+            self.csrf_token = attrs.get('content')
+        if self._done:
+            return
+        if tag == 'form' and not self._in_form:
+            self._in_form = True
+            self.action = attrs.get('action') or ''
+            return
+        if not self._in_form:
+            return
+
+        name = attrs.get('name')
+        if tag == 'input' and name:
+            input_type = (attrs.get('type') or 'text').lower()
+            if input_type == 'file':
+                self.file_fields.append(name)
+            elif input_type in ('checkbox', 'radio'):
+                if 'checked' in attrs:
+                    self.fields[name] = attrs.get('value') or 'on'
+            elif input_type not in ('submit', 'button', 'image', 'reset'):
+                self.fields[name] = attrs.get('value') or ''
+        elif tag == 'textarea' and name:
+            self._textarea = name
+            self.fields[name] = ''
+        elif tag == 'select' and name:
+            self._select = name
+        elif tag == 'option' and self._select:
+            if 'selected' in attrs or self._select not in self.fields:
+                self.fields[self._select] = attrs.get('value') or ''
+
+    def handle_data(self, data):
+        if self._textarea:
+            self.fields[self._textarea] += data
+
+    def handle_endtag(self, tag):
+        if tag == 'textarea':
+            self._textarea = None
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'form' and self._in_form:
+            self._in_form = False
+            self._done = True
+
+
+class HttpEpisodeEngine:
+    """Copies episodes with plain HTTP requests using a session harvested from a logged-in browser"""
+
+    def __init__(self, portal_url, images_folder=".", workers=4, timeout=30, upload_path=UPLOAD_PATH,
+                 thumbnail_field='thumbnail_url', thumbnails=None, retry=None, metrics=None):
+        self.portal_url = portal_url.rstrip('/')
+        self.workers = workers
+        self.timeout = timeout
+        self.upload_path = upload_path
+        self.thumbnail_field = thumbnail_field
+        self.thumbnails = thumbnails
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics
+        self.images_folder = os.path.abspath(images_folder)
+        self.image_index = ImageIndex(self.images_folder)
+
+        # One pooled connection per worker so concurrent copies reuse TCP/TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.csrf_token = None
+
+    @classmethod
+    def from_browser(cls, automation, **kwargs):
+        """Build an engine from a logged-in EpisodeCopyAutomation's cookies and CSRF token
+
+        The engine shares the automation's retry policy and run metrics.
+        """
+        kwargs.setdefault('retry', automation.retry)
+        kwargs.setdefault('metrics', automation.metrics)
+        engine = cls(automation.portal_url, images_folder=automation.images_folder, **kwargs)
+        engine.load_browser_session(automation.driver)
+        return engine
+
+    def load_browser_session(self, driver):
+        """Copy cookies, user agent and CSRF token from the driver's current page"""
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        self.session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent")
+        self.csrf_token = driver.execute_script(CSRF_TOKEN_SCRIPT)
+        print(f"🍪 Harvested {len(self.session.cookies)} cookies from the browser session")
+
+    def copy_url(self, episode_id):
+        return f"{self.portal_url}/system-admin/content/media/episode/copy/{episode_id}"
+
+    def _check_login_redirect(self, response):
+        if response.is_redirect and 'login' in response.headers.get('Location', ''):
+            raise SessionRejected(f"Redirected to login from {response.url}")
+
+    def _token_headers(self, token):
+        token = token or self.csrf_token
+        return {'X-CSRF-TOKEN': token} if token else {}
+
+    def upload_thumbnail(self, image_path, token=None):
+        """Upload an image through the portal's upload endpoint
+
+        Returns a dict with the stored ``url``, ``bytes``, ``status`` and ``elapsed_ms``.
+        """
+        started = time.monotonic()
+        mime_type = mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
+        with open(image_path, 'rb') as image_file:
+            response = self.session.post(
+                f"{self.portal_url}{self.upload_path}",
+                files={'file': (os.path.basename(image_path), image_file, mime_type)},
+                data={'_token': token or self.csrf_token or ''},
+                headers=self._token_headers(token),
+                allow_redirects=False,
+                timeout=self.timeout,
+            )
+        self._check_login_redirect(response)
+        response.raise_for_status()
+        result = response.json()
+        return {
+            'url': result.get('url') or result.get('path'),
+            'bytes': os.path.getsize(image_path),
+            'status': response.status_code,
+            'elapsed_ms': round((time.monotonic() - started) * 1000),
+        }
+
+    def copy_episode(self, source_id, payload):
+        """Submit one copy of ``source_id`` with the payload's fields and thumbnail
+
+        Returns a ``copy_outcome`` dict with the ``upload`` and the ``created_id`` (read
+        from the post-save redirect, None if it has no ID).
+        """
+        started = time.monotonic()
+        page = self.session.get(self.copy_url(source_id), allow_redirects=False, timeout=self.timeout)
+        self._check_login_redirect(page)
+        if page.status_code == 404:
+            return copy_outcome('missing', f"Episode {source_id} not found", started)
+        page.raise_for_status()
+
+        form = FormParser()
+        form.feed(page.text)
+        fields = dict(form.fields)
+        for excel_col, value in payload.fields.items():
+            fields[FORM_FIELDS[excel_col]] = value
+        token = fields.get('_token') or form.csrf_token
+
+        files = None
+        upload = None
+        image_path = payload.image_path
+        if image_path and self.thumbnails:
+            image_path = self.thumbnails.prepared_path(image_path)
+        try:
+            if image_path and form.file_fields:
+                mime_type = mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
+                with open(image_path, 'rb') as image_file:
+                    files = {form.file_fields[0]: (os.path.basename(image_path), image_file.read(), mime_type)}
+            elif image_path:
+                upload = self.upload_thumbnail(image_path, token)
+                fields[self.thumbnail_field] = upload['url']
+        except ROW_ERRORS as e:
+            # Like the browser flow, save the episode without its thumbnail
+            print(f"⚠ Image upload failed for episode {payload.episode_number} ({e}), but continuing...")
+
+        try:
+            response = self.session.post(
+                urljoin(page.url, form.action), data=fields, files=files, headers=self._token_headers(token),
+                allow_redirects=False, timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            # The portal may have saved the copy before the response was lost - never retry this
+            return copy_outcome('unknown', f"No answer to the save ({type(e).__name__}: {e})", started,
+                                upload=upload)
+        self._check_login_redirect(response)
+        outcome = self.classify_save(response, started)
+        outcome['upload'] = upload
+        created_id = episode_id_from_url(outcome['url']) if outcome['outcome'] == 'success' else None
+        outcome['created_id'] = created_id if created_id != source_id else None
+        return outcome
+
+    def copy_row(self, source_id, payload):
+        """``copy_episode`` with any HTTP, network or file error turned into an ``error`` outcome
+
+        A lost save response is already an ``unknown`` outcome. Only a rejected session
+        (SessionRejected) ends the batch, since every later row would be rejected too.
+        """
+        started = time.monotonic()
+        try:
+            return self.copy_episode(source_id, payload)
+        except ROW_ERRORS as e:
+            return copy_outcome('error', f"{type(e).__name__}: {e}", started)
+
+    def copy_with_retry(self, source_id, payload):
+        """``copy_row``, starting over on a fresh copy page while the portal rejects the save"""
+        for attempt in itertools.count(1):
+            outcome = self.copy_row(source_id, payload)
+            delay = save_retry_delay(self.retry, attempt, source_id, outcome)
+            if delay is None:
+                return outcome
+            self.retry.sleep(delay)
+
+    def classify_save(self, response, started):
+        """Turn the save response into an outcome dict"""
+        if response.is_redirect:
+            location = urljoin(response.url, response.headers.get('Location', ''))
+            if 'copy' in location:
+                return copy_outcome('error', "Redirected back to the copy page", started, location)
+            return copy_outcome('success', "Redirected after save", started, location)
+        if response.status_code >= 400:
+            return copy_outcome('error', f"HTTP {response.status_code}", started, response.url)
+        for marker in SAVE_ERROR_MARKERS:
+            if marker in response.text:
+                return copy_outcome('error', marker, started, response.url)
+        return copy_outcome('success', f"HTTP {response.status_code}", started, response.url)
+
+    def classify_episode(self, episode_id):
+        """Return ``exists``, ``missing``, ``forbidden`` or ``error`` for one episode ID"""
+        try:
+            response = self.session.get(self.copy_url(episode_id), allow_redirects=False, timeout=self.timeout)
+        except requests.RequestException:
+            return 'error'
+        if response.is_redirect or response.status_code in (401, 403):
+            return 'forbidden'
+        if response.status_code == 404:
+            return 'missing'
+        if not response.ok:
+            return 'error'
+        form = FormParser()
+        form.feed(response.text)
+        return 'exists' if 'title' in form.fields else 'missing'
+
+    def preflight(self, episode_ids):
+        """Classify many episode IDs concurrently over the pooled session"""
+        episode_ids = list(episode_ids)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return dict(zip(episode_ids, pool.map(self.classify_episode, episode_ids)))
+
+    def process_episode_batch(self, excel_path, start_id=665, end_id=None, template_id=None, journal_path=None):
+        """Process the same Excel rows as EpisodeCopyAutomation.process_episode_batch over HTTP
+
+        Chained copies run in order; in template mode rows are submitted concurrently
+        on ``workers`` pooled connections. With ``journal_path`` every row's outcome is
+        journaled like the browser flow does, so ``resume`` can pick the run up.
+        """
+        workbook = Workbook(excel_path, EPISODE_SCHEMA)
+        report = workbook.validate(collect=('EpisodeNumber',))
+        if report.missing_columns:
+            raise ValueError(f"Missing required columns: {report.missing_columns}")
+        if report.errors:
+            report.print_summary()
+
+        # Fail in seconds on a bad range instead of halfway through the batch
+        source_id = start_id if template_id is None else template_id
+        last_id = end_id if template_id is None and end_id else source_id
+        statuses = self.preflight(range(source_id, last_id + 1))
+        if statuses[source_id] != 'exists':
+            print(f"❌ Episode {source_id} is {statuses[source_id]} - cannot start!")
+            return 0
+        print(f"🔍 Preflight: {sum(status == 'exists' for status in statuses.values())}/{len(statuses)} IDs exist")
+
+        if self.thumbnails:
+            self.thumbnails.start(
+                path for path in (self.image_index.lookup(n) for _, n in report.collected['EpisodeNumber']) if path
+            )
+        # Streamed and prepared on a background thread, a few rows ahead of the requests
+        payloads = PayloadPrefetcher(workbook.records(), self.image_index)
+
+        journal = RunJournal(journal_path) if journal_path else None
+        if journal:
+            journal.start(excel_path=excel_path, start_id=start_id, end_id=end_id, template_id=template_id,
+                          row_positions=None)
+        batch = EpisodeBatch(start_id, end_id, template_id, self.metrics, journal)
+        started = time.monotonic()
+        try:
+            if template_id is None:
+                for payload, source_id in batch.rows(payloads):
+                    batch.finish(payload, source_id, self.copy_with_retry(source_id, payload))
+            else:
+                self._run_from_template(batch, payloads)
+        except SessionRejected as e:
+            print(f"❌ Browser session rejected by the portal - log in again: {e}")
+        finally:
+            if self.thumbnails:
+                self.thumbnails.close()
+            if journal:
+                journal.close()
+
+        elapsed = time.monotonic() - started
+        print(f"🎉 HTTP BATCH COMPLETED: {batch.success_count}/{report.row_count} episodes in {elapsed:.1f}s")
+        return batch.success_count
+
+    def _run_from_template(self, batch, payloads):
+        running = {}
+        failures = []
+
+        def collect(futures):
+            for future in futures:
+                payload, source_id = running.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    # e.g. SessionRejected: take no new rows, but still finish the ones in flight - they may save
+                    batch.stopped = True
+                    failures.append(e)
+                    continue
+                batch.finish(payload, source_id, outcome)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for payload, source_id in batch.rows(payloads):
+                # Keep only a couple of rows per connection in flight instead of reading the whole sheet
+                if len(running) >= 2 * self.workers:
+                    collect(wait(running, return_when=FIRST_COMPLETED).done)
+                running[pool.submit(self.copy_with_retry, source_id, payload)] = (payload, source_id)
+            collect(wait(running).done)
+        if failures:
+            raise failures[0]
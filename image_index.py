@@ -0,0 +1,72 @@
+import os
+import re
+
+# Extension order doubles as precedence, matching the old glob pattern order
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# "0 (12).jpg", "episode (12).png" - the number in brackets right before the extension
+BRACKETED_NUMBER = re.compile(r'\((\d+)\)$')
+NUMBER = re.compile(r'\d+')
+
+# Lower rank wins: a bracketed number beats a number found anywhere else in the name
+BRACKETED_RANK = 0
+ANYWHERE_RANK = 1
+
+
+class ImageIndex:
+    """Maps episode numbers to image files, scanning the folder once and again only when it changes"""
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.scans = 0
+        self._mtime = None
+        self._index = {}
+
+    def refresh(self):
+        """Rescan the folder if its modification time changed since the last scan"""
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            self._mtime = None
+            self._index = {}
+            return
+
+        if mtime == self._mtime:
+            return
+
+        index = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext not in IMAGE_EXTENSIONS or not entry.is_file():
+                    continue
+                ext_rank = IMAGE_EXTENSIONS.index(ext)
+
+                candidates = []
+                bracketed = BRACKETED_NUMBER.search(stem)
+                if bracketed:
+                    candidates.append((int(bracketed.group(1)), BRACKETED_RANK))
+                # Whole digit runs only, so episode 1 never matches "0 (11).jpg"
+                for number in {int(digits) for digits in NUMBER.findall(stem)}:
+                    candidates.append((number, ANYWHERE_RANK))
+
+                for number, rank in candidates:
+                    key = (rank, ext_rank, entry.name)
+                    current = index.get(number)
+                    if current is None or key < current[0]:
+                        index[number] = (key, entry.path)
+
+        self._index = index
+        self._mtime = mtime
+        self.scans += 1
+
+    def lookup(self, episode_number):
+        """Return the image path for the episode number, or None"""
+        self.refresh()
+        entry = self._index.get(int(episode_number))
+        return entry[1] if entry else None
+
+    def __len__(self):
+        self.refresh()
+        return len(self._index)
@@ -0,0 +1,109 @@
+import json
+import os
+
+from atomic_file import atomic_write
+
+
+def locator_key(locator):
+    by, selector = locator
+    return f"{by}={selector}"
+
+
+class LocatorResolver:
+    """Finds elements through fallback locator lists, trying the alternative that matched last time first
+
+    Every logical element (``name``) keeps a win count per locator and the last
+    locator that matched. Lookups try the last winner first, then the others by
+    wins and finally in their listed order, so a page that only matches a late
+    fallback costs one round trip instead of one per miss. With ``path`` the
+    rankings are saved as JSON and reused by later runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.rankings = {}
+        self.stats = {}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as rankings_file:
+                self.rankings = json.load(rankings_file)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable locator rankings {self.path}: {e}")
+            self.rankings = {}
+
+    def save(self):
+        """Write the rankings, returns False if they could not be written"""
+        if not self.path or not self.stats:
+            return False
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with atomic_write(self.path) as rankings_file:
+                json.dump(self.rankings, rankings_file, indent=2)
+            return True
+        except OSError as e:
+            print(f"⚠ Could not save locator rankings: {e}")
+            return False
+
+    def order(self, name, locators):
+        """The locators of ``name`` in the order they should be tried"""
+        ranking = self.rankings.get(name, {})
+        wins = ranking.get('wins', {})
+        last = ranking.get('last')
+        indexed = list(enumerate(locators))
+        indexed.sort(key=lambda item: (locator_key(item[1]) != last, -wins.get(locator_key(item[1]), 0), item[0]))
+        return [locator for _, locator in indexed]
+
+    def record(self, name, tried, locator=None):
+        """Count one lookup of ``name`` that tried ``tried`` locators and matched ``locator`` (None: no match)"""
+        stats = self.stats.setdefault(name, {'lookups': 0, 'first_try': 0, 'misses': 0, 'not_found': 0})
+        stats['lookups'] += 1
+        if locator is None:
+            stats['not_found'] += 1
+            stats['misses'] += tried
+            return
+        stats['misses'] += tried - 1
+        if tried == 1:
+            stats['first_try'] += 1
+        ranking = self.rankings.setdefault(name, {'wins': {}, 'last': None})
+        key = locator_key(locator)
+        ranking['wins'][key] = ranking['wins'].get(key, 0) + 1
+        ranking['last'] = key
+
+    def find(self, driver, name, locators, displayed=False):
+        """First element matched by the ranked ``locators`` (visible only, with ``displayed``), or None"""
+        tried = 0
+        for locator in self.order(name, locators):
+            tried += 1
+            try:
+                elements = driver.find_elements(*locator)
+            except Exception:
+                continue
+            for element in elements:
+                try:
+                    if not displayed or element.is_displayed():
+                        self.record(name, tried, locator)
+                        return element
+                except Exception:
+                    continue
+        self.record(name, tried)
+        return None
+
+    def hit_rate(self, name):
+        """Share of this run's lookups of ``name`` answered by the first locator tried"""
+        stats = self.stats.get(name)
+        return stats['first_try'] / stats['lookups'] if stats and stats['lookups'] else 0.0
+
+    def print_summary(self):
+        """Print the first-try hit rate and the winning locator of every element looked up this run"""
+        if not self.stats:
+            return
+        print("🎯 Locator hit rates (first try / lookups, misses, winner):")
+        for name, stats in self.stats.items():
+            last = self.rankings.get(name, {}).get('last') or 'no match'
+            print(f"   {name:<20} {self.hit_rate(name):5.0%} of {stats['lookups']:>4}, {stats['misses']:>4} missed"
+                  + (f", {stats['not_found']} not found" if stats['not_found'] else "") + f" - {last}")
@@ -1,7 +1,5 @@
 import configparser
-import pandas as pd
 import time
-import os.path
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
@@ -9,10 +7,88 @@ from fake_useragent import UserAgent
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 import keyring
-import pickle
 import re
 import undetected_chromedriver as uc
-import random
+from session_store import SessionStore
+from workbook import ORDER_SCHEMA, Workbook
+from browser_profile import FastStartProfile, DEFAULT_BLOCKED_URLS, IMAGE_URL_PATTERNS
+from pacing import Pacer
+from order_plan import orders_to_submit, plan_orders, print_order_plan
+from ticker_cache import TickerCache
+
+SIMULATOR_URL = 'https://www.investopedia.com/simulator/'
+SESSION_HOST = 'www.investopedia.com'
+
+#waits for the open listbox (the last visible one matching arguments[0]), reads all of its options
+#(id, text and index) and clicks the one for arguments[1] - the remembered option arguments[2] is picked as
+#soon as it renders, the full scan only runs if it has not shown up arguments[4] ms after the first options
+SELECT_OPTION_SCRIPT = r"""
+var selector = arguments[0], value = arguments[1], hint = arguments[2], budgetMs = arguments[3];
+var hintMs = typeof arguments[4] === 'number' ? arguments[4] : 0;
+var done = arguments[arguments.length - 1];
+var started = Date.now(), rendered = null;
+var word = new RegExp('(^|\\W)' + value.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '(\\W|$)');
+
+function openListbox() {
+    var lists = document.querySelectorAll(selector), open = null;
+    for (var i = 0; i < lists.length; i++) {
+        if (lists[i].offsetParent !== null || lists[i].getClientRects().length) open = lists[i];
+    }
+    return open || lists[lists.length - 1];
+}
+
+function readOptions(list) {
+    return Array.prototype.map.call(list.querySelectorAll('[id]'), function (element, index) {
+        return {id: element.id, text: (element.textContent || '').trim(), index: index, element: element};
+    });
+}
+
+function findHint(options) {
+    if (!hint) return null;
+    if (options[hint.index] && options[hint.index].text === hint.text) return options[hint.index];
+    for (var i = 0; i < options.length; i++) {
+        if (options[i].text === hint.text) return options[i];
+    }
+    return null;
+}
+
+function scan(options) {
+    var tests = [
+        function (option) { return option.text === value; },
+        function (option) { return word.test(option.text); },
+        function (option) { return option.text.indexOf(value) !== -1; }
+    ];
+    for (var t = 0; t < tests.length; t++) {
+        for (var i = 0; i < options.length; i++) {
+            if (tests[t](options[i])) return options[i];
+        }
+    }
+    return null;
+}
+
+function plain(option) {
+    return option && {id: option.id, text: option.text, index: option.index};
+}
+
+(function poll() {
+    var list = openListbox();
+    var options = list ? readOptions(list) : [];
+    if (!options.length) {
+        if (Date.now() - started > budgetMs) return done({selected: null, options: [], cached: false});
+        return setTimeout(poll, 50);
+    }
+    rendered = rendered || Date.now();
+    var choice = findHint(options);
+    var cached = choice !== null;
+    if (!choice && hint && Date.now() - rendered < hintMs) return setTimeout(poll, 50);
+    choice = choice || scan(options);
+    if (choice) {
+        choice.element.scrollIntoView({block: 'nearest'});
+        choice.element.click();
+    }
+    done({selected: plain(choice), options: options.map(plain), cached: cached});
+})();
+"""
 
 def main():
     idRegex = r'id="(.*?)"'
@@ -21,105 +97,184 @@ def main():
     config = configparser.ConfigParser()
     config.read('settings.ini')
 
+    #validate every order up front before opening the browser
+    orders = Workbook(r'orders.xlsx', ORDER_SCHEMA, sheet_name='Sheet1')
+    frame, report = orders.load()
+    if not report.ok:
+        report.print_summary()
+        return
+
+    #combine and net the orders into the smallest equivalent set (see the [orders] section of settings.ini)
+    plan = plan_orders(frame, config.getboolean('orders', 'netting', fallback=True))
+    print_order_plan(plan, report.row_count)
+    if not orders_to_submit(plan):
+        return
+
+    #one pacing scheduler for every click and keystroke (see the [pacing] section of settings.ini)
+    pacer = pacerFromConfig(config)
+
     #setup the chrome webdriver
-    driver = setupDriver()
-    driver.get('https://www.investopedia.com/simulator/')
+    driver = setupDriver(config)
+    driver.get(SIMULATOR_URL)
 
-    #load previously saved cookies
-    if (os.path.isfile('cookies.pkl')):
-        cookies = pickle.load(open("cookies.pkl", "rb"))
-        for cookie in cookies:
-            driver.add_cookie(cookie)
+    #load the previously saved session (cookies + localStorage) and reload so it takes effect
+    sessionStore = SessionStore()
+    account = keyring.get_password("investopedia", 'userLogin')
+    restored = sessionStore.restore(driver, SESSION_HOST, account)
+    if restored:
+        driver.get(SIMULATOR_URL)
 
-    #login to the website
-    login(driver, config)
+    #only login to the website if there was no saved session or it was rejected
+    if not restored or sessionRejected(driver, config):
+        sessionStore.discard(SESSION_HOST, account)
+        login(driver, config, pacer)
 
-    #click the trade button on website and halt
+    #click the trade button on website and pace
     waitToLoad(driver, By.XPATH, config.get('tradePath', 'tradeB'))
     driver.find_element(By.XPATH, config.get('tradePath', 'tradeB')).click()
-    haltStep()
+    pacer.step()
+
+    #positions of the options of the static dropdowns (Action, Order Type, Duration), kept across rows
+    optionCache = {}
 
-    #read the excel file as a dataframe
-    df = pd.read_excel(r'orders.xlsx', sheet_name='Sheet1')
+    #typeahead option each stock symbol resolved to, kept across runs
+    tickerCache = TickerCache(config.get('orders', 'tickerCache', fallback='') or None)
+
+    #for every planned order we will fill it out on the website
+    for index, row in enumerate(orders_to_submit(plan)):
+        pacer.begin_order()
 
-    #for ever row in the orders.xlsx file we will fill it out on the website
-    for index, row in df.iterrows():
         #enter stock ticker into search bar
         waitToLoad(driver, By.CLASS_NAME, config.get('tradePath', 'dropDown'))
         dropdownSelect = driver.find_elements(By.CLASS_NAME, config.get('tradePath', 'dropDown'))
 
-        #enter the selected stock from the file into the search box and halt
+        #enter the selected stock from the file into the search box and pace
         stockInput = getIDs(driver, config, idRegex, False, element=dropdownSelect[0])
         waitToLoad(driver, By.ID, stockInput[0])
         driver.find_element(By.ID, stockInput[0]).send_keys(row.get('Stock'))
-        haltStep()
+        pacer.step()
 
-        #click the corresponding stock in the drop-down menu and halt
-        tickerIDs = getIDs(driver, config, idRegex, True, pathHeading='tradePath', pathItem='dropDownList')
-        enterDropDownVal(driver, tickerIDs, row.get('Stock'))
-        haltStep()
+        #click the corresponding stock in the drop-down menu (the cached option if the symbol was seen before) and pace
+        selectTicker(driver, config.get('tradePath', 'dropDownList'), row.get('Stock'), tickerCache)
+        pacer.step()
 
-        #click the action dropdown and fill it out and then halt
-        searchAndClickDropDown(driver, config, idRegex, 'tradePath', dropdownSelect[1], 'dropDownList', row.get('Action'))
-        haltStep()
+        #click the action dropdown and fill it out and then pace
+        searchAndClickDropDown(driver, config, 'tradePath', dropdownSelect[1], 'dropDownList', row.get('Action'),
+                               optionCache, 'Action')
+        pacer.step()
 
-        #fill in the quantity and halt
+        #fill in the quantity and pace
         quantityInput = getIDs(driver, config, idRegex, True, pathHeading='tradePath', pathItem='quantity')
         waitToLoad(driver, By.ID, quantityInput[0])
         driver.find_element(By.ID, quantityInput[0]).send_keys(row.get('Quantity'))
-        haltStep()
+        pacer.step()
 
-        #fill in the order type and halt
-        searchAndClickDropDown(driver, config, idRegex, 'tradePath', dropdownSelect[2], 'dropDownList', row.get('Order Type'))
-        haltStep()
+        #fill in the order type and pace
+        searchAndClickDropDown(driver, config, 'tradePath', dropdownSelect[2], 'dropDownList', row.get('Order Type'),
+                               optionCache, 'Order Type')
+        pacer.step()
 
-        #fill in the duration and halt
-        searchAndClickDropDown(driver, config, idRegex, 'tradePath', dropdownSelect[3], 'dropDownList', row.get('Duration'))
-        haltStep()
+        #fill in the duration and pace
+        searchAndClickDropDown(driver, config, 'tradePath', dropdownSelect[3], 'dropDownList', row.get('Duration'),
+                               optionCache, 'Duration')
+        pacer.step()
 
-        #click the preview order button and halt
+        #click the preview order button and pace
         waitToLoad(driver, By.CLASS_NAME, config.get('tradePath', 'previewOrderB'))
         driver.find_element(By.CLASS_NAME, config.get('tradePath', 'previewOrderB')).click()
-        haltStep()
+        pacer.step()
 
-        #click the confirm order button (it uses the same css class as the preview button) and halt
+        #click the confirm order button (it uses the same css class as the preview button) and pace
         waitToLoad(driver, By.CLASS_NAME, config.get('tradePath', 'previewOrderB')[1])
         driver.find_elements(By.CLASS_NAME, config.get('tradePath', 'previewOrderB'))[1].click()
-        haltStep()
+        pacer.step()
 
-        #click the button to go back to the order screen and halt
+        #click the button to go back to the order screen and pace
         waitToLoad(driver, By.LINK_TEXT, "click here")
         driver.find_element(By.LINK_TEXT, "click here").click()
-        haltStep()
+        pacer.step()
+
+        #top the order up to the orders per minute target
+        pacer.end_order()
+
+    #report the pace actually reached and how much delay it took, and how often the ticker cache helped
+    pacer.print_summary()
+    tickerCache.print_summary()
+    tickerCache.save()
     
-    #dump the cookies back into the file
-    pickle.dump(driver.get_cookies(), open('cookies.pkl', 'wb'))
+    #save the session back into the store
+    sessionStore.save(driver, SESSION_HOST, account)
 
     #driver quits
     driver.quit()
 
 #setup the driver
-def setupDriver():
+def setupDriver(config):
     options = Options()
     options.add_argument(f'user-agent={UserAgent().random}')
     options.add_argument("--start-maximized")
     #fill in this line if you want to use your own user data
     #options.add_argument("user-data-dir=")
+
+    #opt-in fast start profile (see the [browser] section of settings.ini)
+    fastStart = fastStartProfile(config)
+    if fastStart:
+        fastStart.apply(options)
+
+    started = time.monotonic()
     driver = uc.Chrome(options=options, executable_path='chromedriver.exe')
+    if fastStart:
+        fastStart.attach(driver)
+    print(f"Chrome started in {time.monotonic() - started:.1f}s")
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     driver.implicitly_wait(10)
     return driver
 
+#builds the fast start browser profile from settings.ini, or None when it is turned off
+def fastStartProfile(config):
+    if not config.getboolean('browser', 'fastStart', fallback=False):
+        return None
+    blockedUrls = config.get('browser', 'blockedUrls', fallback='')
+    if blockedUrls.strip():
+        patterns = [pattern.strip() for pattern in blockedUrls.split(',') if pattern.strip()]
+    else:
+        #nothing waits for images on the simulator, so they are blocked as well
+        patterns = DEFAULT_BLOCKED_URLS + IMAGE_URL_PATTERNS
+    return FastStartProfile(config.get('browser', 'profileDir', fallback='') or None, patterns)
+
+#builds the pacing scheduler from settings.ini (an empty ordersPerMinute keeps the profile's target)
+def pacerFromConfig(config):
+    ordersPerMinute = config.get('pacing', 'ordersPerMinute', fallback='').strip()
+    return Pacer(config.get('pacing', 'profile', fallback='human'),
+                 float(ordersPerMinute) if ordersPerMinute else None)
+
 #logins the user to the website
-def login(driver, config):
+def login(driver, config, pacer):
     driver.find_element(By.XPATH, config.get('loginPath', 'loginLink')).click()
-    haltStep()   
+    pacer.step()   
     driver.find_element(By.XPATH, config.get('loginPath', 'userName')).send_keys(keyring.get_password("investopedia", 'userLogin'))
-    haltStep()  
+    pacer.step()  
     driver.find_element(By.XPATH, config.get('loginPath', 'password')).send_keys(keyring.get_password('investopedia', 'userName'))
-    haltStep()
+    pacer.step()
     driver.find_element(By.XPATH, config.get('loginPath', 'loginB')).click()
-    haltStep()
+    pacer.step()
+
+#waits for either the login link or the trade button and reports whether the saved session was not accepted
+def sessionRejected(driver, config):
+    script = """
+        function present(xpath) {
+            return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+        }
+        if (present(arguments[0])) return 'trade';
+        if (present(arguments[1])) return 'login';
+        return null;
+    """
+    try:
+        state = WebDriverWait(driver, 10).until(lambda d: d.execute_script(
+            script, config.get('tradePath', 'tradeB'), config.get('loginPath', 'loginLink')))
+    except TimeoutException:
+        return True
+    return state != 'trade'
 
 #gets IDs from the innerHTML of a parent HTML section
 def getIDs(driver, config, regexInput, searchClass, pathHeading=None, pathItem=None, element=None):
@@ -136,26 +291,31 @@ def getIDs(driver, config, regexInput, searchClass, pathHeading=None, pathItem=N
     ids = re.findall(regexInput, innerHTML)
     return ids
     
-#helper method for searchAndClickDropDown, will search all items in a drop down list
-def enterDropDownVal(driver, ids, rowValue):
-    for actionID in ids:
-        #check to see if the stock from the file is listed in the list results
-        waitToLoad(driver, By.ID, actionID)
-        actionText = driver.find_element(By.ID, actionID).get_attribute('innerHTML')
-        actionValue = re.search(rowValue, actionText)
-
-        if (actionValue != None):
-            #confirm the stock is the same as the one in the file
-            if (actionValue.group() == rowValue):
-                waitToLoad(driver, By.ID, actionID)
-                driver.find_element(By.ID, actionID).click()
-                break
+#picks rowVal from the open listbox in one script call, returns the option list (id, text, index) it read
+#with optionCache the chosen option's index and text are remembered under (cacheKey, rowVal) and tried first next time
+def selectListboxOption(driver, listClass, rowVal, optionCache=None, cacheKey=None):
+    hint = optionCache.get((cacheKey, rowVal)) if optionCache is not None else None
+    result = driver.execute_async_script(SELECT_OPTION_SCRIPT, '.' + listClass, str(rowVal), hint, 10000)
+    selected = result['selected']
+    if selected is None:
+        print(f"Could not find option {rowVal} among {[option['text'] for option in result['options']]}")
+    elif optionCache is not None:
+        optionCache[(cacheKey, rowVal)] = {'index': selected['index'], 'text': selected['text']}
+    return result['options'] if selected else None
+
+#picks the stock from the search typeahead, going straight for the cached option of a known symbol
+def selectTicker(driver, listClass, symbol, tickerCache):
+    cached = tickerCache.get(symbol)
+    result = driver.execute_async_script(SELECT_OPTION_SCRIPT, '.' + listClass, str(symbol), cached, 10000, 1500)
+    tickerCache.record(symbol, result['selected'], result['cached'])
+    if result['selected'] is None:
+        print(f"Could not find stock {symbol} among {[option['text'] for option in result['options']]}")
+    return result['selected']
 
 #clicks the dropdown to open and submits the option from the excel file
-def searchAndClickDropDown(driver, config, idRegex, pathHeading, dropDownPath, dropDownList, rowVal):
+def searchAndClickDropDown(driver, config, pathHeading, dropDownPath, dropDownList, rowVal, optionCache=None, cacheKey=None):
     dropDownPath.click()
-    ids = getIDs(driver, config, idRegex, True, pathHeading=pathHeading, pathItem=dropDownList)
-    enterDropDownVal(driver, ids, rowVal)
+    return selectListboxOption(driver, config.get(pathHeading, dropDownList), rowVal, optionCache, cacheKey)
 
 #makes sure an element loads before clicking it
 def waitToLoad(driver, byType, identifier):
@@ -164,10 +324,5 @@ def waitToLoad(driver, byType, identifier):
     except:
         TimeoutException
 
-#randomly stops the script between 1-3 seconds (to avoid detection)
-def haltStep():
-    int = random.randint(1, 3)
-    time.sleep(int)
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
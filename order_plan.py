@@ -0,0 +1,85 @@
+import pandas as pd
+
+# Which side of a position each action trades, and in which direction
+ACTION_SIDES = {'buy': 'long', 'sell': 'long', 'buy to cover': 'short', 'sell short': 'short'}
+ACTION_SIGNS = {'buy': 1, 'sell': -1, 'buy to cover': 1, 'sell short': -1}
+
+# Portal action for what is left of a side once it is netted
+NET_ACTIONS = {'long+': 'Buy', 'long-': 'Sell', 'short+': 'Buy to Cover', 'short-': 'Sell Short'}
+
+# Market orders fill the same whichever comes first, so only they are netted against each other
+NETTABLE_ORDER_TYPES = ['market']
+
+ORDER_COLUMNS = ['Stock', 'Action', 'Quantity', 'Order Type', 'Price', 'Duration']
+
+
+def plan_orders(frame, netting=True):
+    """Combine the orders of a sheet into the smallest equivalent set, checking the whole sheet at once
+
+    ``frame`` comes from ``Workbook.load()`` with ORDER_SCHEMA. With ``netting`` orders for
+    the same stock, action, order type, duration and price are added up, and market buys
+    are netted against sells (short sales against covers) of the same stock and duration.
+    Returns a DataFrame in sheet order with the ORDER_SCHEMA columns, ``rows`` (the Excel
+    rows each order stands for) and ``note`` (combined, netted or netted out - a zero
+    ``Quantity`` order is not submitted).
+    """
+    orders = frame.copy()
+    orders['excel_row'] = orders.index + 1
+    orders['Stock'] = orders['Stock'].astype(str).str.strip().str.upper()
+    orders['Quantity'] = pd.to_numeric(orders['Quantity']).astype(int)
+    if not netting:
+        orders['rows'] = orders['excel_row'].map(lambda row: [row])
+        orders['note'] = ''
+        return orders[ORDER_COLUMNS + ['rows', 'note']].reset_index(drop=True)
+
+    action = orders['Action'].astype(str).str.strip().str.lower()
+    orders['side'] = action.map(ACTION_SIDES)
+    orders['signed'] = orders['Quantity'] * action.map(ACTION_SIGNS)
+    orders['price_key'] = orders['Price'].fillna('').astype(str).str.strip()
+    nettable = (
+        orders['side'].notna()
+        & orders['Order Type'].astype(str).str.strip().str.lower().isin(NETTABLE_ORDER_TYPES)
+    )
+
+    netted = orders[nettable].groupby(['Stock', 'side', 'Order Type', 'Duration'], sort=False).agg(
+        net=('signed', 'sum'),
+        actions=('Action', 'nunique'),
+        Price=('Price', 'first'),
+        rows=('excel_row', list),
+        first_row=('excel_row', 'min'),
+    ).reset_index()
+    netted['Quantity'] = netted['net'].abs().astype(int)
+    netted['Action'] = (netted['side'] + netted['net'].gt(0).map({True: '+', False: '-'})).map(NET_ACTIONS)
+    netted['note'] = 'netted'
+    netted.loc[netted['actions'] == 1, 'note'] = 'combined'
+    netted.loc[netted['net'] == 0, 'note'] = 'netted out'
+
+    combined = orders[~nettable].groupby(['Stock', 'Action', 'Order Type', 'Duration', 'price_key'], sort=False).agg(
+        Quantity=('Quantity', 'sum'),
+        Price=('Price', 'first'),
+        rows=('excel_row', list),
+        first_row=('excel_row', 'min'),
+    ).reset_index()
+    combined['note'] = ''
+    combined.loc[combined['rows'].map(len) > 1, 'note'] = 'combined'
+
+    plan = pd.concat([netted, combined], ignore_index=True).sort_values('first_row', kind='stable')
+    plan.loc[plan['rows'].map(len) == 1, 'note'] = ''
+    return plan[ORDER_COLUMNS + ['rows', 'note']].reset_index(drop=True)
+
+
+def orders_to_submit(plan):
+    """The planned orders that still trade something, as dicts with the ORDER_SCHEMA headers"""
+    return plan[plan['Quantity'] > 0][ORDER_COLUMNS].to_dict('records')
+
+
+def print_order_plan(plan, row_count):
+    """Print one line per planned order and how many UI transactions the plan saves"""
+    print("Order plan:")
+    for order in plan.to_dict('records'):
+        rows = ', '.join(str(row) for row in order['rows'])
+        trade = f"{order['Action']} {order['Quantity']}" if order['Quantity'] else "nothing to trade"
+        print(f"   {order['Stock']:<6} {trade:<22} {order['Order Type']:<10} {order['Duration']:<10} rows {rows}"
+              + (f" ({order['note']})" if order['note'] else ""))
+    submitted = int((plan['Quantity'] > 0).sum())
+    print(f"{row_count} rows become {submitted} orders - {row_count - submitted} fewer UI transactions")
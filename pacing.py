@@ -0,0 +1,70 @@
+import random
+import time
+
+# Named pacing profiles: the minimum gap between two actions (seconds, randomised between
+# the bounds), an optional orders-per-minute target and how much that target is randomised
+PACING_PROFILES = {
+    # No delays at all - for test and staging environments
+    'none': {'step_gap': (0, 0), 'orders_per_minute': None, 'jitter': 0},
+    'fast': {'step_gap': (0.2, 0.5), 'orders_per_minute': None, 'jitter': 0.2},
+    'human': {'step_gap': (0.5, 1.5), 'orders_per_minute': 4, 'jitter': 0.2},
+    # Close to the old fixed 1-3 s pause after every action
+    'careful': {'step_gap': (1, 3), 'orders_per_minute': 2, 'jitter': 0.3},
+}
+
+
+class Pacer:
+    """Spaces out browser actions to a target pace, counting time already spent on the page
+
+    ``step()`` goes after each click or keystroke and only sleeps for whatever part of
+    the profile's gap between actions the page's own loading and waiting did not use
+    up. ``begin_order()``/``end_order()`` likewise top each order up to the
+    ``orders_per_minute`` target instead of adding a fixed delay to it.
+    """
+
+    def __init__(self, profile='human', orders_per_minute=None, sleep=time.sleep, clock=time.monotonic):
+        if profile not in PACING_PROFILES:
+            raise ValueError(f"Unknown pacing profile {profile!r}, expected one of {', '.join(PACING_PROFILES)}")
+        settings = PACING_PROFILES[profile]
+        self.profile = profile
+        self.step_gap = settings['step_gap']
+        self.orders_per_minute = settings['orders_per_minute'] if orders_per_minute is None else orders_per_minute
+        self.jitter = settings['jitter']
+        self.sleep = sleep
+        self.clock = clock
+        self.started = clock()
+        self.last_action = self.started
+        self.order_started = None
+        self.orders = 0
+        self.slept = 0.0
+
+    def _pause(self, seconds):
+        if seconds > 0:
+            self.sleep(seconds)
+            self.slept += seconds
+
+    def step(self):
+        """Wait out the rest of the gap since the previous action"""
+        low, high = self.step_gap
+        if high:
+            self._pause(random.uniform(low, high) - (self.clock() - self.last_action))
+        self.last_action = self.clock()
+
+    def begin_order(self):
+        self.order_started = self.clock()
+
+    def end_order(self):
+        """Wait out the rest of the order's share of the orders-per-minute target"""
+        self.orders += 1
+        if self.orders_per_minute and self.order_started is not None:
+            interval = 60 / self.orders_per_minute * random.uniform(1 - self.jitter, 1 + self.jitter)
+            self._pause(interval - (self.clock() - self.order_started))
+        self.order_started = None
+        self.last_action = self.clock()
+
+    def print_summary(self):
+        elapsed = self.clock() - self.started
+        rate = self.orders / (elapsed / 60) if elapsed > 0 else 0.0
+        target = f", target {self.orders_per_minute}/min" if self.orders_per_minute else ""
+        print(f"Paced {self.orders} orders in {elapsed:.0f}s ({rate:.1f} orders/min{target}, '{self.profile}' profile), "
+              f"{self.slept:.0f}s of it added delay")
@@ -0,0 +1,214 @@
+from episode_payload import FORM_FIELDS
+
+# Single-query XPath unions so a readiness poll costs one WebDriver round trip
+SAVE_ERROR_XPATH = (
+    "//*[contains(text(), 'Failed to save episode information!')]"
+    " | //*[contains(text(), 'Error')]"
+    " | //*[contains(text(), 'failed')]"
+    " | //div[contains(@class, 'error')]"
+    " | //div[contains(@class, 'alert-danger')]"
+)
+SAVE_SUCCESS_XPATH = (
+    "//*[contains(text(), 'success')]"
+    " | //*[contains(text(), 'saved')]"
+    " | //*[contains(text(), 'created')]"
+    " | //div[contains(@class, 'success')]"
+    " | //div[contains(@class, 'alert-success')]"
+)
+LOGIN_ERROR_XPATH = (
+    "//div[contains(@class, 'alert-danger')]"
+    " | //*[contains(text(), 'Invalid')]"
+    " | //*[contains(text(), 'incorrect')]"
+)
+
+# Remembers the images already on the page so the upload wait only reacts to the new preview
+SNAPSHOT_IMAGES_SCRIPT = """
+window.__thumbnailSrcsBefore = Array.prototype.map.call(
+    document.querySelectorAll('img'), function (img) { return img.src; });
+"""
+
+UPLOAD_PREVIEW_SCRIPT = """
+var input = arguments[0];
+if (!input || !input.isConnected) return true;
+var busy = document.querySelector('.progress, .spinner-border, [aria-busy="true"]');
+if (busy && busy.offsetParent !== null) return false;
+var before = window.__thumbnailSrcsBefore || [];
+var imgs = document.querySelectorAll('img');
+for (var i = 0; i < imgs.length; i++) {
+    var img = imgs[i];
+    if (before.indexOf(img.src) === -1 && img.complete && img.naturalWidth > 0 && img.offsetParent !== null) {
+        return true;
+    }
+}
+return false;
+"""
+
+DIALOGS_CLOSED_SCRIPT = """
+var dialogs = document.querySelectorAll('.modal.show, [role="dialog"]');
+for (var i = 0; i < dialogs.length; i++) {
+    if (dialogs[i].offsetParent !== null) return false;
+}
+return true;
+"""
+
+# Sets every field in one call through the native value setter so framework bindings see the change
+BULK_FILL_SCRIPT = """
+var fields = arguments[0];
+var results = {};
+fields.forEach(function (field) {
+    var element = null;
+    for (var i = 0; i < field.selectors.length && !element; i++) {
+        element = document.querySelector(field.selectors[i]);
+    }
+    if (!element || element.disabled || element.readOnly) {
+        results[field.key] = false;
+        return;
+    }
+    var proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, field.value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    element.dispatchEvent(new Event('blur', {bubbles: true}));
+    results[field.key] = element.value === field.value;
+});
+return results;
+"""
+
+# Installed before the Save click: watches DOM mutations and URL changes for the save outcome.
+# Messages already visible before the click are ignored so stale text cannot decide the result.
+INSTALL_SAVE_PROBE_SCRIPT = """
+var errorXpath = arguments[0], successXpath = arguments[1];
+if (window.__saveProbe && window.__saveProbe.observer) window.__saveProbe.observer.disconnect();
+if (window.__saveProbe && window.__saveProbe.timer) clearInterval(window.__saveProbe.timer);
+
+function visibleMatches(xpath) {
+    var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) {
+        var node = snapshot.snapshotItem(i);
+        if (node.offsetParent !== null || node.getClientRects().length) nodes.push(node);
+    }
+    return nodes;
+}
+
+var probe = {
+    started: performance.now(),
+    startUrl: location.href,
+    baseline: visibleMatches(errorXpath).concat(visibleMatches(successXpath)),
+    result: null
+};
+
+function finish(outcome, message) {
+    if (probe.result) return;
+    probe.result = {
+        outcome: outcome,
+        message: (message || '').trim().slice(0, 300),
+        elapsed_ms: Math.round(performance.now() - probe.started),
+        url: location.href
+    };
+    probe.observer.disconnect();
+    clearInterval(probe.timer);
+}
+
+function check() {
+    if (location.href !== probe.startUrl && location.href.indexOf('copy') === -1) {
+        finish('redirect', '');
+        return;
+    }
+    var outcomes = [['error', errorXpath], ['success', successXpath]];
+    for (var i = 0; i < outcomes.length; i++) {
+        var fresh = visibleMatches(outcomes[i][1]).filter(function (node) {
+            return probe.baseline.indexOf(node) === -1;
+        });
+        if (fresh.length) {
+            finish(outcomes[i][0], fresh[0].innerText || fresh[0].textContent);
+            return;
+        }
+    }
+}
+
+probe.observer = new MutationObserver(check);
+probe.observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['class', 'style']});
+probe.timer = setInterval(check, 100);
+window.__saveProbe = probe;
+"""
+
+# Resolves as soon as the installed probe has an outcome (or the budget runs out)
+AWAIT_SAVE_PROBE_SCRIPT = """
+var budgetMs = arguments[0], done = arguments[arguments.length - 1];
+var probe = window.__saveProbe;
+if (!probe) {
+    // A full page load replaced the document the probe lived in
+    done({outcome: location.href.indexOf('copy') === -1 ? 'redirect' : 'unknown', message: '', elapsed_ms: null, url: location.href});
+    return;
+}
+var deadline = probe.started + budgetMs;
+(function poll() {
+    if (probe.result) return done(probe.result);
+    if (performance.now() > deadline) {
+        return done({outcome: 'timeout', message: '', elapsed_ms: Math.round(performance.now() - probe.started), url: location.href});
+    }
+    setTimeout(poll, 25);
+})();
+"""
+
+# Looks for the new episode's ID on the page shown after a save
+CREATED_ID_SCRIPT = """
+var selectors = ['input[name="id"]', 'input[name="episode_id"]', '[data-episode-id]'];
+for (var i = 0; i < selectors.length; i++) {
+    var element = document.querySelector(selectors[i]);
+    if (element) return element.getAttribute('data-episode-id') || element.value || null;
+}
+return null;
+"""
+
+# Collects every link to an episode on the listing page
+EPISODE_LINKS_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll('a[href*="/episode/"]'), function (a) { return a.href; });
+"""
+
+# Fetches copy pages in-page with the logged-in cookies, a few at a time, and classifies each ID
+PREFLIGHT_SCRIPT = """
+var ids = arguments[0], baseUrl = arguments[1], concurrency = arguments[2];
+var done = arguments[arguments.length - 1];
+var results = {}, next = 0;
+
+function classify(id) {
+    return fetch(baseUrl + id, {credentials: 'same-origin', redirect: 'manual'}).then(function (response) {
+        if (response.type === 'opaqueredirect' || response.status === 401 || response.status === 403) return 'forbidden';
+        if (response.status === 404) return 'missing';
+        if (!response.ok) return 'error';
+        return response.text().then(function (text) {
+            return /name=["']?title["' >]/.test(text) ? 'exists' : 'missing';
+        });
+    }).catch(function () { return 'error'; }).then(function (status) { results[id] = status; });
+}
+
+function worker() {
+    if (next >= ids.length) return Promise.resolve();
+    return classify(ids[next++]).then(worker);
+}
+
+var workers = [];
+for (var i = 0; i < Math.min(concurrency, ids.length); i++) workers.push(worker());
+Promise.all(workers).then(function () { done(results); });
+"""
+
+# CSS selectors tried in order for each Excel column in the bulk fill
+BULK_FILL_SELECTORS = {
+    'ReleaseDate': ['[name="release_date"]', 'input[type="date"]', 'input[placeholder*="date"]'],
+}
+
+
+def bulk_fill_batch(fields):
+    """Arguments of BULK_FILL_SCRIPT for a payload's Excel columns and values"""
+    return [
+        {
+            'key': excel_col,
+            'selectors': BULK_FILL_SELECTORS.get(excel_col, [f'[name="{FORM_FIELDS[excel_col]}"]']),
+            'value': value,
+        }
+        for excel_col, value in fields.items()
+    ]
@@ -0,0 +1,153 @@
+import random
+import time
+from collections import deque
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    WebDriverException,
+)
+
+
+class RetryableError(Exception):
+    """A transient failure - the same operation may well succeed if tried again"""
+
+
+class FatalError(Exception):
+    """A failure that retrying cannot fix (bad credentials, missing episode, closed browser...)"""
+
+
+# WebDriver and network (OSError) errors are retried unless the browser itself is gone
+RETRYABLE_ERRORS = (RetryableError, WebDriverException, OSError)
+FATAL_ERRORS = (FatalError, InvalidSessionIdException, NoSuchWindowException)
+
+
+def is_retryable(error):
+    """Classify an exception raised by a portal interaction - anything unexpected is fatal"""
+    return isinstance(error, RETRYABLE_ERRORS) and not isinstance(error, FATAL_ERRORS)
+
+
+def describe(error):
+    """One-line description of an error for the run output"""
+    message = error.msg if isinstance(error, WebDriverException) else str(error)
+    message = (message or '').strip()
+    return message.splitlines()[0] if message else type(error).__name__
+
+
+class CircuitBreaker:
+    """Pauses every portal interaction when too many recent attempts failed
+
+    Once at least ``min_calls`` of the last ``window`` attempts were recorded and
+    the failure rate reaches ``threshold``, the circuit opens: the next call
+    waits ``cooldown`` seconds, then a single trial call is let through. If that
+    fails too the circuit opens again with twice the cooldown (up to ``max_cooldown``).
+    """
+
+    def __init__(self, window=20, threshold=0.5, min_calls=6, cooldown=30, max_cooldown=300, sleep=time.sleep):
+        self.window = deque(maxlen=window)
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.sleep = sleep
+        self.state = 'closed'
+        self.pauses = 0
+        self.paused_seconds = 0.0
+
+    def error_rate(self):
+        return self.window.count(False) / len(self.window) if self.window else 0.0
+
+    def before_call(self, operation):
+        """Block while the circuit is open, then let one trial call through"""
+        if self.state != 'open':
+            return 0.0
+        print(f"⛔ Circuit open - portal error rate {self.error_rate():.0%} over the last {len(self.window)} "
+              f"attempts. Pausing the batch for {self.cooldown:.0f}s before trying {operation} again...")
+        self.sleep(self.cooldown)
+        self.pauses += 1
+        self.paused_seconds += self.cooldown
+        self.state = 'half-open'
+        return self.cooldown
+
+    def record(self, success):
+        if self.state == 'half-open':
+            if success:
+                print("✅ Portal is responding again - circuit closed")
+                self.state = 'closed'
+                self.cooldown = self.base_cooldown
+                self.window.clear()
+            else:
+                self.state = 'open'
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            return
+        self.window.append(success)
+        if len(self.window) >= self.min_calls and self.error_rate() >= self.threshold:
+            self.state = 'open'
+
+
+class RetryPolicy:
+    """Runs portal operations with exponential backoff, jitter and a shared circuit breaker
+
+    ``budgets`` maps an operation name to its maximum number of attempts. The
+    operation signals a failure by raising: RetryableError (or any WebDriver or
+    OS error) is retried, FatalError and anything unexpected is raised at once.
+    Every retry wait and circuit pause is printed and, with ``metrics``, recorded
+    as a ``retry_wait`` / ``circuit_pause`` span.
+    """
+
+    def __init__(self, budgets=None, base_delay=1.0, max_delay=30.0, multiplier=2.0, jitter=0.5,
+                 breaker=None, metrics=None, sleep=time.sleep):
+        self.budgets = dict(budgets or {})
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.breaker = breaker
+        self.metrics = metrics
+        self.sleep = sleep
+        self.retries = {}
+
+    def attempts_for(self, operation):
+        return max(1, self.budgets.get(operation, 3))
+
+    def delay(self, attempt):
+        """Backoff before retry number ``attempt`` (1-based), with up to ``jitter`` of it randomised away"""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def run(self, operation, func, *args, attempts=None, **kwargs):
+        """Call ``func`` until it returns without raising a retryable error or the attempts run out"""
+        attempts = attempts or self.attempts_for(operation)
+        for attempt in range(1, attempts + 1):
+            if self.breaker:
+                paused = self.breaker.before_call(operation)
+                if paused and self.metrics:
+                    self.metrics.observe('circuit_pause', paused, ok=False, operation=operation)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable(e)
+                if self.breaker and retryable:
+                    self.breaker.record(False)
+                if not retryable or attempt == attempts:
+                    if retryable:
+                        print(f"❌ {operation} failed after {attempt} attempt(s): {describe(e)}")
+                    raise
+                delay = self.delay(attempt)
+                self.retries[operation] = self.retries.get(operation, 0) + 1
+                print(f"🔁 {operation} failed ({describe(e)}) - attempt {attempt + 1}/{attempts} in {delay:.1f}s")
+                self.sleep(delay)
+                if self.metrics:
+                    self.metrics.observe('retry_wait', delay, ok=False, operation=operation)
+                continue
+            if self.breaker:
+                self.breaker.record(True)
+            return result
+
+    def print_summary(self):
+        if self.retries:
+            print("🔁 Retries: " + ", ".join(f"{operation} {count}" for operation, count in self.retries.items()))
+        if self.breaker and self.breaker.pauses:
+            print(f"⛔ Circuit breaker paused the batch {self.breaker.pauses} time(s), "
+                  f"{self.breaker.paused_seconds:.0f}s in total")
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+# Outcomes that mean a row must not be redone on resume (an unknown save may have created the episode)
+FINISHED_OUTCOMES = ('saved', 'skipped', 'unknown')
+
+
+class RunJournal:
+    """Append-only JSONL record of a batch run, fsynced after every entry so a crash loses nothing
+
+    Each run starts with a ``start`` entry holding the batch settings, followed by one
+    ``row`` entry per processed Excel row. Resuming only looks at the latest run.
+    """
+
+    def __init__(self, path='episode_journal.jsonl'):
+        self.path = path
+        self._file = None
+
+    def _write(self, entry):
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a+', encoding='utf-8')
+            # Terminate a torn last line from a crash so the next entry starts cleanly
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != '\n':
+                    self._file.write('\n')
+        entry['time'] = round(time.time(), 3)
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def start(self, **settings):
+        """Record the start of a run together with the settings needed to resume it"""
+        self._write(dict(event='start', **settings))
+
+    def record(self, excel_row, source_id, created_id, outcome, timings=None, message=''):
+        """Record the outcome of one Excel row (saved, skipped, failed or unknown)"""
+        self._write({
+            'event': 'row',
+            'excel_row': excel_row,
+            'source_id': source_id,
+            'created_id': created_id,
+            'outcome': outcome,
+            'message': message,
+            'timings': {step: round(seconds, 3) for step, seconds in (timings or {}).items()},
+        })
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_last_run(self):
+        """Return (settings, row entries) of the most recent run, or (None, []) if there is none"""
+        settings, rows = None, []
+        if not os.path.isfile(self.path):
+            return settings, rows
+        with open(self.path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    continue
+                if entry.get('event') == 'start':
+                    settings, rows = entry, []
+                elif entry.get('event') == 'row':
+                    rows.append(entry)
+        return settings, rows
+
+    def resume_state(self):
+        """Work out where the last run stopped
+
+        Returns None if there is nothing to resume, otherwise a dict with the run's
+        ``settings``, the ``finished_rows`` (1-based Excel rows already saved,
+        skipped or possibly saved) and ``chain_source_id``, the episode the next
+        chained copy starts from - None when the chain stopped at a save whose new
+        episode ID is not known.
+        """
+        settings, rows = self.read_last_run()
+        if settings is None:
+            return None
+
+        finished_rows = {row['excel_row'] for row in rows if row['outcome'] in FINISHED_OUTCOMES}
+        chain_source_id = settings.get('start_id')
+        for row in rows:
+            if row['outcome'] == 'saved' and row.get('created_id') is not None:
+                chain_source_id = row['created_id']
+            elif row['outcome'] in ('saved', 'unknown'):
+                chain_source_id = None
+        return {
+            'settings': settings,
+            'finished_rows': finished_rows,
+            'chain_source_id': chain_source_id,
+        }
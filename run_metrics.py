@@ -0,0 +1,172 @@
+import functools
+import json
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+
+from atomic_file import atomic_write
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95)
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def prometheus_path(path):
+    """Where the Prometheus text export of a JSONL metrics file goes (episode_metrics.jsonl -> .prom)"""
+    return os.path.splitext(path)[0] + '.prom'
+
+
+class RunMetrics:
+    """Timing spans of one automation run
+
+    Every span (a step such as a login, a form fill or a readiness wait, or a whole
+    episode) is appended to a JSONL file and the automation log as soon as it ends.
+    ``close()`` also writes the totals as a Prometheus text file next to it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.samples = {}
+        self.failures = {}
+        self.outcomes = {}
+        self.episode = {}
+        self.started = time.monotonic()
+        self._episode_started = None
+        self._file = None
+
+    def _write(self, entry):
+        if not self.path:
+            return
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+    def observe(self, step, seconds, ok=True, **labels):
+        """Record one finished span of ``step``"""
+        self.samples.setdefault(step, []).append(seconds)
+        if not ok:
+            self.failures[step] = self.failures.get(step, 0) + 1
+        entry = dict(self.episode, step=step, seconds=round(seconds, 4), ok=ok, time=round(time.time(), 3), **labels)
+        self._write(entry)
+        logger.info("span %s %.3fs ok=%s %s", step, seconds, ok,
+                    ' '.join(f"{name}={value}" for name, value in entry.items()
+                             if name not in ('step', 'seconds', 'ok', 'time')))
+
+    @contextmanager
+    def span(self, step, **labels):
+        """Time the body as one span; set ``span['ok'] = False`` inside it to mark a failure"""
+        state = {'ok': True}
+        started = time.monotonic()
+        try:
+            yield state
+        except BaseException:
+            state['ok'] = False
+            raise
+        finally:
+            self.observe(step, time.monotonic() - started, ok=state['ok'], **labels)
+
+    def begin_episode(self, excel_row, source_id):
+        """Label the following spans with the Excel row and source episode being processed"""
+        self.episode = {'excel_row': excel_row, 'source_id': source_id}
+        self._episode_started = time.monotonic()
+
+    def end_episode(self, outcome):
+        """Close the current episode span with its outcome (saved, skipped or failed)"""
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if self._episode_started is not None:
+            self.observe('episode', time.monotonic() - self._episode_started, ok=outcome == 'saved', outcome=outcome)
+        self.episode = {}
+        self._episode_started = None
+
+    def record_episode(self, seconds, outcome, **labels):
+        """Record an episode timed by the caller, for episodes that overlap (one per browser tab)"""
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.observe('episode', seconds, ok=outcome == 'saved', outcome=outcome, **labels)
+
+    def episodes_per_minute(self):
+        minutes = (time.monotonic() - self.started) / 60
+        return self.outcomes.get('saved', 0) / minutes if minutes > 0 else 0.0
+
+    def print_summary(self):
+        """Print p50/p95 per step and the overall throughput"""
+        if not self.samples:
+            return
+        print("⏱ Step timings (count / p50 / p95 / max seconds, failures):")
+        for step, samples in self.samples.items():
+            p50, p95 = (percentile(samples, fraction) for fraction in QUANTILES)
+            failures = self.failures.get(step, 0)
+            print(f"   {step:<24} {len(samples):>4} / {p50:6.2f} / {p95:6.2f} / {max(samples):6.2f}"
+                  + (f", {failures} failed" if failures else ""))
+        outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.outcomes.items()))
+        print(f"🚀 Throughput: {self.episodes_per_minute():.2f} episodes/min" + (f" ({outcomes})" if outcomes else ""))
+
+    def prometheus_text(self):
+        """The run's totals in the Prometheus text exposition format"""
+        lines = [
+            '# HELP episode_step_seconds Duration of automation steps',
+            '# TYPE episode_step_seconds summary',
+        ]
+        for step, samples in self.samples.items():
+            for fraction in QUANTILES:
+                lines.append(f'episode_step_seconds{{step="{step}",quantile="{fraction}"}} {percentile(samples, fraction):.4f}')
+            lines.append(f'episode_step_seconds_sum{{step="{step}"}} {sum(samples):.4f}')
+            lines.append(f'episode_step_seconds_count{{step="{step}"}} {len(samples)}')
+        lines += [
+            '# HELP episode_step_failures_total Steps that returned a failure or raised',
+            '# TYPE episode_step_failures_total counter',
+        ]
+        lines += [f'episode_step_failures_total{{step="{step}"}} {count}' for step, count in self.failures.items()]
+        lines += [
+            '# HELP episodes_total Processed Excel rows by outcome',
+            '# TYPE episodes_total counter',
+        ]
+        lines += [f'episodes_total{{outcome="{outcome}"}} {count}' for outcome, count in self.outcomes.items()]
+        lines += [
+            '# HELP episodes_per_minute Saved episodes per minute of run time',
+            '# TYPE episodes_per_minute gauge',
+            f'episodes_per_minute {self.episodes_per_minute():.4f}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path=None):
+        path = path or (prometheus_path(self.path) if self.path else None)
+        if not path:
+            return
+        with atomic_write(path) as prom_file:
+            prom_file.write(self.prometheus_text())
+
+    def close(self):
+        """Write the Prometheus export and close the JSONL file"""
+        if self.samples or self.outcomes:
+            self.write_prometheus()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def timed(step):
+    """Method decorator recording each call as a ``step`` span on ``self.metrics``
+
+    A falsy return value counts as a failed span, matching how the automation
+    methods report success.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(step) as span:
+                result = method(self, *args, **kwargs)
+                span['ok'] = bool(result)
+                return result
+        return wrapper
+    return decorator
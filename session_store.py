@@ -0,0 +1,106 @@
+import os
+import pickle
+import re
+import time
+
+from atomic_file import atomic_write
+
+# Dumps every localStorage entry of the current page into a plain object
+DUMP_LOCAL_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+# Writes the given key/value pairs back into localStorage
+LOAD_LOCAL_STORAGE_SCRIPT = """
+var items = arguments[0];
+for (var key in items) {
+    window.localStorage.setItem(key, items[key]);
+}
+"""
+
+
+class SessionStore:
+    """Saves authenticated browser sessions (cookies + localStorage) per host and account"""
+
+    def __init__(self, directory='sessions'):
+        self.directory = directory
+
+    def path_for(self, host, account):
+        """File the session for this host/account pair is stored in"""
+        name = re.sub(r'[^A-Za-z0-9_.@-]', '_', f"{host}__{account}")
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def save(self, driver, host, account):
+        """Save the driver's cookies and localStorage for the page it is currently on"""
+        try:
+            session = {
+                'cookies': driver.get_cookies(),
+                'local_storage': driver.execute_script(DUMP_LOCAL_STORAGE_SCRIPT) or {},
+                'saved_at': time.time(),
+            }
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path_for(host, account)
+            with atomic_write(path, 'wb') as session_file:
+                pickle.dump(session, session_file)
+            return True
+        except Exception as e:
+            print(f"⚠ Could not save session for {host}: {e}")
+            return False
+
+    def load(self, host, account):
+        """Return the stored session, or None if there is none or its cookies have all expired"""
+        path = self.path_for(host, account)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as session_file:
+                session = pickle.load(session_file)
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable session file {path}: {e}")
+            return None
+
+        # Drop cookies whose expiry already passed so a dead session costs no navigation
+        now = time.time()
+        session['cookies'] = [c for c in session.get('cookies', []) if c.get('expiry', now + 1) > now]
+        if not session['cookies'] and not session.get('local_storage'):
+            return None
+        return session
+
+    def restore(self, driver, host, account, url=None):
+        """Load the stored session into the driver, returns True if there was one to load
+
+        The driver must be on a page of ``host`` (or ``url`` is opened first) because
+        browsers only accept cookies and localStorage for the current origin. The
+        session only takes effect on the next navigation.
+        """
+        session = self.load(host, account)
+        if session is None:
+            return False
+
+        if url:
+            driver.get(url)
+
+        for cookie in session['cookies']:
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                continue
+
+        if session.get('local_storage'):
+            try:
+                driver.execute_script(LOAD_LOCAL_STORAGE_SCRIPT, session['local_storage'])
+            except Exception as e:
+                print(f"⚠ Could not restore localStorage for {host}: {e}")
+        return True
+
+    def discard(self, host, account):
+        """Forget the stored session (e.g. after the site rejected it)"""
+        try:
+            os.remove(self.path_for(host, account))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,388 @@
+"""Local stand-in for the episode CMS, used to exercise the automation without the real portal
+
+Run ``python stub_portal.py`` to serve it on http://127.0.0.1:8765 (login admin@gmail.com / 123456).
+Latency and failures can be injected (see ``--help``) to see how the automation copes with a slow
+or flaky portal; ``benchmark.py`` drives the browser automation against it.
+"""
+import argparse
+import html
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COPY_PATH = re.compile(r'^/system-admin/content/media/episode/copy/(\d+)$')
+EDIT_PATH = re.compile(r'^/system-admin/content/media/episode/edit/(\d+)$')
+LISTING_PATH = '/system-admin/content/media/episode'
+UPLOAD_PATH = '/system-admin/content/media/upload'
+SESSION_COOKIE = 'portal_session'
+
+EPISODE_FIELDS = ['title', 'episode_number', 'content_url', 'subtitle', 'duration', 'release_date', 'thumbnail_url']
+REQUIRED_FIELDS = ['title', 'episode_number', 'content_url']
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title><meta name="csrf-token" content="{token}"></head>
+<body>
+{nav}{body}
+</body></html>"""
+
+# Only shown to logged-in users - the automation's login check looks for it
+NAV = f"""<nav><a href="/dashboard">Dashboard</a> <a href="{LISTING_PATH}">Episodes</a> <a href="/logout">Logout</a></nav>
+"""
+
+LOGIN_BODY = """<h1>Login</h1>
+{error}
+<form method="post" action="/login">
+  <input type="hidden" name="_token" value="{token}">
+  <input type="email" name="email">
+  <input type="password" name="password">
+  <button type="submit">Login</button>
+</form>"""
+
+COPY_BODY = """<h1>Edit Episode</h1>
+<h2>Episode Information</h2>
+{message}
+<form method="post" action="{action}" id="episode-form" data-save-mode="{save_mode}">
+  <input type="hidden" name="_token" value="{token}">
+  <input type="hidden" name="thumbnail_url" value="{thumbnail_url}">
+  <input type="text" name="title" value="{title}">
+  <input type="text" name="subtitle" value="{subtitle}">
+  <input type="text" name="episode_number" value="{episode_number}">
+  <input type="text" name="content_url" value="{content_url}">
+  <input type="text" name="duration" value="{duration}">
+  <input type="date" name="release_date" value="{release_date}">
+  <img class="thumbnail" src="{thumbnail_url}" alt="">
+  <button type="button" class="btn-ma-primary" onclick="openUploadDialog()">Upload Thumbnail Image</button>
+  <button type="submit">Save</button>
+</form>
+<div id="toasts"></div>
+<script>{script}</script>"""
+
+# Behaviour of the copy page: the thumbnail upload dialog and (in toast mode) saving in place
+COPY_SCRIPT = """
+var token = document.querySelector('meta[name="csrf-token"]').content;
+var form = document.getElementById('episode-form');
+
+function closeUploadDialog() {
+    var dialog = document.getElementById('upload-dialog');
+    if (dialog) dialog.remove();
+}
+
+function openUploadDialog() {
+    closeUploadDialog();
+    var dialog = document.createElement('div');
+    dialog.id = 'upload-dialog';
+    dialog.className = 'modal show';
+    dialog.setAttribute('role', 'dialog');
+    dialog.innerHTML = '<h5>Upload Thumbnail</h5>'
+        + '<input type="file" name="file" accept="image/*">'
+        + '<div class="progress" style="display:none">Uploading...</div>'
+        + '<div class="upload-message"></div>'
+        + '<button type="button" onclick="closeUploadDialog()">Cancel</button>';
+    dialog.querySelector('input').addEventListener('change', function (event) {
+        var file = event.target.files[0];
+        if (!file) return;
+        var progress = dialog.querySelector('.progress');
+        progress.style.display = 'block';
+        var body = new FormData();
+        body.append('file', file);
+        fetch('""" + UPLOAD_PATH + """', {method: 'POST', body: body, headers: {'X-CSRF-TOKEN': token}})
+            .then(function (response) { return response.json(); })
+            .then(function (result) {
+                if (!result.url) throw new Error(result.error || 'upload rejected');
+                form.querySelector('[name="thumbnail_url"]').value = result.url;
+                var preview = form.querySelector('img.thumbnail');
+                preview.onload = function () { progress.style.display = 'none'; };
+                preview.src = result.url;
+            })
+            .catch(function (error) {
+                progress.style.display = 'none';
+                dialog.querySelector('.upload-message').innerHTML = '<div class="alert-danger">Upload rejected: ' + error.message + '</div>';
+            });
+    });
+    document.body.appendChild(dialog);
+}
+
+document.addEventListener('keydown', function (event) {
+    if (event.key === 'Escape') closeUploadDialog();
+});
+
+function showToast(result) {
+    var toast = document.createElement('div');
+    toast.className = result.ok ? 'toast alert-success' : 'toast alert-danger';
+    if (result.id) toast.setAttribute('data-episode-id', result.id);
+    toast.textContent = result.message;
+    document.getElementById('toasts').appendChild(toast);
+    setTimeout(function () { toast.remove(); }, 4000);
+}
+
+if (form.getAttribute('data-save-mode') === 'toast') {
+    form.addEventListener('submit', function (event) {
+        event.preventDefault();
+        fetch(form.getAttribute('action'), {method: 'POST', body: new FormData(form), headers: {'X-Requested-With': 'XMLHttpRequest'}})
+            .then(function (response) { return response.json(); })
+            .then(showToast)
+            .catch(function () { showToast({ok: false, message: 'Failed to save episode information!'}); });
+    });
+}
+"""
+
+
+class StubPortal:
+    """In-memory episode CMS served over HTTP on a background thread
+
+    Every request is delayed by ``latency`` seconds plus up to ``jitter`` more. Saves and
+    thumbnail uploads fail at random with ``save_failure_rate`` / ``upload_failure_rate``.
+    ``save_mode`` 'redirect' answers a save with a redirect to the new episode's edit page,
+    'toast' saves in place over fetch and shows a success or error toast on the copy page.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, username='admin@gmail.com', password='123456',
+                 seed_ids=(665,), latency=0.0, jitter=0.0, save_failure_rate=0.0, upload_failure_rate=0.0,
+                 save_mode='redirect', seed=None):
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.save_failure_rate = save_failure_rate
+        self.upload_failure_rate = upload_failure_rate
+        self.save_mode = save_mode
+        self.random = random.Random(seed)
+        self.sessions = {}
+        self.uploads = {}
+        self.episodes = {
+            episode_id: {'title': f'Template {episode_id}', 'episode_number': '0', 'content_url': ''}
+            for episode_id in seed_ids
+        }
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), type('Handler', (PortalRequestHandler,), {'portal': self}))
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="stub-portal", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def delay(self):
+        """Sleep for the configured request latency"""
+        seconds = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def inject_failure(self, rate):
+        """True when an injected failure should happen this time"""
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+    def create_episode(self, fields):
+        """Store a new episode and return its ID"""
+        with self.lock:
+            episode_id = max(self.episodes, default=0) + 1
+            self.episodes[episode_id] = {name: fields.get(name, '') for name in EPISODE_FIELDS}
+            return episode_id
+
+
+class PortalRequestHandler(BaseHTTPRequestHandler):
+    portal = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # Helpers
+
+    def session(self):
+        cookies = self.headers.get('Cookie', '')
+        for part in cookies.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == SESSION_COOKIE and value in self.portal.sessions:
+                return value
+        return None
+
+    def token(self):
+        session = self.session()
+        return self.portal.sessions.get(session, '') if session else ''
+
+    def send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def page(self, status, title, body, headers=None):
+        self.send(status, PAGE.format(title=title, token=self.token(), nav=NAV if self.session() else '', body=body), headers=headers)
+
+    def redirect(self, location, headers=None):
+        self.send(302, '', headers=dict(headers or {}, Location=location))
+
+    def read_form(self):
+        """Parse a urlencoded or multipart body into (fields, files)"""
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser(policy=default_policy).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+            )
+            fields, files = {}, {}
+            for part in message.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                if part.get_filename():
+                    files[name] = (part.get_filename(), part.get_payload(decode=True))
+                else:
+                    fields[name] = part.get_content().strip()
+            return fields, files
+        parsed = parse_qs(raw.decode('utf-8'), keep_blank_values=True)
+        return {name: values[-1] for name, values in parsed.items()}, {}
+
+    def csrf_ok(self, fields):
+        token = self.token()
+        return bool(token) and token in (fields.get('_token'), self.headers.get('X-CSRF-TOKEN'))
+
+    # Routes
+
+    def do_GET(self):
+        self.portal.delay()
+        path = urlparse(self.path).path
+        if path == '/login':
+            return self.login_page()
+        if path == '/logout':
+            self.portal.sessions.pop(self.session(), None)
+            return self.redirect('/login')
+        if not self.session():
+            return self.redirect('/login')
+        if path in ('/', '/dashboard'):
+            return self.page(200, 'Dashboard', '<h1>Dashboard</h1><p>Welcome</p>')
+        if path == LISTING_PATH:
+            return self.listing_page()
+        match = COPY_PATH.match(path) or EDIT_PATH.match(path)
+        if match:
+            return self.episode_page(int(match.group(1)), path)
+        if path.startswith('/uploads/') and path in self.portal.uploads:
+            return self.send(200, self.portal.uploads[path], content_type='image/jpeg')
+        self.page(404, '404 Not Found', '<h1>404</h1><p>Not found</p>')
+
+    def do_POST(self):
+        self.portal.delay()
+        path = urlparse(self.path).path
+        if path == '/login':
+            return self.login_submit()
+        if not self.session():
+            return self.redirect('/login')
+        fields, files = self.read_form()
+        if not self.csrf_ok(fields):
+            return self.page(419, 'Page Expired', '<div class="alert-danger">Page expired</div>')
+        if path == UPLOAD_PATH:
+            return self.upload(files)
+        match = COPY_PATH.match(path)
+        if match:
+            return self.copy_submit(int(match.group(1)), fields)
+        self.page(404, '404 Not Found', '<h1>404</h1><p>Not found</p>')
+
+    def login_page(self, error=''):
+        token = secrets.token_hex(16)
+        body = LOGIN_BODY.format(token=token, error=error)
+        self.send(200, PAGE.format(title='Login', token=token, nav='', body=body))
+
+    def login_submit(self):
+        fields, _ = self.read_form()
+        if fields.get('email') != self.portal.username or fields.get('password') != self.portal.password:
+            return self.login_page('<div class="alert-danger">Invalid email or password</div>')
+        session = secrets.token_hex(16)
+        self.portal.sessions[session] = secrets.token_hex(16)
+        self.redirect('/dashboard', headers={'Set-Cookie': f'{SESSION_COOKIE}={session}; Path=/; HttpOnly'})
+
+    def listing_page(self):
+        rows = ''.join(
+            f'<tr><td><a href="/system-admin/content/media/episode/edit/{episode_id}">{episode_id}</a></td>'
+            f'<td>{html.escape(episode.get("title", ""))}</td></tr>'
+            for episode_id, episode in sorted(self.portal.episodes.items(), reverse=True)
+        )
+        self.page(200, 'Episodes', f'<h1>Episodes</h1><table class="episodes">{rows}</table>')
+
+    def episode_page(self, episode_id, action, message=''):
+        episode = self.portal.episodes.get(episode_id)
+        if episode is None:
+            return self.page(404, '404 Not Found', '<h1>404</h1><p>Episode not found</p>')
+        values = {name: html.escape(str(episode.get(name, '')), quote=True) for name in EPISODE_FIELDS}
+        body = COPY_BODY.format(action=action, token=self.token(), message=message, save_mode=self.portal.save_mode,
+                                script=COPY_SCRIPT, **values)
+        self.page(200, 'Edit Episode', body)
+
+    def copy_submit(self, source_id, fields):
+        if source_id not in self.portal.episodes:
+            return self.page(404, '404 Not Found', '<h1>404</h1><p>Episode not found</p>')
+        in_place = self.headers.get('X-Requested-With') == 'XMLHttpRequest'
+        missing = [name for name in REQUIRED_FIELDS if not fields.get(name, '').strip()]
+        if missing or self.portal.inject_failure(self.portal.save_failure_rate):
+            if in_place:
+                result = {'ok': False, 'message': 'Failed to save episode information!'}
+                return self.send(422, json.dumps(result), content_type='application/json')
+            message = '<div class="alert-danger">Failed to save episode information!</div>'
+            return self.episode_page(source_id, self.path, message)
+        new_id = self.portal.create_episode(fields)
+        if in_place:
+            result = {'ok': True, 'id': new_id, 'message': 'Episode information saved successfully'}
+            return self.send(200, json.dumps(result), content_type='application/json')
+        self.redirect(f'/system-admin/content/media/episode/edit/{new_id}')
+
+    def upload(self, files):
+        if not files:
+            return self.send(422, json.dumps({'error': 'no file'}), content_type='application/json')
+        if self.portal.inject_failure(self.portal.upload_failure_rate):
+            return self.send(500, json.dumps({'error': 'storage unavailable'}), content_type='application/json')
+        filename, data = next(iter(files.values()))
+        url = f"/uploads/{secrets.token_hex(8)}-{re.sub(r'[^A-Za-z0-9_.-]', '_', filename)}"
+        self.portal.uploads[url] = data
+        self.send(200, json.dumps({'url': url, 'bytes': len(data)}), content_type='application/json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument('--save-failure-rate', type=float, default=0.0, help="fraction of saves that fail")
+    parser.add_argument('--upload-failure-rate', type=float, default=0.0, help="fraction of uploads that fail")
+    parser.add_argument('--save-mode', choices=['redirect', 'toast'], default='redirect')
+    args = parser.parse_args()
+
+    portal = StubPortal(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                        save_failure_rate=args.save_failure_rate, upload_failure_rate=args.upload_failure_rate,
+                        save_mode=args.save_mode)
+    print(f"🧪 Stub portal running at {portal.url} (login {portal.username} / {portal.password})")
+    try:
+        portal.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        portal.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from urllib.request import urlopen
+
+import websockets
+
+from episode_batch import EpisodeBatch, copy_outcome, save_retry_delay
+from episode_payload import REQUIRED_COLUMNS, PayloadPrefetcher, episode_id_from_url
+from http_engine import SessionRejected
+from page_scripts import (
+    AWAIT_SAVE_PROBE_SCRIPT,
+    BULK_FILL_SCRIPT,
+    CREATED_ID_SCRIPT,
+    DIALOGS_CLOSED_SCRIPT,
+    INSTALL_SAVE_PROBE_SCRIPT,
+    SAVE_ERROR_XPATH,
+    SAVE_SUCCESS_XPATH,
+    SNAPSHOT_IMAGES_SCRIPT,
+    UPLOAD_PREVIEW_SCRIPT,
+    bulk_fill_batch,
+)
+from run_journal import RunJournal
+from workbook import EPISODE_SCHEMA, Workbook
+
+# Chrome switches that keep timers and rendering of background tabs at full speed
+BACKGROUND_TAB_ARGUMENTS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+FILE_INPUT_SELECTOR = 'input[type="file"]'
+
+# Tells the loaded copy form apart from a login redirect or an error page (null while loading)
+PAGE_STATE_SCRIPT = """
+if (location.href.indexOf('login') !== -1) return 'login';
+if (document.title.indexOf('404') !== -1 || document.title.indexOf('Error') !== -1) return 'error';
+if (document.readyState !== 'loading' && document.querySelector('[name="title"]')) return 'form';
+return null;
+"""
+
+OPEN_UPLOAD_DIALOG_SCRIPT = """
+var buttons = document.querySelectorAll('button.btn-ma-primary');
+for (var i = 0; i < buttons.length; i++) {
+    if (buttons[i].textContent.indexOf('Upload Thumbnail Image') !== -1) {
+        buttons[i].scrollIntoView(true);
+        buttons[i].click();
+        return true;
+    }
+}
+return false;
+"""
+
+FILE_INPUT_PRESENT_SCRIPT = "return !!document.querySelector('" + FILE_INPUT_SELECTOR + "');"
+
+# The upload preview check, with the dialog's file input looked up in the page instead of passed in
+PREVIEW_READY_SCRIPT = (
+    "return (function () {" + UPLOAD_PREVIEW_SCRIPT + "}).call(null, document.querySelector('"
+    + FILE_INPUT_SELECTOR + "'));"
+)
+
+CLICK_SAVE_SCRIPT = """
+var buttons = document.querySelectorAll('button[type="submit"]');
+for (var i = 0; i < buttons.length; i++) {
+    if (buttons[i].textContent.indexOf('Save') !== -1) {
+        buttons[i].scrollIntoView(true);
+        buttons[i].click();
+        return true;
+    }
+}
+return false;
+"""
+
+LOADED_URL_SCRIPT = "return document.readyState === 'loading' ? null : location.href;"
+
+
+class DevToolsError(Exception):
+    """A DevTools command failed, or the page it ran in went away"""
+
+
+def enable_background_tabs(options):
+    """Stop Chrome from throttling tabs that are not in front, so every tab runs at full speed"""
+    for argument in BACKGROUND_TAB_ARGUMENTS:
+        options.add_argument(argument)
+    return options
+
+
+def browser_websocket_url(driver):
+    """DevTools websocket of the browser a Selenium Chrome driver controls"""
+    address = driver.capabilities['goog:chromeOptions']['debuggerAddress']
+    with urlopen(f"http://{address}/json/version", timeout=10) as response:
+        return json.load(response)['webSocketDebuggerUrl']
+
+
+class DevToolsConnection:
+    """One websocket to the browser's DevTools endpoint, shared by every tab
+
+    Each tab is attached in flat mode, so its commands go over the same socket tagged
+    with the tab's ``sessionId``. Responses are matched to their command by ``id``;
+    events are not used.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.tabs = []
+        self.reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, websocket_url):
+        try:
+            return cls(await websockets.connect(websocket_url, max_size=None))
+        except (OSError, websockets.WebSocketException) as e:
+            raise DevToolsError(f"Could not connect to {websocket_url}: {e}") from e
+
+    @property
+    def closed(self):
+        return self.reader.done() or self.websocket.closed
+
+    async def _read(self):
+        try:
+            async for message in self.websocket:
+                message = json.loads(message)
+                future = self.pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(DevToolsError(message['error'].get('message', 'command failed')))
+                else:
+                    future.set_result(message.get('result', {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(DevToolsError("DevTools connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """Send one command and return its result, raising DevToolsError if it fails or the socket closes"""
+        if self.closed:
+            raise DevToolsError("DevTools connection closed")
+        message_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message_id] = future
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        try:
+            await self.websocket.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        except websockets.ConnectionClosed as e:
+            raise DevToolsError(f"DevTools connection closed: {e}") from e
+        finally:
+            self.pending.pop(message_id, None)
+
+    async def open_tab(self):
+        """Open a new tab in the browser's default context (sharing its cookies) and attach to it"""
+        target = await self.send('Target.createTarget', {'url': 'about:blank', 'background': True})
+        attached = await self.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        tab = Tab(self, target['targetId'], attached['sessionId'], len(self.tabs) + 1)
+        self.tabs.append(tab)
+        return tab
+
+    async def close(self):
+        """Close the tabs this connection opened, then the socket - the browser keeps running"""
+        for tab in self.tabs:
+            try:
+                await self.send('Target.closeTarget', {'targetId': tab.target_id}, timeout=5)
+            except (DevToolsError, asyncio.TimeoutError):
+                pass
+        await self.websocket.close()
+        await self.reader
+
+
+class Tab:
+    """A browser tab driven through its DevTools session"""
+
+    def __init__(self, connection, target_id, session_id, number):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.number = number
+
+    async def send(self, method, params=None, timeout=30):
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    async def _evaluate(self, expression, await_promise, timeout):
+        result = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': await_promise,
+        }, timeout=timeout)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise DevToolsError(details.get('exception', {}).get('description') or details.get('text'))
+        return result['result'].get('value')
+
+    async def call(self, script, *args, timeout=30):
+        """Run an ``execute_script``-style script (``arguments[n]``, ``return``) with JSON arguments"""
+        expression = f"(function () {{{script}}}).apply(null, {json.dumps(list(args))})"
+        return await self._evaluate(expression, False, timeout)
+
+    async def call_async(self, script, *args, timeout=30):
+        """Run an ``execute_async_script``-style script, whose last argument is the callback"""
+        expression = (
+            f"new Promise(function (done) {{ (function () {{{script}}})"
+            f".apply(null, {json.dumps(list(args))}.concat([done])); }})"
+        )
+        return await self._evaluate(expression, True, timeout)
+
+    async def wait_for(self, script, budget, *args, poll=0.1):
+        """Poll a script until it returns something truthy, returns the last value after ``budget`` seconds"""
+        deadline = time.monotonic() + budget
+        while True:
+            try:
+                value = await self.call(script, *args)
+            except DevToolsError:
+                # The tab is between two documents
+                value = None
+            if value or time.monotonic() > deadline:
+                return value
+            await asyncio.sleep(poll)
+
+    async def navigate(self, url):
+        result = await self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise DevToolsError(f"{result['errorText']} loading {url}")
+
+    async def set_file(self, selector, path):
+        """Choose ``path`` in the file input matching ``selector``, returns False if there is none"""
+        document = await self.send('DOM.getDocument', {'depth': 0})
+        node = await self.send('DOM.querySelector', {'nodeId': document['root']['nodeId'], 'selector': selector})
+        if not node.get('nodeId'):
+            return False
+        await self.send('DOM.setFileInputFiles', {'files': [path], 'nodeId': node['nodeId']})
+        return True
+
+    async def press_escape(self):
+        for event_type in ('keyDown', 'keyUp'):
+            await self.send('Input.dispatchKeyEvent', {
+                'type': event_type, 'key': 'Escape', 'code': 'Escape', 'windowsVirtualKeyCode': 27,
+            })
+
+
+class TabEpisodeEngine:
+    """Copies episodes in several tabs of one logged-in browser, driven concurrently over DevTools
+
+    Selenium blocks on one page at a time. Here every tab is a DevTools session on a
+    single websocket to the browser ``automation`` launched and logged in, so up to
+    ``tabs`` rows are copied, filled, uploaded and saved at once for the cost of one
+    browser and one login. Chained copies still run one at a time in one tab because
+    each row copies the episode the previous save created.
+    """
+
+    def __init__(self, automation, tabs=4, thumbnails=None):
+        self.automation = automation
+        self.tabs = max(1, tabs)
+        self.step_budgets = automation.step_budgets
+        self.retry = automation.retry
+        self.metrics = automation.metrics
+        self.image_index = automation.image_index
+        self.thumbnails = thumbnails
+
+    async def load_copy_page(self, tab, episode_id):
+        """Open the copy page, returns ``form``, ``login``, ``error`` or None if it never loaded"""
+        attempts = self.retry.attempts_for('navigate')
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                await tab.navigate(self.automation.copy_url(episode_id))
+                state = await tab.wait_for(PAGE_STATE_SCRIPT, self.step_budgets['copy_form'])
+            except (DevToolsError, asyncio.TimeoutError) as e:
+                print(f"⚠ Tab {tab.number}: loading episode {episode_id} failed: {e}")
+                state = None
+            self.metrics.observe('navigate', time.monotonic() - started, ok=state == 'form', tab=tab.number)
+            if state:
+                return state
+            if attempt < attempts:
+                await asyncio.sleep(self.retry.delay(attempt))
+        return None
+
+    async def upload_thumbnail(self, tab, image_path):
+        """Upload the thumbnail through the page's upload dialog, returns True once its preview shows"""
+        started = time.monotonic()
+        if self.thumbnails:
+            # Waits for the background conversion, so keep it off the event loop
+            image_path = await asyncio.get_running_loop().run_in_executor(
+                None, self.thumbnails.prepared_path, image_path
+            )
+        await tab.call(SNAPSHOT_IMAGES_SCRIPT)
+        uploaded = (
+            await tab.call(OPEN_UPLOAD_DIALOG_SCRIPT)
+            and await tab.wait_for(FILE_INPUT_PRESENT_SCRIPT, self.step_budgets['upload_dialog'])
+            and await tab.set_file(FILE_INPUT_SELECTOR, os.path.abspath(image_path))
+            and await tab.wait_for(PREVIEW_READY_SCRIPT, self.step_budgets['upload_preview'])
+        )
+        await tab.press_escape()
+        await tab.wait_for(DIALOGS_CLOSED_SCRIPT, self.step_budgets['dialog_close'])
+        self.metrics.observe('upload', time.monotonic() - started, ok=bool(uploaded), tab=tab.number,
+                             bytes=os.path.getsize(image_path))
+        return bool(uploaded)
+
+    async def save(self, tab):
+        """Click Save and wait for the save probe, returns an outcome dict like ``await_save_outcome``"""
+        budget = self.step_budgets['save_result']
+        started = time.monotonic()
+        await tab.call(INSTALL_SAVE_PROBE_SCRIPT, SAVE_ERROR_XPATH, SAVE_SUCCESS_XPATH)
+        if not await tab.call(CLICK_SAVE_SCRIPT):
+            return {'outcome': 'error', 'message': "Save button not found", 'url': None}
+        try:
+            outcome = await tab.call_async(AWAIT_SAVE_PROBE_SCRIPT, int(budget * 1000), timeout=budget + 5)
+        except (DevToolsError, asyncio.TimeoutError):
+            # The document unloaded mid-wait - a full page redirect after the save
+            url = await tab.wait_for(LOADED_URL_SCRIPT, budget)
+            outcome = {'outcome': 'redirect' if url and 'copy' not in url else 'unknown', 'message': '', 'url': url}
+        self.metrics.observe('save_result', time.monotonic() - started, ok=outcome['outcome'] in ('success', 'redirect'),
+                             tab=tab.number)
+        return outcome
+
+    async def copy_episode(self, tab, source_id, payload):
+        """Copy ``source_id`` with the payload's fields and thumbnail in one tab
+
+        Returns a dict shaped like HttpEpisodeEngine.copy_episode: ``outcome`` (success,
+        error, unknown or missing), ``message``, ``elapsed_ms``, ``url``, ``upload`` and
+        ``created_id``.
+        """
+        started = time.monotonic()
+        state = await self.load_copy_page(tab, source_id)
+        if state == 'login':
+            raise SessionRejected(f"Redirected to login from {self.automation.copy_url(source_id)}")
+        if state == 'error':
+            return copy_outcome('missing', f"Episode {source_id} not found", started)
+        if state is None:
+            return copy_outcome('error', f"Copy page of episode {source_id} did not load", started)
+
+        filled = await tab.call(BULK_FILL_SCRIPT, bulk_fill_batch(payload.fields)) or {}
+        unfilled = [excel_col for excel_col in payload.fields if not filled.get(excel_col)]
+        if any(excel_col in REQUIRED_COLUMNS for excel_col in unfilled):
+            return copy_outcome('error', f"Could not fill {', '.join(unfilled)}", started)
+
+        upload = await self.upload_thumbnail(tab, payload.image_path) if payload.image_path else None
+        if upload is False:
+            print(f"⚠ Tab {tab.number}: image upload failed for episode {payload.episode_number}, but continuing...")
+
+        saved = await self.save(tab)
+        outcome = copy_outcome('success' if saved['outcome'] in ('success', 'redirect') else saved['outcome'],
+                                saved['message'] or saved['outcome'], started, saved['url'])
+        outcome['upload'] = upload
+        if outcome['outcome'] == 'success':
+            created_id = episode_id_from_url(saved['url'])
+            if not created_id or created_id == source_id:
+                page_id = await tab.call(CREATED_ID_SCRIPT)
+                created_id = int(page_id) if page_id and str(page_id).isdigit() else None
+            outcome['created_id'] = created_id if created_id != source_id else None
+        return outcome
+
+    async def copy_with_retry(self, tab, source_id, payload):
+        """Copy one row, starting over on a fresh copy page while the portal rejects the save
+
+        Nothing is retried once the DevTools connection is gone.
+        """
+        for attempt in itertools.count(1):
+            started = time.monotonic()
+            try:
+                outcome = await self.copy_episode(tab, source_id, payload)
+            except (DevToolsError, asyncio.TimeoutError) as e:
+                outcome = copy_outcome('unknown', f"DevTools: {e}", started)
+            delay = save_retry_delay(self.retry, attempt, source_id, outcome, tab=tab.number)
+            if delay is None or tab.connection.closed:
+                return outcome
+            await asyncio.sleep(delay)
+
+    async def _run(self, websocket_url, batch, payloads, row_count):
+        connection = await DevToolsConnection.connect(websocket_url)
+        try:
+            # Chained rows depend on each other, so they share one tab
+            tab_count = min(self.tabs, max(1, row_count)) if batch.template_id is not None else 1
+            tabs = [await connection.open_tab() for _ in range(tab_count)]
+            print(f"🗂 Opened {len(tabs)} tab(s) in the logged-in browser")
+            # Every tab takes the next row from the one stream, so the sheet is never read whole
+            loop = asyncio.get_running_loop()
+            payload_rows = iter(payloads)
+            taking = asyncio.Lock()
+
+            async def next_row():
+                async with taking:
+                    while not batch.stopped:
+                        # Waits while the prefetch thread parses the next chunk - off the loop so other tabs keep going
+                        payload = await loop.run_in_executor(None, next, payload_rows, None)
+                        if payload is None:
+                            return None
+                        source_id = batch.source_for(payload)
+                        if source_id is not None:
+                            return payload, source_id
+                    return None
+
+            async def worker(tab):
+                while (row := await next_row()) is not None:
+                    payload, source_id = row
+                    try:
+                        outcome = await self.copy_with_retry(tab, source_id, payload)
+                    except Exception:
+                        # e.g. redirected to login before the save - the row is left for a resume
+                        batch.stopped = True
+                        raise
+                    batch.finish(payload, source_id, outcome, tab=tab.number)
+                    if connection.closed:
+                        batch.stopped = True
+                        raise DevToolsError(f"DevTools connection closed while copying episode {source_id}")
+
+            # A rejected session or a lost connection stops every tab from taking new rows, but the
+            # rows already in flight are finished and journaled - they may have been saved
+            results = await asyncio.gather(*(worker(tab) for tab in tabs), return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        finally:
+            payloads.close()
+            await connection.close()
+
+    def process_episode_batch(self, excel_path, start_id=665, end_id=None, template_id=None, journal_path=None):
+        """Process the same Excel rows as EpisodeCopyAutomation.process_episode_batch in parallel tabs
+
+        The automation's browser logs in (if it has not yet) and preflights the ID range,
+        then the rows run on up to ``tabs`` tabs in template mode and on one tab when chaining.
+        With ``journal_path`` every row's outcome is journaled like the browser flow does.
+        """
+        workbook = Workbook(excel_path, EPISODE_SCHEMA)
+        report = workbook.validate(collect=('EpisodeNumber',))
+        if report.missing_columns:
+            raise ValueError(f"Missing required columns: {report.missing_columns}")
+        if report.errors:
+            report.print_summary()
+
+        first_source_id = start_id if template_id is None else template_id
+        if not self.automation.run_preflight(first_source_id, end_id if template_id is None else None):
+            return 0
+
+        if self.thumbnails:
+            self.thumbnails.start(
+                path for path in (self.image_index.lookup(n) for _, n in report.collected['EpisodeNumber']) if path
+            )
+        # Streamed and prepared on a background thread, a few rows ahead of the tabs
+        payloads = PayloadPrefetcher(workbook.records(), self.image_index)
+
+        journal = RunJournal(journal_path) if journal_path else None
+        if journal:
+            journal.start(excel_path=excel_path, start_id=start_id, end_id=end_id, template_id=template_id,
+                          row_positions=None)
+        batch = EpisodeBatch(start_id, end_id, template_id, self.metrics, journal)
+        started = time.monotonic()
+        try:
+            websocket_url = browser_websocket_url(self.automation.driver)
+            asyncio.run(self._run(websocket_url, batch, payloads, report.row_count))
+        except SessionRejected as e:
+            print(f"❌ Browser session rejected by the portal - log in again: {e}")
+        except (DevToolsError, asyncio.TimeoutError, OSError) as e:
+            print(f"❌ Lost the DevTools connection to the browser: {e or type(e).__name__}")
+        finally:
+            if self.thumbnails:
+                self.thumbnails.close()
+            if journal:
+                journal.close()
+
+        elapsed = time.monotonic() - started
+        print(f"🎉 TAB BATCH COMPLETED: {batch.success_count}/{report.row_count} episodes in {elapsed:.1f}s")
+        self.metrics.print_summary()
+        return batch.success_count
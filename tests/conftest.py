@@ -0,0 +1,44 @@
+import csv
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+# The scripts are plain modules in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_engine import HttpEpisodeEngine
+from retry_policy import RetryPolicy
+
+
+@pytest.fixture
+def batch_files(tmp_path):
+    """Return a writer of an episode sheet (EpisodeNumber, Title, ContentUrl rows) into tmp_path
+
+    Every whole EpisodeNumber also gets its "0 (n).jpg" thumbnail.
+    """
+    def write(rows):
+        with open(tmp_path / 'episodes.csv', 'w', newline='') as sheet_file:
+            writer = csv.writer(sheet_file)
+            writer.writerow(['EpisodeNumber', 'Title', 'ContentUrl'])
+            writer.writerows(rows)
+        for number, _, _ in rows:
+            if isinstance(number, int):
+                Image.new('RGB', (8, 8)).save(tmp_path / f'0 ({number}).jpg')
+        return str(tmp_path / 'episodes.csv')
+
+    return write
+
+
+@pytest.fixture
+def logged_in_engine(tmp_path):
+    """Return a factory of HTTP engines logged in to a StubPortal, retrying without waiting"""
+    def login(portal, save_attempts=3, **kwargs):
+        retry = RetryPolicy({'save': save_attempts}, sleep=lambda seconds: None)
+        engine = HttpEpisodeEngine(portal.url, images_folder=tmp_path, retry=retry, **kwargs)
+        engine.session.post(f"{portal.url}/login", data={'email': 'admin@gmail.com', 'password': '123456'})
+        engine.csrf_token = portal.sessions[engine.session.cookies['portal_session']]
+        return engine
+
+    return login
@@ -0,0 +1,249 @@
+import json
+
+import pytest
+import requests
+
+from http_engine import SessionRejected
+from stub_portal import StubPortal
+
+ROWS = [(n, f"Episode {n}", f"https://example.com/episodes/{n}") for n in range(1, 6)]
+
+
+def journal_rows(path):
+    with open(path, encoding='utf-8') as journal_file:
+        entries = [json.loads(line) for line in journal_file]
+    return [entry for entry in entries if entry['event'] == 'row']
+
+
+def test_chained_rows_copy_the_episode_the_previous_row_created(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal, workers=2)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, journal_path=str(journal_path))
+
+        assert saved == 5
+        assert sorted(portal.episodes) == [665, 666, 667, 668, 669, 670]
+        assert [portal.episodes[666 + i]['title'] for i in range(5)] == [title for _, title, _ in ROWS]
+        assert all(portal.episodes[episode_id]['thumbnail_url'].startswith('/uploads/')
+                   for episode_id in range(666, 671))
+    rows = journal_rows(journal_path)
+    assert [(row['source_id'], row['created_id'], row['outcome']) for row in rows] == [
+        (665, 666, 'saved'), (666, 667, 'saved'), (667, 668, 'saved'), (668, 669, 'saved'), (669, 670, 'saved'),
+    ]
+
+
+def test_chain_stops_at_end_id(batch_files, logged_in_engine):
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, end_id=667)
+
+        assert saved == 3
+        assert sorted(portal.episodes) == [665, 666, 667, 668]
+
+
+def test_template_mode_copies_every_row_from_the_template(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal(latency=0.01) as portal:
+        engine = logged_in_engine(portal, workers=3)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), template_id=665, journal_path=str(journal_path))
+
+        assert saved == 5
+        assert len(portal.episodes) == 6
+        assert sorted(episode['title'] for episode_id, episode in portal.episodes.items() if episode_id != 665) \
+            == sorted(title for _, title, _ in ROWS)
+    rows = journal_rows(journal_path)
+    assert sorted(row['excel_row'] for row in rows) == [1, 2, 3, 4, 5]
+    assert {row['source_id'] for row in rows} == {665}
+
+
+def test_missing_start_episode_copies_nothing(batch_files, logged_in_engine):
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+
+        assert engine.process_episode_batch(batch_files(ROWS), start_id=900) == 0
+        assert sorted(portal.episodes) == [665]
+
+
+def test_failed_uploads_still_save_the_episodes(batch_files, logged_in_engine, capsys):
+    with StubPortal(upload_failure_rate=1.0) as portal:
+        engine = logged_in_engine(portal)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665)
+
+        assert saved == 5
+        assert not any(portal.episodes[episode_id]['thumbnail_url'] for episode_id in range(666, 671))
+    assert capsys.readouterr().out.count("Image upload failed") == 5
+
+
+@pytest.mark.parametrize('template_id', [None, 665])
+def test_rejected_saves_are_retried(batch_files, logged_in_engine, template_id):
+    with StubPortal(save_failure_rate=0.4, seed=7) as portal:
+        engine = logged_in_engine(portal, save_attempts=10)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, template_id=template_id)
+
+        assert saved == 5
+        assert len(portal.episodes) == 6
+        assert engine.retry.retries['save'] > 0
+
+
+@pytest.mark.parametrize('template_id', [None, 665])
+def test_rows_that_keep_failing_do_not_stop_the_batch(tmp_path, batch_files, logged_in_engine, template_id):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal(save_failure_rate=1.0) as portal:
+        engine = logged_in_engine(portal, save_attempts=2)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, template_id=template_id,
+                                             journal_path=str(journal_path))
+
+        assert saved == 0
+        assert sorted(portal.episodes) == [665]
+        assert engine.retry.retries['save'] == 5
+    rows = journal_rows(journal_path)
+    assert [row['outcome'] for row in rows] == ['failed'] * 5
+    # Nothing was created, so every chained row copies the start episode again
+    assert {row['source_id'] for row in rows} == {665}
+
+
+def test_network_error_only_fails_that_attempt(batch_files, logged_in_engine):
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+        get = engine.session.get
+        calls = []
+
+        def flaky_get(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 3:
+                raise requests.ConnectionError("connection reset")
+            return get(url, **kwargs)
+
+        engine.session.get = flaky_get
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665)
+
+        assert saved == 5
+        assert sorted(portal.episodes) == [665, 666, 667, 668, 669, 670]
+        assert engine.retry.retries['save'] == 1
+
+
+def lose_first_save_response(engine):
+    """Let the first save reach the portal but raise as if its response was lost"""
+    post = engine.session.post
+    saves = []
+
+    def post_then_time_out(url, **kwargs):
+        response = post(url, **kwargs)
+        if '/copy/' in url:
+            saves.append(url)
+            if len(saves) == 1:
+                raise requests.ReadTimeout("read timed out")
+        return response
+
+    engine.session.post = post_then_time_out
+
+
+def test_lost_save_response_is_not_retried(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+        lose_first_save_response(engine)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, journal_path=str(journal_path))
+
+        # The save went through once; the chain stops as the next source is not known
+        assert saved == 0
+        assert sorted(portal.episodes) == [665, 666]
+        assert portal.episodes[666]['title'] == "Episode 1"
+        assert engine.retry.retries.get('save', 0) == 0
+    assert [(row['excel_row'], row['outcome']) for row in journal_rows(journal_path)] == [(1, 'unknown')]
+
+
+def test_lost_save_response_in_template_mode_keeps_the_other_rows_going(batch_files, logged_in_engine):
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal, workers=2)
+        lose_first_save_response(engine)
+
+        saved = engine.process_episode_batch(batch_files(ROWS), template_id=665)
+
+        assert saved == 4
+        titles = [episode['title'] for episode_id, episode in portal.episodes.items() if episode_id != 665]
+        assert sorted(titles) == sorted(title for _, title, _ in ROWS)
+
+
+def test_invalid_rows_are_skipped(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    rows = [ROWS[0], (2.5, "Half episode", "https://example.com/episodes/2"), ROWS[2], ROWS[2],
+            (4, "Bad link", "not a url")]
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+
+        saved = engine.process_episode_batch(batch_files(rows), start_id=665, journal_path=str(journal_path))
+
+        assert saved == 2
+        assert [portal.episodes[episode_id]['title'] for episode_id in (666, 667)] == ["Episode 1", "Episode 3"]
+    assert [(row['excel_row'], row['outcome']) for row in journal_rows(journal_path)] == [
+        (1, 'saved'), (2, 'skipped'), (3, 'saved'), (4, 'skipped'), (5, 'skipped'),
+    ]
+
+
+def test_rejected_session_ends_the_batch(batch_files, logged_in_engine):
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+        copy_episode = engine.copy_episode
+
+        def copy_then_log_out(source_id, payload):
+            outcome = copy_episode(source_id, payload)
+            portal.sessions.clear()
+            return outcome
+
+        engine.copy_episode = copy_then_log_out
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665)
+
+        assert saved == 1
+        assert sorted(portal.episodes) == [665, 666]
+
+
+def test_rows_in_flight_are_finished_when_the_session_is_rejected(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal(latency=0.05) as portal:
+        engine = logged_in_engine(portal, workers=3)
+        copy_episode = engine.copy_episode
+
+        def reject_first_row(source_id, payload):
+            if payload.row_index == 0:
+                raise SessionRejected("Redirected to login")
+            return copy_episode(source_id, payload)
+
+        engine.copy_episode = reject_first_row
+        saved = engine.process_episode_batch(batch_files(ROWS), template_id=665, journal_path=str(journal_path))
+
+        created = len(portal.episodes) - 1
+    rows = journal_rows(journal_path)
+    # Every copy that reached the portal is counted and journaled, the rejected row is left for a resume
+    assert created > 0
+    assert saved == created
+    assert sorted(row['excel_row'] for row in rows if row['outcome'] == 'saved') == list(range(2, created + 2))
+    assert 1 not in {row['excel_row'] for row in rows}
+
+def test_chain_stops_when_the_created_id_cannot_be_read(tmp_path, batch_files, logged_in_engine):
+    journal_path = tmp_path / 'journal.jsonl'
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+        copy_episode = engine.copy_episode
+
+        def copy_without_id(source_id, payload):
+            outcome = copy_episode(source_id, payload)
+            if payload.row_index == 1:
+                outcome['created_id'] = None
+            return outcome
+
+        engine.copy_episode = copy_without_id
+        saved = engine.process_episode_batch(batch_files(ROWS), start_id=665, journal_path=str(journal_path))
+
+        assert saved == 2
+        assert sorted(portal.episodes) == [665, 666, 667]
+    assert [(row['created_id'], row['outcome'], row['message']) for row in journal_rows(journal_path)] == [
+        (666, 'saved', ''), (None, 'saved', "created ID not found - chain stopped"),
+    ]
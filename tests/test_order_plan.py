@@ -0,0 +1,111 @@
+import pandas as pd
+
+from order_plan import ORDER_COLUMNS, orders_to_submit, plan_orders
+
+
+def sheet(*rows):
+    """Orders as Workbook.load() returns them for ORDER_SCHEMA (index = row_index)"""
+    return pd.DataFrame(list(rows), columns=ORDER_COLUMNS, dtype=object)
+
+
+def market(stock, action, quantity, duration='Day Only'):
+    return [stock, action, quantity, 'Market', None, duration]
+
+
+def limit(stock, action, quantity, price, duration='Day Only'):
+    return [stock, action, quantity, 'Limit', price, duration]
+
+
+def planned(plan):
+    return [(order['Stock'], order['Action'], order['Quantity'], order['rows'], order['note'])
+            for order in plan.to_dict('records')]
+
+
+def test_market_buy_and_sell_of_a_stock_are_netted():
+    plan = plan_orders(sheet(market('AAPL', 'Buy', 100), market('aapl ', 'Sell', 30)))
+
+    assert planned(plan) == [('AAPL', 'Buy', 70, [1, 2], 'netted')]
+
+
+def test_market_sell_larger_than_the_buys_becomes_a_sell():
+    plan = plan_orders(sheet(market('AAPL', 'Buy', 20), market('AAPL', 'Buy', 10), market('AAPL', 'Sell', 45)))
+
+    assert planned(plan) == [('AAPL', 'Sell', 15, [1, 2, 3], 'netted')]
+
+
+def test_same_side_market_orders_are_combined():
+    plan = plan_orders(sheet(market('AAPL', 'Buy', 20), market('AAPL', 'Buy', 5)))
+
+    assert planned(plan) == [('AAPL', 'Buy', 25, [1, 2], 'combined')]
+
+
+def test_short_sale_is_netted_against_a_cover_not_against_a_sell():
+    plan = plan_orders(sheet(
+        market('TSLA', 'Sell Short', 50),
+        market('TSLA', 'Buy to Cover', 20),
+        market('TSLA', 'Buy', 10),
+    ))
+
+    assert planned(plan) == [
+        ('TSLA', 'Sell Short', 30, [1, 2], 'netted'),
+        ('TSLA', 'Buy', 10, [3], ''),
+    ]
+
+
+def test_group_netting_to_zero_is_planned_but_not_submitted():
+    plan = plan_orders(sheet(market('GE', 'Buy', 10), market('MSFT', 'Buy', 3), market('GE', 'Sell', 10)))
+
+    assert planned(plan) == [
+        ('GE', 'Sell', 0, [1, 3], 'netted out'),
+        ('MSFT', 'Buy', 3, [2], ''),
+    ]
+    assert [order['Stock'] for order in orders_to_submit(plan)] == ['MSFT']
+
+
+def test_market_orders_of_different_durations_are_not_netted():
+    plan = plan_orders(sheet(market('AAPL', 'Buy', 10, 'Day Only'), market('AAPL', 'Sell', 10, 'Good Til Canceled')))
+
+    assert planned(plan) == [('AAPL', 'Buy', 10, [1], ''), ('AAPL', 'Sell', 10, [2], '')]
+
+
+def test_limit_orders_are_only_summed_per_action_and_price():
+    plan = plan_orders(sheet(
+        limit('MSFT', 'Buy', 5, 10.5),
+        limit('MSFT', 'Sell', 7, 10.5),
+        limit('MSFT', 'Buy', 7, 10.5),
+        limit('MSFT', 'Buy', 4, 11),
+    ))
+
+    assert planned(plan) == [
+        ('MSFT', 'Buy', 12, [1, 3], 'combined'),
+        ('MSFT', 'Sell', 7, [2], ''),
+        ('MSFT', 'Buy', 4, [4], ''),
+    ]
+    assert orders_to_submit(plan)[0]['Price'] == 10.5
+
+
+def test_netting_off_keeps_every_row_as_it_is():
+    plan = plan_orders(sheet(market('AAPL', 'Buy', 100), market('aapl', 'Sell', 30), market('AAPL', 'Buy', 5)),
+                       netting=False)
+
+    assert planned(plan) == [
+        ('AAPL', 'Buy', 100, [1], ''),
+        ('AAPL', 'Sell', 30, [2], ''),
+        ('AAPL', 'Buy', 5, [3], ''),
+    ]
+
+
+def test_orders_to_submit_uses_the_sheet_headers():
+    orders = orders_to_submit(plan_orders(sheet(limit('MSFT', 'Buy', 5, 10.5))))
+
+    assert orders == [{'Stock': 'MSFT', 'Action': 'Buy', 'Quantity': 5, 'Order Type': 'Limit', 'Price': 10.5,
+                       'Duration': 'Day Only'}]
+
+
+def test_empty_sheet_plans_nothing():
+    for netting in (True, False):
+        plan = plan_orders(sheet(), netting=netting)
+
+        assert plan.empty
+        assert list(plan.columns) == ORDER_COLUMNS + ['rows', 'note']
+        assert orders_to_submit(plan) == []
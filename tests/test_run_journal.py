@@ -0,0 +1,187 @@
+import time
+
+import pytest
+
+from downloader2 import EpisodeCopyAutomation
+from episode_batch import copy_outcome
+from locator_cache import LocatorResolver
+from run_journal import RunJournal
+from run_metrics import RunMetrics
+from stub_portal import StubPortal
+
+ROWS = [
+    (1, "Episode 1", "https://example.com/episodes/1"),
+    (2.5, "Half episode", "https://example.com/episodes/2"),
+    (3, "Episode 3", "https://example.com/episodes/3"),
+    (4, "Episode 4", "https://example.com/episodes/4"),
+    (5, "Episode 5", "https://example.com/episodes/5"),
+]
+
+
+class Crash(BaseException):
+    """Ends a run the way a killed process would, past the batch's own error handling"""
+
+
+def journal_with(path, *rows, **settings):
+    journal = RunJournal(path)
+    journal.start(**dict({'excel_path': 'episodes.csv', 'start_id': 665, 'end_id': None, 'template_id': None,
+                          'row_positions': None}, **settings))
+    for row in rows:
+        journal.record(*row)
+    journal.close()
+    return journal
+
+
+def browserless_automation(engine, copy_row=None):
+    """EpisodeCopyAutomation without Chrome, copying each row over HTTP with ``engine``
+
+    ``copy_row(source_id, payload)`` replaces the copy of some rows (None copies them).
+    """
+    automation = object.__new__(EpisodeCopyAutomation)
+    automation.metrics = RunMetrics()
+    automation.retry = engine.retry
+    automation.locators = LocatorResolver()
+    automation.images_folder = engine.images_folder
+    automation.image_index = engine.image_index
+    automation.thumbnails = None
+    automation.row_delay = 0
+    automation.preflight_id_range = engine.preflight
+
+    def copy(source_id, payload, total_rows, allow_listing=True):
+        outcome = copy_row(source_id, payload) if copy_row else None
+        return outcome or engine.copy_with_retry(source_id, payload)
+
+    automation.copy_row = copy
+    return automation
+
+
+def test_nothing_to_resume_without_a_journal(tmp_path):
+    assert RunJournal(tmp_path / 'journal.jsonl').resume_state() is None
+
+
+def test_resume_state_of_a_chained_run(tmp_path):
+    journal = journal_with(
+        tmp_path / 'journal.jsonl',
+        (1, 665, 666, 'saved'),
+        (2, None, None, 'skipped', None, "EpisodeNumber not a valid int"),
+        (3, 666, None, 'failed', None, "HTTP 500"),
+        (4, 666, 667, 'saved'),
+        (5, 667, None, 'failed', None, "HTTP 500"),
+    )
+
+    state = journal.resume_state()
+
+    assert state['settings']['start_id'] == 665
+    assert state['finished_rows'] == {1, 2, 4}
+    assert state['chain_source_id'] == 667
+
+
+def test_only_the_latest_run_is_resumed(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal_with(path, (1, 665, 666, 'saved'), (2, 666, 667, 'saved'))
+    journal = journal_with(path, (1, 900, 901, 'saved'), start_id=900)
+
+    state = journal.resume_state()
+
+    assert state['settings']['start_id'] == 900
+    assert state['finished_rows'] == {1}
+    assert state['chain_source_id'] == 901
+
+
+@pytest.mark.parametrize('last_row', [(2, 666, None, 'saved', None, "created ID not found - chain stopped"),
+                                      (2, 666, None, 'unknown', None, "No answer to the save")])
+def test_chain_without_a_known_created_id_has_no_source(tmp_path, last_row):
+    journal = journal_with(tmp_path / 'journal.jsonl', (1, 665, 666, 'saved'), last_row)
+
+    state = journal.resume_state()
+
+    # Neither row is redone - the second may exist in the portal - but the chain cannot go on by itself
+    assert state['finished_rows'] == {1, 2}
+    assert state['chain_source_id'] is None
+
+
+def test_torn_last_line_is_ignored_and_the_next_entry_starts_on_its_own_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal_with(path, (1, 665, 666, 'saved'))
+    with open(path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"event": "row", "excel_row": 2, "source_id": 666, "crea')
+
+    journal = RunJournal(path)
+    assert journal.resume_state()['finished_rows'] == {1}
+
+    journal.record(2, 666, 667, 'saved')
+    journal.close()
+    state = journal.resume_state()
+    assert state['finished_rows'] == {1, 2}
+    assert state['chain_source_id'] == 667
+
+
+def test_resume_redoes_only_unfinished_rows_and_continues_the_chain(tmp_path, batch_files, logged_in_engine):
+    excel_path = batch_files(ROWS)
+    journal_path = str(tmp_path / 'journal.jsonl')
+
+    def fail_then_crash(source_id, payload):
+        if payload.row_index == 3:
+            return copy_outcome('error', "HTTP 500", time.monotonic())
+        if payload.row_index == 4:
+            raise Crash()
+        return None
+
+    with StubPortal() as portal:
+        automation = browserless_automation(logged_in_engine(portal), fail_then_crash)
+        with pytest.raises(Crash):
+            automation.process_episode_batch(excel_path, start_id=665, journal_path=journal_path)
+        # The crash also tore the entry being written
+        with open(journal_path, 'a', encoding='utf-8') as journal_file:
+            journal_file.write('{"event": "row", "excel_row": 5, "sour')
+        assert sorted(portal.episodes) == [665, 666, 667]
+
+        automation = browserless_automation(logged_in_engine(portal))
+        saved = automation.process_episode_batch(excel_path, start_id=665, journal_path=journal_path, resume=True)
+
+        assert saved == 2
+        assert [portal.episodes[episode_id]['title'] for episode_id in (666, 667, 668, 669)] == [
+            "Episode 1", "Episode 3", "Episode 4", "Episode 5",
+        ]
+    _, rows = RunJournal(journal_path).read_last_run()
+    assert [(row['excel_row'], row['source_id'], row['created_id'], row['outcome']) for row in rows] == [
+        (1, 665, 666, 'saved'),
+        (2, None, None, 'skipped'),
+        (3, 666, 667, 'saved'),
+        (4, 667, None, 'failed'),
+        # Resumed: the failed row is copied again from the last created episode, the skipped row is not redone
+        (4, 667, 668, 'saved'),
+        (5, 668, 669, 'saved'),
+    ]
+
+
+def test_resume_of_a_stopped_chain_needs_the_missing_id_as_start_id(tmp_path, batch_files, logged_in_engine):
+    excel_path = batch_files(ROWS)
+    journal_path = str(tmp_path / 'journal.jsonl')
+
+    def lose_the_id_of_row_3(source_id, payload):
+        if payload.row_index == 2:
+            outcome = engine.copy_with_retry(source_id, payload)
+            outcome['created_id'] = None
+            return outcome
+        return None
+
+    with StubPortal() as portal:
+        engine = logged_in_engine(portal)
+        automation = browserless_automation(engine, lose_the_id_of_row_3)
+        assert automation.process_episode_batch(excel_path, start_id=665, journal_path=journal_path) == 2
+        assert sorted(portal.episodes) == [665, 666, 667]
+
+        automation = browserless_automation(logged_in_engine(portal))
+        assert automation.process_episode_batch(excel_path, start_id=665, journal_path=journal_path,
+                                                resume=True) == 0
+        assert sorted(portal.episodes) == [665, 666, 667]
+
+        saved = automation.process_episode_batch(excel_path, start_id=667, journal_path=journal_path, resume=True)
+
+        assert saved == 2
+        assert [portal.episodes[episode_id]['title'] for episode_id in (668, 669)] == ["Episode 4", "Episode 5"]
+    _, rows = RunJournal(journal_path).read_last_run()
+    assert [(row['excel_row'], row['source_id'], row['created_id']) for row in rows[-2:]] == [
+        (4, 667, 668), (5, 668, 669),
+    ]
@@ -0,0 +1,102 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from atomic_file import atomic_write
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional - without it thumbnails are uploaded unchanged
+    Image = None
+
+DEFAULT_MAX_SIZE = (1280, 720)
+DEFAULT_FORMAT = 'JPEG'
+DEFAULT_QUALITY = 85
+FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}
+
+
+def file_digest(path, extra=b''):
+    """SHA-256 of the file contents (plus any extra bytes, e.g. the conversion settings)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as image_file:
+        for chunk in iter(lambda: image_file.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(extra)
+    return digest.hexdigest()
+
+
+def prepare_thumbnail(source_path, cache_dir, max_size=DEFAULT_MAX_SIZE, image_format=DEFAULT_FORMAT,
+                      quality=DEFAULT_QUALITY):
+    """Resize and recompress one image into the cache and return the prepared file's path
+
+    The cache key is the hash of the source bytes and the settings, so re-runs and
+    renamed copies of the same image are never processed twice.
+    """
+    settings = f"{max_size[0]}x{max_size[1]}|{image_format}|{quality}".encode()
+    extension = FORMAT_EXTENSIONS.get(image_format, f".{image_format.lower()}")
+    target = os.path.join(cache_dir, file_digest(source_path, settings)[:32] + extension)
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+    resample = getattr(Image, 'Resampling', Image).LANCZOS
+    with Image.open(source_path) as image, atomic_write(target, 'wb') as target_file:
+        image.thumbnail(max_size, resample)
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(target_file, format=image_format, quality=quality, optimize=True)
+    return target
+
+
+class ThumbnailPreparer:
+    """Prepares thumbnails in a process pool ahead of the browser needing them"""
+
+    def __init__(self, cache_dir='.thumbnail_cache', workers=None, max_size=DEFAULT_MAX_SIZE,
+                 image_format=DEFAULT_FORMAT, quality=DEFAULT_QUALITY):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.workers = workers
+        self.settings = {'max_size': max_size, 'image_format': image_format, 'quality': quality}
+        self._pool = None
+        self._futures = {}
+
+    @property
+    def available(self):
+        return Image is not None
+
+    def submit(self, image_path):
+        """Queue one image for preparation (no-op if it is already queued)"""
+        if not self.available or not image_path or image_path in self._futures:
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._futures[image_path] = self._pool.submit(
+            prepare_thumbnail, image_path, self.cache_dir, **self.settings
+        )
+
+    def start(self, image_paths):
+        """Queue every image of the batch"""
+        if not self.available:
+            print("⚠ Pillow is not installed - thumbnails will be uploaded without preprocessing")
+            return
+        for image_path in image_paths:
+            self.submit(image_path)
+        print(f"🖼 Preparing {len(self._futures)} thumbnails in the background")
+
+    def prepared_path(self, image_path):
+        """Return the prepared file for the image, falling back to the original on any failure"""
+        if not self.available:
+            return image_path
+        self.submit(image_path)
+        try:
+            return self._futures[image_path].result()
+        except Exception as e:
+            print(f"⚠ Could not prepare {os.path.basename(image_path)}, uploading original: {e}")
+            return image_path
+
+    def close(self):
+        for future in self._futures.values():
+            future.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self._futures = {}
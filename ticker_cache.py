@@ -0,0 +1,73 @@
+import json
+import os
+
+from atomic_file import atomic_write
+
+
+class TickerCache:
+    """Remembers which typeahead option each stock symbol resolved to, across runs
+
+    Entries map the upper-case symbol to the chosen option's ``text`` and ``index``.
+    A lookup is a hit when the cached option was picked again, stale when it was not
+    offered anymore (the full scan picked another one) and a miss when the symbol
+    was not cached yet.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as cache_file:
+                self.entries = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable ticker cache {self.path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the cache, returns False if it could not be written"""
+        if not self.path:
+            return False
+        try:
+            with atomic_write(self.path) as cache_file:
+                json.dump(self.entries, cache_file, indent=2, sort_keys=True)
+            return True
+        except OSError as e:
+            print(f"Could not save ticker cache: {e}")
+            return False
+
+    def get(self, symbol):
+        """Cached option (``text`` and ``index``) for the symbol, or None"""
+        return self.entries.get(str(symbol).strip().upper())
+
+    def record(self, symbol, option, cached_used):
+        """Count one resolution of ``symbol`` to ``option`` (None: nothing matched)
+
+        ``cached_used`` tells whether the cached option was the one picked.
+        """
+        key = str(symbol).strip().upper()
+        if key not in self.entries:
+            self.misses += 1
+        elif cached_used:
+            self.hits += 1
+        else:
+            self.stale += 1
+        if option is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = {'text': option['text'], 'index': option['index']}
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses + self.stale
+        return self.hits / lookups if lookups else 0.0
+
+    def print_summary(self):
+        print(f"Ticker cache: {self.hits} hits, {self.misses} misses, {self.stale} stale "
+              f"({self.hit_rate():.0%} hit rate), {len(self.entries)} symbols cached")
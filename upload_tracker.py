@@ -0,0 +1,112 @@
+import json
+import time
+
+# Chrome has to be started with these for the tracker to see network events
+PERFORMANCE_LOGGING_PREFS = {'performance': 'ALL'}
+PERF_LOGGING_OPTIONS = {'enableNetwork': True, 'enablePage': False}
+
+UPLOAD_METHODS = ('POST', 'PUT')
+UPLOAD_RESOURCE_TYPES = ('XHR', 'Fetch')
+
+
+def enable_network_events(options):
+    """Turn on Chrome's performance log (DevTools Network events) in ChromeOptions"""
+    options.set_capability('goog:loggingPrefs', PERFORMANCE_LOGGING_PREFS)
+    options.add_experimental_option('perfLoggingPrefs', PERF_LOGGING_OPTIONS)
+    return options
+
+
+class UploadTracker:
+    """Follows XHR/fetch uploads through the browser's DevTools Network events
+
+    Call ``mark()`` right before choosing the file so older traffic is ignored,
+    then ``wait()`` for the upload request to finish.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+
+    def _events(self):
+        """Drain the performance log and yield (method, params) of its Network events"""
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            # Performance logging was not enabled for this browser
+            self.available = False
+            return
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            if message.get('method', '').startswith('Network.'):
+                yield message['method'], message.get('params', {})
+
+    def mark(self):
+        """Forget every network event seen so far"""
+        for _ in self._events():
+            pass
+
+    def wait(self, request_budget, finish_budget, file_size=None, poll=0.1):
+        """Wait for the upload request(s) started after ``mark()`` to finish
+
+        Returns a dict with ``status``:
+        ok       every upload request finished with a 2xx response
+        failed   an upload request failed or got a non-2xx response
+        stalled  an upload started but did not finish within ``finish_budget``
+        none     no upload request was sent within ``request_budget``
+        plus ``http_status``, ``bytes`` (the file size sent), ``response_bytes``,
+        ``duration_ms`` and ``url`` of the last upload request.
+        """
+        requests = {}
+        started = time.monotonic()
+        result = {'status': 'none', 'http_status': None, 'bytes': file_size, 'response_bytes': None,
+                  'duration_ms': None, 'url': None}
+
+        while True:
+            for method, params in self._events():
+                request_id = params.get('requestId')
+                if method == 'Network.requestWillBeSent':
+                    request = params.get('request', {})
+                    if request.get('method') in UPLOAD_METHODS and params.get('type') in UPLOAD_RESOURCE_TYPES:
+                        requests[request_id] = {'url': request.get('url'), 'sent': params.get('timestamp'),
+                                                'status': None, 'done': False, 'error': None}
+                elif request_id in requests:
+                    tracked = requests[request_id]
+                    if method == 'Network.responseReceived':
+                        tracked['status'] = params.get('response', {}).get('status')
+                    elif method == 'Network.loadingFinished':
+                        tracked['done'] = True
+                        tracked['response_bytes'] = params.get('encodedDataLength')
+                        tracked['finished'] = params.get('timestamp')
+                    elif method == 'Network.loadingFailed':
+                        tracked['done'] = True
+                        tracked['error'] = params.get('errorText') or 'failed'
+                        tracked['finished'] = params.get('timestamp')
+
+            if not self.available:
+                result['status'] = 'unavailable'
+                return result
+
+            elapsed = time.monotonic() - started
+            if requests:
+                last = list(requests.values())[-1]
+                result['url'] = last['url']
+                result['http_status'] = last['status']
+                if all(tracked['done'] for tracked in requests.values()):
+                    result['response_bytes'] = last.get('response_bytes')
+                    if last.get('finished') and last['sent']:
+                        result['duration_ms'] = round((last['finished'] - last['sent']) * 1000)
+                    failed = [tracked for tracked in requests.values()
+                              if tracked['error'] or not (tracked['status'] and 200 <= tracked['status'] < 300)]
+                    result['status'] = 'failed' if failed else 'ok'
+                    if failed:
+                        result['error'] = failed[-1]['error'] or f"HTTP {failed[-1]['status']}"
+                    return result
+                if elapsed > request_budget + finish_budget:
+                    result['status'] = 'stalled'
+                    return result
+            elif elapsed > request_budget:
+                return result
+            time.sleep(poll)
@@ -0,0 +1,290 @@
+import csv
+import os
+import re
+from collections import namedtuple
+
+import pandas as pd
+
+# Rows are validated and converted this many at a time, so memory stays flat on huge sheets
+DEFAULT_CHUNK_SIZE = 2000
+
+# What a 'url' column value has to look like before it is worth a page load
+URL_PATTERN = r'^https?://[^\s/?#]+\.[^\s/?#]+(?:[/?#]\S*)?$'
+
+
+class Column:
+    """One expected workbook column: its header, value type (int, float, str, url or date) and whether it is required
+
+    In a ``unique`` column a value repeated further down the sheet is invalid; the first row keeps it.
+    """
+
+    def __init__(self, name, kind='str', required=False, unique=False):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.unique = unique
+        self.attr = re.sub(r'\W+|(?<=[a-z0-9])(?=[A-Z])', '_', name).strip('_').lower()
+
+
+class Schema:
+    """The columns a workbook must provide, plus the lightweight record type its rows become"""
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns
+        lookup = {column.name: position for position, column in enumerate(columns)}
+
+        class Record(namedtuple(name, [column.attr for column in columns])):
+            __slots__ = ()
+
+            def get(self, column, default=None):
+                """Value by workbook header, like ``pandas.Series.get``"""
+                position = lookup.get(column)
+                return default if position is None else self[position]
+
+        Record.__name__ = Record.__qualname__ = name
+        self.record = Record
+
+    @property
+    def required(self):
+        return [column.name for column in self.columns if column.required]
+
+
+EPISODE_SCHEMA = Schema('EpisodeRecord', [
+    Column('EpisodeNumber', 'int', required=True, unique=True),
+    Column('Title', required=True),
+    Column('ContentUrl', 'url', required=True),
+    Column('Subtitle'),
+    Column('Duration'),
+    Column('ReleaseDate', 'date'),
+])
+
+ORDER_SCHEMA = Schema('OrderRecord', [
+    Column('Stock', required=True),
+    Column('Action', required=True),
+    Column('Quantity', 'int', required=True),
+    Column('Order Type', required=True),
+    Column('Price'),
+    Column('Duration', required=True),
+])
+
+
+class ValidationReport:
+    """Result of validating a whole workbook against a schema"""
+
+    def __init__(self, path):
+        self.path = path
+        self.row_count = 0
+        self.missing_columns = []
+        self.errors = []
+        self.collected = {}
+
+    @property
+    def ok(self):
+        return not self.missing_columns and not self.errors
+
+    @property
+    def error_rows(self):
+        return {excel_row for excel_row, _, _ in self.errors}
+
+    def print_summary(self, limit=20):
+        print(f"📋 {os.path.basename(self.path)}: {self.row_count} rows, "
+              f"{len(self.error_rows)} with problems")
+        if self.missing_columns:
+            print(f"❌ Missing required columns: {self.missing_columns}")
+        for excel_row, column, message in self.errors[:limit]:
+            print(f"   ⚠ Row {excel_row} {column}: {message}")
+        if len(self.errors) > limit:
+            print(f"   ... and {len(self.errors) - limit} more")
+
+
+def _xlsx_rows(path, sheet_name):
+    import openpyxl
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _csv_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as csv_file:
+        yield from csv.reader(csv_file)
+
+
+def _parquet_rows(path):
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    header = parquet_file.schema_arrow.names
+    yield header
+    for batch in parquet_file.iter_batches(batch_size=DEFAULT_CHUNK_SIZE):
+        for row in batch.to_pylist():
+            yield tuple(row[name] for name in header)
+
+
+def open_rows(path, sheet_name=None):
+    """Return (header, row iterator) for an .xlsx, .csv or .parquet file without loading it whole"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        rows = _xlsx_rows(path, sheet_name)
+    elif extension == '.csv':
+        rows = _csv_rows(path)
+    elif extension == '.parquet':
+        rows = _parquet_rows(path)
+    else:
+        raise ValueError(f"Unsupported workbook format: {path}")
+
+    header = next(rows, None) or []
+    return [str(name).strip() if name is not None else '' for name in header], rows
+
+
+class Workbook:
+    """Streams a workbook's rows as typed records after validating every row in one vectorized pass"""
+
+    def __init__(self, path, schema, sheet_name=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.schema = schema
+        self.sheet_name = sheet_name
+        self.chunk_size = chunk_size
+
+    def _chunks(self):
+        """Yield DataFrames of up to ``chunk_size`` rows holding just the schema's columns"""
+        header, rows = open_rows(self.path, self.sheet_name)
+        positions = {name: position for position, name in enumerate(header) if name}
+        columns = [column.name for column in self.schema.columns if column.name in positions]
+
+        chunk, index = [], []
+        for row_index, values in enumerate(rows):
+            # Fully blank rows are skipped but still counted so row numbers match the sheet
+            if all(value is None or str(value).strip() == '' for value in values):
+                continue
+            chunk.append([values[positions[name]] if positions[name] < len(values) else None for name in columns])
+            index.append(row_index)
+            if len(chunk) >= self.chunk_size:
+                yield header, pd.DataFrame(chunk, columns=columns, index=index, dtype=object)
+                chunk, index = [], []
+        if chunk or not index:
+            yield header, pd.DataFrame(chunk, columns=columns, index=index, dtype=object)
+
+    def _coerce(self, frame, seen):
+        """Convert one chunk to typed column lists and collect (row, column, message) problems
+
+        ``seen`` maps each unique column to the first row of every value met so far, and
+        is shared by all chunks of one pass over the file.
+        """
+        errors = []
+        typed = []
+        for column in self.schema.columns:
+            if column.name not in frame:
+                typed.append([None] * len(frame))
+                continue
+
+            raw = frame[column.name]
+            blank = raw.isna() | (raw.astype(str).str.strip() == '')
+            values = raw.where(~blank, None).to_numpy(dtype=object)
+
+            if column.kind in ('int', 'float'):
+                numeric = pd.to_numeric(raw.where(~blank), errors='coerce')
+                # True/False would otherwise pass as 1/0
+                bad = ~blank & (numeric.isna() | raw.map(lambda value: isinstance(value, bool)))
+                if column.kind == 'int':
+                    bad |= ~blank & numeric.notna() & (numeric % 1 != 0)
+                good = (~blank & ~bad).to_numpy()
+                converted = numeric[good].astype('int64' if column.kind == 'int' else 'float64')
+                values[good] = converted.to_numpy().astype(object)
+            elif column.kind == 'date':
+                dates = pd.to_datetime(raw.where(~blank), errors='coerce')
+                bad = ~blank & dates.isna()
+                good = (~blank & ~bad).to_numpy()
+                values[good] = dates[good].to_numpy(dtype=object)
+            elif column.kind == 'url':
+                bad = ~blank & ~raw.astype(str).str.strip().str.match(URL_PATTERN)
+                good = (~blank & ~bad).to_numpy()
+            else:
+                bad = pd.Series(False, index=raw.index)
+                good = (~blank).to_numpy()
+
+            for row_index in raw.index[bad.to_numpy()]:
+                errors.append((row_index + 1, column.name, f"not a valid {column.kind}: {raw[row_index]!r}"))
+            if column.required:
+                for row_index in raw.index[blank.to_numpy()]:
+                    errors.append((row_index + 1, column.name, "missing value"))
+            if column.unique:
+                first_rows = seen.setdefault(column.name, {})
+                for row_index, value in zip(raw.index[good], values[good]):
+                    if value in first_rows:
+                        errors.append((row_index + 1, column.name, f"duplicate of row {first_rows[value]}"))
+                    else:
+                        first_rows[value] = row_index + 1
+            typed.append(values.tolist())
+        return typed, errors
+
+    def validate(self, collect=()):
+        """Check the header and every row's values, streaming the file once
+
+        Valid values of the columns named in ``collect`` are gathered into
+        ``report.collected`` as (position, value) pairs, where position counts the
+        non-blank rows like ``records()`` does (e.g. the episode numbers, to start
+        thumbnail work early).
+        """
+        report = ValidationReport(self.path)
+        report.collected = {name: [] for name in collect}
+        seen = {}
+        for header, frame in self._chunks():
+            report.missing_columns = [name for name in self.schema.required if name not in header]
+            if report.missing_columns:
+                return report
+            typed, errors = self._coerce(frame, seen)
+            report.errors.extend(errors)
+
+            bad_rows = {excel_row for excel_row, _, _ in errors}
+            for name in collect:
+                values = typed[[column.name for column in self.schema.columns].index(name)]
+                report.collected[name].extend(
+                    (report.row_count + position, value)
+                    for position, (row_index, value) in enumerate(zip(frame.index, values))
+                    if value is not None and row_index + 1 not in bad_rows
+                )
+            report.row_count += len(frame)
+        report.errors.sort()
+        return report
+
+    def load(self):
+        """Whole sheet as one DataFrame of typed values (index = row_index) plus its ValidationReport
+
+        For whole-sheet checks such as the dry run; a batch run streams ``records()`` instead.
+        """
+        report = ValidationReport(self.path)
+        parts = []
+        seen = {}
+        for header, frame in self._chunks():
+            report.missing_columns = [name for name in self.schema.required if name not in header]
+            if report.missing_columns:
+                break
+            typed, errors = self._coerce(frame, seen)
+            report.row_count += len(frame)
+            report.errors.extend(errors)
+            parts.append(pd.DataFrame(
+                {column.name: values for column, values in zip(self.schema.columns, typed)},
+                index=frame.index, dtype=object
+            ))
+        report.errors.sort()
+        columns = [column.name for column in self.schema.columns]
+        return (pd.concat(parts) if parts else pd.DataFrame(columns=columns, dtype=object)), report
+
+    def records(self):
+        """Yield (row_index, record, problems) with typed values
+
+        Invalid cells keep their raw value and are listed in ``problems`` as
+        "<column> <message>" (empty for a valid row), so a row can be skipped with its reasons.
+        """
+        record = self.schema.record
+        seen = {}
+        for _, frame in self._chunks():
+            typed, errors = self._coerce(frame, seen)
+            problems = {}
+            for excel_row, column, message in errors:
+                problems.setdefault(excel_row - 1, []).append(f"{column} {message}")
+            for row_index, values in zip(frame.index, zip(*typed)):
+                yield row_index, record(*values), problems.get(row_index, [])